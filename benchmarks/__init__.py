@@ -0,0 +1 @@
+"""오프라인 벤치마크 (로컬 픽스처 서버 + 가짜 Gemini + 가짜 PostgREST)"""
@@ -0,0 +1,130 @@
+"""벤치마크용 가짜 Gemini 모델 (프롬프트 종류별 고정 JSON 응답)"""
+
+import asyncio
+import json
+import random
+import re
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+_CANDIDATE_RE = re.compile(r"^(\d+)\. .*\| (\S+)$", re.MULTILINE)
+_HREF_RE = re.compile(r'href="([^"]+)"')
+_TITLE_RE = re.compile(r"<h1[^>]*>(.*?)</h1>", re.DOTALL)
+_DOCUMENT_RE = re.compile(r"^### 문서 (\d+)\nURL: (\S+)\n(.*?)(?=^### 문서 \d+\n|\Z)", re.MULTILINE | re.DOTALL)
+_DETAIL_URL_RE = re.compile(r"## URL\n(\S+)")
+
+
+class ResourceExhausted(Exception):
+    """google.api_core.exceptions.ResourceExhausted와 같은 이름/코드 (LLM 오류 분류 확인용)"""
+    code = 429
+
+
+class FakeGeminiModel:
+    """
+    LLMService(model=...)에 주입하는 가짜 모델
+    - 링크 분류 / 목록 HTML / 상세 / 배치 프롬프트를 구분해 형식에 맞는 JSON 반환
+    - latency(평균 초) ± jitter 만큼 대기, error_rate 비율로 429, malformed_rate 비율로 깨진 JSON
+    - usage_metadata는 글자 수 기반 근사치
+    """
+
+    model_name = "fake-gemini"
+
+    def __init__(
+        self,
+        latency: float = 0.2,
+        jitter: float = 0.1,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: Optional[int] = 0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self._random = random.Random(seed)
+
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.calls_by_kind: Dict[str, int] = {}
+
+    async def generate_content_async(self, prompt: str, generation_config=None):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(max(0.0, self._random.gauss(self.latency, self.jitter)))
+            if self._random.random() < self.error_rate:
+                self.errors += 1
+                raise ResourceExhausted("429 Resource has been exhausted (fake)")
+
+            kind, payload = self._respond(prompt)
+            self.calls_by_kind[kind] = self.calls_by_kind.get(kind, 0) + 1
+            text = json.dumps(payload, ensure_ascii=False)
+            if self._random.random() < self.malformed_rate:
+                text = text[: len(text) // 2]
+            return SimpleNamespace(
+                text=text,
+                usage_metadata=SimpleNamespace(
+                    prompt_token_count=len(prompt) // 3,
+                    candidates_token_count=len(text) // 3,
+                ),
+            )
+        finally:
+            self.in_flight -= 1
+
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _detail(url: str, html: str) -> Dict:
+        match = _TITLE_RE.search(html)
+        title = match.group(1).strip() if match else url
+        if "환경" not in title:
+            return {"page_type": "detail", "is_environmental_campaign": False, "campaigns": []}
+        return {
+            "page_type": "detail",
+            "is_environmental_campaign": True,
+            "campaigns": [{
+                "title": title,
+                "campaign_url": url,
+                "description": f"{title} 소개",
+                "host_organizer": "환경운동연합",
+                "image_url": None,
+                "start_date": "2025-01-01",
+                "end_date": "2025-12-31",
+                "region": "서울",
+                "category": "제로웨이스트",
+                "campaign_type": "OFFLINE",
+                "missions": [
+                    {"title": "텀블러 사용 인증", "description": "사진 인증", "verification_type": "IMAGE", "order": 1},
+                    {"title": "참여 소감", "description": "소감 작성", "verification_type": "TEXT_REVIEW", "order": 2},
+                ],
+            }],
+        }
+
+    def _respond(self, prompt: str):
+        if "### 문서 " in prompt and "\nURL: " in prompt:
+            results: List[Dict] = []
+            for key, url, html in _DOCUMENT_RE.findall(prompt):
+                results.append({"key": key, **self._detail(url, html)})
+            return "detail_batch", {"results": results}
+
+        if "campaign_indices" in prompt:
+            indices = [int(i) for i, url in _CANDIDATE_RE.findall(prompt) if "/campaign/" in url]
+            return "link_classification", {"campaign_indices": indices}
+
+        if "campaign_urls" in prompt:
+            urls = sorted({href for href in _HREF_RE.findall(prompt) if "/campaign/" in href})
+            return "list_html", {"campaign_urls": urls}
+
+        match = _DETAIL_URL_RE.search(prompt)
+        return "detail", self._detail(match.group(1) if match else "", prompt)
+
+    def report(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "peak_in_flight": self.peak_in_flight,
+            "calls_by_kind": dict(self.calls_by_kind),
+        }
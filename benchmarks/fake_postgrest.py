@@ -0,0 +1,233 @@
+"""벤치마크용 PostgREST 호환 가짜 서버 (프로세스 내 스레드, SupabaseService가 그대로 접속)"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl, urlparse
+
+REST_PREFIX = "/rest/v1/"
+
+# 테이블별 고유 컬럼 (on_conflict 처리용, 쉼표로 복합 키)
+UNIQUE_COLUMNS = {"campaigns": "campaign_url", "crawl_work": "run_id,url", "crawl_workers": "run_id,worker_id"}
+
+# supabase-py가 요구하는 JWT 형태의 더미 키
+DUMMY_SERVICE_KEY = "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.ZmFrZQ"
+
+_OPERATORS = {
+    "eq": lambda a, b: str(a) == b,
+    "neq": lambda a, b: str(a) != b,
+    "gt": lambda a, b: a is not None and float(a) > float(b),
+    "gte": lambda a, b: a is not None and float(a) >= float(b),
+    "lt": lambda a, b: a is not None and float(a) < float(b),
+    "lte": lambda a, b: a is not None and float(a) <= float(b),
+}
+
+
+class _Table:
+    def __init__(self):
+        self.rows: List[Dict] = []
+        self.next_id = 1
+        self.unique: Dict[object, Dict] = {}  # 고유 키 → 행
+
+
+class _PostgrestHandler(BaseHTTPRequestHandler):
+    server_version = "FakePostgREST/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _parse(self):
+        parsed = urlparse(self.path)
+        table = parsed.path[len(REST_PREFIX):] if parsed.path.startswith(REST_PREFIX) else None
+        return table, parse_qsl(parsed.query, keep_blank_values=True)
+
+    def do_GET(self):
+        fake: "FakePostgrest" = self.server.fake
+        table, params = self._parse()
+        if table is None:
+            self._send_json(404, {"message": "not found"})
+            return
+        fake.requests["select"] = fake.requests.get("select", 0) + 1
+        self._send_json(200, fake.select(table, params))
+
+    def do_POST(self):
+        fake: "FakePostgrest" = self.server.fake
+        table, params = self._parse()
+        if table is None:
+            self._send_json(404, {"message": "not found"})
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"[]")
+        rows = body if isinstance(body, list) else [body]
+        prefer = self.headers.get("Prefer", "")
+        fake.requests["insert"] = fake.requests.get("insert", 0) + 1
+
+        if fake.should_fail():
+            self._send_json(500, {"message": "fake write failure", "code": "XX000"})
+            return
+        try:
+            inserted = fake.insert(
+                table,
+                rows,
+                on_conflict=dict(params).get("on_conflict"),
+                ignore_duplicates="resolution=ignore-duplicates" in prefer,
+                merge_duplicates="resolution=merge-duplicates" in prefer,
+            )
+        except ValueError as e:
+            self._send_json(409, {"message": str(e), "code": "23505"})
+            return
+        self._send_json(201, inserted if "return=minimal" not in prefer else [])
+
+    def do_PATCH(self):
+        fake: "FakePostgrest" = self.server.fake
+        table, params = self._parse()
+        if table is None:
+            self._send_json(404, {"message": "not found"})
+            return
+        values = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        fake.requests["update"] = fake.requests.get("update", 0) + 1
+        updated = fake.update(table, params, values)
+        self._send_json(200, updated if "return=minimal" not in self.headers.get("Prefer", "") else [])
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class FakePostgrest:
+    """
+    SupabaseService가 사용하는 PostgREST 요청만 구현한 메모리 DB
+    - GET: select / eq·gt 등 필터 / order / limit
+    - POST: insert, upsert(on_conflict + resolution=ignore-duplicates / merge-duplicates)
+    - PATCH: 필터에 맞는 행 update (조건부 update로 lease 점유 확인용)
+    - latency(초) 만큼 요청마다 지연, write_error_rate 비율로 500 응답 (일괄 저장 오류 격리 확인용)
+    """
+
+    def __init__(self, latency: float = 0.0, write_error_rate: float = 0.0, seed: Optional[int] = 0):
+        self.latency = latency
+        self.write_error_rate = write_error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tables: Dict[str, _Table] = {}
+        self.requests: Dict[str, int] = {}
+        self.url = ""
+        self._server: Optional[_Server] = None
+
+    def _table(self, name: str) -> _Table:
+        return self._tables.setdefault(name, _Table())
+
+    def should_fail(self) -> bool:
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            return self._random.random() < self.write_error_rate
+
+    @staticmethod
+    def _filters(params) -> List:
+        filters = []
+        for key, value in params:
+            if key not in ("select", "order", "limit", "on_conflict", "columns") and "." in value:
+                op, _, operand = value.partition(".")
+                if op in _OPERATORS:
+                    filters.append((key, _OPERATORS[op], operand))
+        return filters
+
+    def select(self, table: str, params) -> List[Dict]:
+        if self.latency:
+            time.sleep(self.latency)
+        columns, order, limit = None, None, None
+        for key, value in params:
+            if key == "select":
+                columns = None if value.strip() == "*" else [c.strip() for c in value.split(",")]
+            elif key == "order":
+                column, _, direction = value.partition(".")
+                order = (column, direction.startswith("desc"))
+            elif key == "limit":
+                limit = int(value)
+        filters = self._filters(params)
+
+        with self._lock:
+            rows = [dict(r) for r in self._table(table).rows if all(op(r.get(k), v) for k, op, v in filters)]
+        if order:
+            rows.sort(key=lambda r: r.get(order[0]) or 0, reverse=order[1])
+        if limit is not None:
+            rows = rows[:limit]
+        if columns:
+            rows = [{c: r.get(c) for c in columns} for r in rows]
+        return rows
+
+    def update(self, table: str, params, values: Dict) -> List[Dict]:
+        """필터에 맞는 행을 한 번에 갱신 (lock 안에서 조회+갱신 → 조건부 update가 원자적)"""
+        if self.latency:
+            time.sleep(self.latency)
+        filters = self._filters(params)
+        with self._lock:
+            updated = []
+            for row in self._table(table).rows:
+                if all(op(row.get(k), v) for k, op, v in filters):
+                    row.update(values)
+                    updated.append(dict(row))
+        return updated
+
+    def insert(
+        self,
+        table: str,
+        rows: List[Dict],
+        on_conflict: Optional[str],
+        ignore_duplicates: bool,
+        merge_duplicates: bool = False,
+    ) -> List[Dict]:
+        unique = on_conflict or UNIQUE_COLUMNS.get(table)
+        columns = unique.split(",") if unique else []
+        inserted = []
+        with self._lock:
+            store = self._table(table)
+            for row in rows:
+                key = tuple(row.get(c) for c in columns) if columns else None
+                if key is not None and None in key:
+                    key = None
+                if key is not None and key in store.unique:
+                    if ignore_duplicates:
+                        continue
+                    if merge_duplicates:
+                        store.unique[key].update(row)
+                        inserted.append(dict(store.unique[key]))
+                        continue
+                    raise ValueError(f'duplicate key value violates unique constraint "{table}_{unique}_key"')
+                saved = dict(row, id=store.next_id)
+                store.next_id += 1
+                store.rows.append(saved)
+                if key is not None:
+                    store.unique[key] = saved
+                inserted.append(dict(saved))
+        return inserted
+
+    def seed(self, table: str, rows: List[Dict]):
+        """기존 데이터 미리 넣기 (중복 건너뛰기 경로 측정용)"""
+        self.insert(table, rows, UNIQUE_COLUMNS.get(table), ignore_duplicates=True)
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return len(self._table(table).rows)
+
+    def start(self) -> "FakePostgrest":
+        self._server = _Server(("127.0.0.1", 0), _PostgrestHandler)
+        self._server.fake = self
+        threading.Thread(target=self._server.serve_forever, name="fake-postgrest", daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
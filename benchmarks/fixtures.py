@@ -0,0 +1,181 @@
+"""벤치마크용 로컬 HTTP 서버 (목록/상세 페이지 재생)"""
+
+import multiprocessing
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional
+
+LIST_PATH = "/campaigns"
+DETAIL_PATH = "/campaign/"
+
+# 녹화된 상세 페이지가 없을 때 사용하는 기본 템플릿 (실제 사이트 구조를 단순화)
+DEFAULT_DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><title>{title}</title>
+<script>window.dataLayer = window.dataLayer || [];</script>
+<style>.campaign {{ margin: 0 auto; }}</style></head>
+<body>
+<nav><a href="/">홈</a> <a href="{list_path}?page=1">캠페인</a> <a href="/notice">공지사항</a></nav>
+<main class="campaign">
+  <h1>{title}</h1>
+  <img src="/images/{index}.jpg" alt="thumbnail">
+  <p>주최: 환경운동연합 / 기간: 2025-01-01 ~ 2025-12-31 / 지역: 서울</p>
+  <p>{body}</p>
+  <h2>참여 방법</h2>
+  <ol><li>텀블러를 사용하고 사진을 찍어 인증하세요.</li><li>참여 소감을 남겨주세요.</li></ol>
+</main>
+<footer>Copyright 2025 Example. All rights reserved.</footer>
+</body></html>
+"""
+
+LIST_TEMPLATE = """<!DOCTYPE html>
+<html lang="ko"><head><title>캠페인 목록 {page}</title></head>
+<body>
+<nav><a href="/">홈</a> <a href="/notice">공지사항</a> <a href="/login">로그인</a></nav>
+<main><h1>진행 중인 캠페인</h1>
+<ul>
+{items}
+</ul>
+<div class="paging">{paging}</div></main>
+<footer><a href="/privacy">개인정보처리방침</a></footer>
+</body></html>
+"""
+
+
+def list_url(base_url: str, page: int) -> str:
+    return f"{base_url}{LIST_PATH}?page={page}"
+
+
+def detail_title(index: int, environmental_ratio: float) -> str:
+    """index별로 고정된 제목 (environmental_ratio 비율만 환경 캠페인)"""
+    rng = random.Random(index)
+    if rng.random() < environmental_ratio:
+        return f"환경 캠페인 {index}: 일회용품 줄이기 챌린지"
+    return f"문화 행사 {index}: 지역 축제 안내"
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    server_version = "FixtureServer/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: str):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server: "_FixtureServer" = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        path, _, query = self.path.partition("?")
+        if path == LIST_PATH:
+            page = int(dict(p.split("=", 1) for p in query.split("&") if "=" in p).get("page", 1))
+            start = (page - 1) * server.per_list
+            end = min(server.detail_pages, start + server.per_list)
+            items = "\n".join(
+                f'<li><a href="{DETAIL_PATH}{i}">{detail_title(i, server.environmental_ratio)}</a></li>'
+                for i in range(start, end)
+            )
+            last = max(1, -(-server.detail_pages // server.per_list))
+            paging = " ".join(
+                f'<a href="{LIST_PATH}?page={p}">{p}</a>' for p in range(max(1, page - 4), min(last, page + 5) + 1)
+            )
+            if page < last:
+                paging += f' <a href="{LIST_PATH}?page={page + 1}">다음</a>'
+            self._send(200, LIST_TEMPLATE.format(page=page, items=items, paging=paging))
+            return
+
+        if path.startswith(DETAIL_PATH):
+            index = int(path[len(DETAIL_PATH):] or 0)
+            if index >= server.detail_pages:
+                self._send(404, "not found")
+                return
+            template = server.templates[index % len(server.templates)]
+            title = detail_title(index, server.environmental_ratio)
+            body = f"{title} 캠페인 소개입니다. " * 20
+            self._send(200, template.format(title=title, index=index, body=body, list_path=LIST_PATH))
+            return
+
+        self._send(404, "not found")
+
+
+class _FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def _load_templates(recorded_dir: Optional[str]) -> List[str]:
+    """
+    녹화된 상세 페이지(*.html)를 템플릿으로 사용
+    - {title}, {index}, {body}, {list_path} 자리표시자가 있으면 치환, 없으면 그대로 재생
+    """
+    if not recorded_dir:
+        return [DEFAULT_DETAIL_TEMPLATE]
+    templates = []
+    for path in sorted(Path(recorded_dir).glob("*.html")):
+        text = path.read_text(encoding="utf-8", errors="replace")
+        if "{title}" not in text:
+            text = text.replace("{", "{{").replace("}", "}}")
+        templates.append(text)
+    return templates or [DEFAULT_DETAIL_TEMPLATE]
+
+
+def _serve(ready, detail_pages, per_list, environmental_ratio, latency, recorded_dir):
+    server = _FixtureServer(("127.0.0.1", 0), _FixtureHandler)
+    server.detail_pages = detail_pages
+    server.per_list = per_list
+    server.environmental_ratio = environmental_ratio
+    server.latency = latency
+    server.templates = _load_templates(recorded_dir)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+class FixtureSite:
+    """
+    별도 프로세스에서 실행하는 목록/상세 페이지 서버
+    (크롤러 프로세스의 RSS/CPU 측정에 서버 비용이 섞이지 않도록 분리)
+    """
+
+    def __init__(
+        self,
+        detail_pages: int,
+        per_list: int = 50,
+        environmental_ratio: float = 0.8,
+        latency: float = 0.0,
+        recorded_dir: Optional[str] = None,
+    ):
+        self.detail_pages = detail_pages
+        self.per_list = per_list
+        self.environmental_ratio = environmental_ratio
+        self.latency = latency
+        self.recorded_dir = recorded_dir
+        self.base_url = ""
+        self._process: Optional[multiprocessing.Process] = None
+
+    @property
+    def list_urls(self) -> List[str]:
+        pages = max(1, -(-self.detail_pages // self.per_list))
+        return [list_url(self.base_url, page) for page in range(1, pages + 1)]
+
+    def start(self) -> "FixtureSite":
+        ready = multiprocessing.Queue()
+        self._process = multiprocessing.Process(
+            target=_serve,
+            args=(ready, self.detail_pages, self.per_list, self.environmental_ratio, self.latency, self.recorded_dir),
+            daemon=True,
+        )
+        self._process.start()
+        self.base_url = f"http://127.0.0.1:{ready.get(timeout=10)}"
+        return self
+
+    def stop(self):
+        if self._process and self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=5)
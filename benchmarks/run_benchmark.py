@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+오프라인 벤치마크 (실제 사이트 / Gemini / Supabase 없이 main() 전체 실행)
+
+- 목록/상세 페이지: 별도 프로세스의 로컬 HTTP 서버 (FixtureSite)
+- Gemini: FakeGeminiModel (지연/429/깨진 JSON 비율 조절)
+- Supabase: 프로세스 내 PostgREST 호환 가짜 서버 (FakePostgrest)
+- 규모별로 새 프로세스에서 실행하여 pages/sec, 페이지별 p95 지연, 최대 RSS, 모델 호출 수 보고
+
+사용법:
+    python -m benchmarks.run_benchmark --pages 10 100 1000
+    python -m benchmarks.run_benchmark --pages 10000 --llm-latency 0.5 --llm-error-rate 0.05 --output bench.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import copy
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from benchmarks.fake_gemini import FakeGeminiModel
+from benchmarks.fake_postgrest import DUMMY_SERVICE_KEY, FakePostgrest
+from benchmarks.fixtures import DETAIL_PATH, FixtureSite
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="크롤러 오프라인 벤치마크")
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 100], help="상세 페이지 수 (여러 개면 규모별로 실행)")
+    parser.add_argument("--per-list", type=int, default=50, help="목록 페이지 하나에 들어가는 상세 링크 수")
+    parser.add_argument("--environmental-ratio", type=float, default=0.8, help="환경 캠페인 비율")
+    parser.add_argument("--existing-ratio", type=float, default=0.0, help="DB에 이미 있는 캠페인 비율")
+    parser.add_argument("--site-latency", type=float, default=0.0, help="페이지 응답 지연 (초)")
+    parser.add_argument("--recorded-dir", default=None, help="녹화된 상세 페이지(*.html) 디렉터리")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="가짜 Gemini 평균 응답 시간 (초)")
+    parser.add_argument("--llm-jitter", type=float, default=0.05, help="가짜 Gemini 응답 시간 표준편차 (초)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="429 응답 비율")
+    parser.add_argument("--llm-malformed-rate", type=float, default=0.0, help="깨진 JSON 응답 비율")
+    parser.add_argument("--db-latency", type=float, default=0.0, help="가짜 PostgREST 요청 지연 (초)")
+    parser.add_argument("--db-error-rate", type=float, default=0.0, help="가짜 PostgREST 쓰기 실패 비율")
+    parser.add_argument("--llm-cache", action="store_true", help="LLM 캐시 사용 (기본: 모델 호출 수 측정을 위해 끔)")
+    parser.add_argument("--config", default=str(PROJECT_ROOT / "config" / "sites.yaml"), help="기준 설정 파일")
+    parser.add_argument("--output", default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--keep-logs", action="store_true", help="크롤러 로그 파일 경로 출력 및 보존")
+    return parser.parse_args(argv)
+
+
+def build_config(base_path: str, list_urls: List[str], workdir: Path, llm_cache: bool) -> Dict:
+    """기준 설정에서 네트워크/캐시 경로만 벤치마크용으로 바꾼 설정"""
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = yaml.safe_load(f) or {}
+    settings = copy.deepcopy(base.get("settings") or {})
+
+    settings["request_delay_seconds"] = 0
+    settings["fetch_mode"] = "http"  # 픽스처는 서버 렌더링 페이지라 브라우저 불필요
+    settings["url_canonicalization"] = dict(settings.get("url_canonicalization") or {}, force_https=False)
+    settings["change_detection"] = {"enabled": True, "path": str(workdir / "fingerprints.json")}
+    settings["url_index"] = dict(settings.get("url_index") or {}, path=str(workdir / "url_index.sqlite"))
+    settings["llm_cache"] = dict(settings.get("llm_cache") or {}, enabled=llm_cache, path=str(workdir / "llm_cache.sqlite"))
+    settings["crawl_state"] = dict(settings.get("crawl_state") or {}, path=str(workdir / "crawl_state.sqlite"))
+    settings["snapshot_archive"] = dict(settings.get("snapshot_archive") or {}, path=str(workdir / "snapshots"))
+    settings["llm_budget"] = dict(settings.get("llm_budget") or {}, max_tokens=None)
+    settings["metrics"] = {
+        "enabled": True,
+        "json_path": str(workdir / "metrics.json"),
+        "prometheus_path": str(workdir / "metrics.prom"),
+    }
+    return {"urls": list_urls, "settings": settings, "sites": {}}
+
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB, 측정 불가 시 0)"""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scale(pages: int, args: argparse.Namespace) -> Dict:
+    """상세 페이지 pages개 규모로 main() 1회 실행 후 측정값 반환 (새 프로세스에서 호출)"""
+    from main import main, parse_args as parse_main_args
+    from services.metrics import metrics
+
+    workdir = Path(tempfile.mkdtemp(prefix=f"crawler-bench-{pages}-"))
+    site = FixtureSite(
+        pages,
+        per_list=args.per_list,
+        environmental_ratio=args.environmental_ratio,
+        latency=args.site_latency,
+        recorded_dir=args.recorded_dir,
+    ).start()
+    db = FakePostgrest(latency=args.db_latency, write_error_rate=args.db_error_rate).start()
+    model = FakeGeminiModel(
+        latency=args.llm_latency,
+        jitter=args.llm_jitter,
+        error_rate=args.llm_error_rate,
+        malformed_rate=args.llm_malformed_rate,
+    )
+
+    existing = int(pages * args.existing_ratio)
+    db.seed("campaigns", [{"campaign_url": f"{site.base_url}{DETAIL_PATH}{i}"} for i in range(existing)])
+
+    config_path = workdir / "sites.yaml"
+    config = build_config(args.config, site.list_urls, workdir, args.llm_cache)
+    config_path.write_text(yaml.safe_dump(config, allow_unicode=True), encoding="utf-8")
+
+    os.environ["SUPABASE_URL"] = db.url
+    os.environ["SUPABASE_SERVICE_KEY"] = DUMMY_SERVICE_KEY
+    os.environ.pop("GITHUB_OUTPUT", None)
+
+    log_path = workdir / "crawler.log"
+    started = time.perf_counter()
+    try:
+        with open(log_path, "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+            asyncio.run(main(parse_main_args(["--config", str(config_path)]), llm_model=model))
+    finally:
+        elapsed = time.perf_counter() - started
+        site.stop()
+        db.stop()
+
+    report = metrics.report()
+    detail = report["timers"].get("detail_page", {})
+    processed = detail.get("count", 0)
+    return {
+        "pages": pages,
+        "list_pages": len(site.list_urls),
+        "seconds": round(elapsed, 2),
+        "detail_pages_processed": processed,
+        "pages_per_second": round(processed / elapsed, 2) if elapsed else 0.0,
+        "detail_page_p50": detail.get("p50"),
+        "detail_page_p95": detail.get("p95"),
+        "detail_page_max": detail.get("max"),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "model": model.report(),
+        "db_rows": {"campaigns": db.count("campaigns") - existing, "mission_templates": db.count("mission_templates")},
+        "db_requests": dict(db.requests),
+        "log": str(log_path) if args.keep_logs else None,
+        "metrics": report,
+    }
+
+
+def _child(pages: int, args: argparse.Namespace, queue):
+    try:
+        queue.put(run_scale(pages, args))
+    except BaseException as e:
+        queue.put({"pages": pages, "error": f"{type(e).__name__}: {e}"})
+
+
+def main_cli(argv=None):
+    args = parse_args(argv)
+    # 규모별로 새 프로세스 → 최대 RSS / 전역 metrics가 이전 실행의 영향을 받지 않음
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for pages in args.pages:
+        queue = context.Queue()
+        process = context.Process(target=_child, args=(pages, args, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+        results.append(result)
+
+        if "error" in result:
+            print(f"[Bench] {pages}개: 실패 ({result['error']})")
+            continue
+        model = result["model"]
+        print(
+            f"[Bench] {pages}개 (목록 {result['list_pages']}): {result['seconds']:.1f}초, "
+            f"{result['pages_per_second']:.1f} pages/s, 페이지 p95 {result['detail_page_p95'] or 0:.2f}초, "
+            f"최대 RSS {result['peak_rss_mb']:.0f}MB, 모델 호출 {model['calls']}회 "
+            f"(429 {model['errors']}, 최대 동시 {model['peak_in_flight']}), "
+            f"저장 {result['db_rows']['campaigns']}건"
+        )
+        if result["log"]:
+            print(f"        로그: {result['log']}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[Bench] 결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
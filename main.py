@@ -9,23 +9,47 @@
 
 import os
 import sys
+import json
 import asyncio
+import argparse
 import yaml
 import time
+import subprocess
 from pathlib import Path
 from dotenv import load_dotenv
 
+IMPORT_STARTED = time.perf_counter()
+
 # 프로젝트 루트를 Python 경로에 추가
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from services.supabase_client import SupabaseService
 from services.browser_service import BrowserService
+from services.browser_pool import BrowserProcessPool
+from services.http_fetcher import HttpFetcher, TieredFetcher
 from services.llm_service import LLMService
+from services.html_reducer import HtmlReducer
+from services.llm_cache import LLMCache
+from services.site_settings import SiteSettings
+from services.pipeline import CrawlPipeline
+from services.metrics import StartupTimer, configure_metrics
+from services.rate_limiter import DomainScheduler
+from services.change_detector import SourceFingerprintStore
+from services.campaign_writer import CampaignWriter
+from services.loop_monitor import LoopLagMonitor
+from services.url_index import UrlIndex
+from services.url_canonicalizer import UrlCanonicalizer
+from services.snapshot_store import ArchiveFetcher, SnapshotStore
+from services.crawl_state import CrawlStateStore
+from services.work_queue import WorkQueue, merge_worker_reports
 from models.campaign import CampaignData, MissionTemplateData
 
+# supabase / google-generativeai / playwright는 각 서비스가 실제로 필요할 때 import
+IMPORT_SECONDS = time.perf_counter() - IMPORT_STARTED
+
 
-def load_env():
+def load_env(require_google_api_key: bool = True):
     """환경변수 로드"""
     env_path = PROJECT_ROOT / "config" / ".env"
     if env_path.exists():
@@ -34,7 +58,9 @@ def load_env():
         print("[INFO] config/.env 파일이 없습니다. 환경변수를 확인합니다.")
         
     # 필수 환경변수 확인
-    required_vars = ["SUPABASE_URL", "SUPABASE_SERVICE_KEY", "GOOGLE_API_KEY"]
+    required_vars = ["SUPABASE_URL", "SUPABASE_SERVICE_KEY"]
+    if require_google_api_key:
+        required_vars.append("GOOGLE_API_KEY")
     missing = [var for var in required_vars if not os.environ.get(var)]
     
     if missing:
@@ -42,9 +68,94 @@ def load_env():
         sys.exit(1)
 
 
-def load_config() -> dict:
+def parse_args(argv=None) -> argparse.Namespace:
+    """명령행 인자 파싱"""
+    parser = argparse.ArgumentParser(description="환경 캠페인 크롤러")
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="LLM 캐시 조회를 건너뛰고 새로 추출 (결과는 캐시에 다시 저장)",
+    )
+    parser.add_argument(
+        "--force-refresh",
+        action="store_true",
+        help="목록 페이지 변경 감지를 무시하고 모든 소스를 다시 추출",
+    )
+    parser.add_argument(
+        "--rebuild-url-index",
+        action="store_true",
+        help="로컬 URL 인덱스를 비우고 Supabase에서 전체 다시 동기화",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="중단된 이전 실행을 이어서 처리하지 않고 새로 시작 (환경 캠페인 아님 판정 기억은 유지)",
+    )
+    parser.add_argument(
+        "--from-archive",
+        action="store_true",
+        help="페이지를 다시 수집하지 않고 스냅샷 보관소의 HTML로 추출만 다시 실행",
+    )
+    parser.add_argument(
+        "--archive-hours",
+        type=float,
+        default=24,
+        help="--from-archive에서 사용할 스냅샷 범위 (최근 N시간, 기본값: 24)",
+    )
+    parser.add_argument(
+        "--reextract-existing",
+        action="store_true",
+        help="--from-archive에서 이미 저장된 캠페인도 다시 추출하고 결과는 DB 대신 JSONL 파일로 저장",
+    )
+    parser.add_argument(
+        "--browser-processes",
+        type=int,
+        default=None,
+        help="브라우저 렌더링 워커 프로세스 수 (기본값: settings.browser.processes, 1이면 현재 프로세스에서 렌더링)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="이 머신에서 워커 프로세스 N개를 실행하여 공유 작업 테이블로 나눠 처리",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="워커 모드: settings.work_queue 테이블에서 URL을 lease로 가져와 처리 (matrix 작업마다 실행)",
+    )
+    parser.add_argument(
+        "--run-id",
+        default=None,
+        help="워커끼리 공유하는 실행 ID (기본값: GITHUB_RUN_ID 또는 오늘 날짜)",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="워커 ID (기본값: 호스트명-PID)",
+    )
+    parser.add_argument(
+        "--worker-count",
+        type=int,
+        default=1,
+        help="같은 run-id로 실행하는 전체 워커 수 (도메인별 요청 간격을 이 배수로 늘림)",
+    )
+    parser.add_argument(
+        "--worker-summary",
+        action="store_true",
+        help="크롤링 없이 --run-id의 워커별 보고와 합계만 출력 (matrix 작업 후 요약 단계용)",
+    )
+    parser.add_argument(
+        "--config",
+        default=None,
+        help="설정 파일 경로 (기본값: config/sites.yaml)",
+    )
+    return parser.parse_args(argv)
+
+
+def load_config(path=None) -> dict:
     """설정 파일 로드"""
-    config_path = PROJECT_ROOT / "config" / "sites.yaml"
+    config_path = Path(path) if path else PROJECT_ROOT / "config" / "sites.yaml"
     if not config_path.exists():
         print(f"[ERROR] 설정 파일이 없습니다: {config_path}")
         sys.exit(1)
@@ -53,9 +164,88 @@ def load_config() -> dict:
         return yaml.safe_load(f)
 
 
-def create_default_missions(supabase: SupabaseService, campaign_id: int, campaign_title: str):
-    """캠페인에 기본 미션 템플릿 생성"""
-    default_mission = MissionTemplateData(
+def default_run_id() -> str:
+    """워커 모드 기본 실행 ID (Actions에서는 같은 실행의 matrix 작업끼리 공유)"""
+    return os.environ.get("GITHUB_RUN_ID") or time.strftime("%Y%m%d")
+
+
+def scale_request_delays(config: dict, factor: int):
+    """워커 factor개가 같은 도메인을 나눠 요청해도 도메인별 전체 요청 속도가 그대로이도록 간격을 늘림"""
+    settings = config.setdefault("settings", {})
+    settings["request_delay_seconds"] = settings.get("request_delay_seconds", 3) * factor
+    for overrides in (config.get("sites") or {}).values():
+        if overrides and "request_delay_seconds" in overrides:
+            overrides["request_delay_seconds"] *= factor
+
+
+def open_work_queue(config_path, run_id: str) -> WorkQueue:
+    """크롤링 없이 공유 작업 테이블만 열기 (워커 요약 출력용)"""
+    load_env(require_google_api_key=False)
+    settings = load_config(config_path).get("settings") or {}
+    supabase = SupabaseService() if (settings.get("work_queue") or {}).get("backend") == "supabase" else None
+    return WorkQueue.from_settings(settings, PROJECT_ROOT, run_id=run_id, supabase=supabase)
+
+
+def print_worker_summary(work: WorkQueue) -> dict:
+    """워커별 보고와 합계 출력 (합계 반환)"""
+    reports = work.worker_reports()
+    for report in reports:
+        print(f"[Worker] {report['worker_id']}: 페이지 {report['pages']}개 / {report['seconds']:.1f}초 "
+              f"({report['pages_per_second']:.2f} pages/s), 새 캠페인 {report['new_campaigns']}개, "
+              f"LLM 토큰 {report['llm_input_tokens'] + report['llm_output_tokens']:,}")
+    merged = merge_worker_reports(reports)
+    print(f"[Workers] 합계 (워커 {merged['workers']}개, run {work.run_id}): 페이지 {merged.get('pages', 0)}개, "
+          f"새 캠페인 {merged.get('new_campaigns', 0)}개, {merged['pages_per_second']:.2f} pages/s "
+          f"(가장 긴 워커 {merged['seconds']:.1f}초 기준)")
+    return merged
+
+
+def run_workers(args: argparse.Namespace):
+    """
+    워커 프로세스 args.workers개를 같은 run-id로 실행하고 끝나면 합계 출력
+    (결과 출력(GITHUB_OUTPUT)은 워커가 아니라 이 프로세스가 합계로 기록)
+    """
+    run_id = args.run_id or default_run_id()
+    command = [
+        sys.executable, str(PROJECT_ROOT / "main.py"), "--worker",
+        "--run-id", run_id, "--worker-count", str(args.workers),
+    ]
+    for flag in ("no_llm_cache", "force_refresh", "rebuild_url_index"):
+        if getattr(args, flag):
+            command.append(f"--{flag.replace('_', '-')}")
+    if args.config:
+        command += ["--config", args.config]
+
+    env = {key: value for key, value in os.environ.items() if key != "GITHUB_OUTPUT"}
+    print(f"[Workers] 워커 {args.workers}개 실행 (run {run_id})")
+    processes = [
+        subprocess.Popen(command + ["--worker-id", f"{run_id}-{i}"], env=env)
+        for i in range(args.workers)
+    ]
+    failed = sum(1 for process in processes if process.wait() != 0)
+    if failed:
+        print(f"[Workers] 비정상 종료한 워커 {failed}개 (남은 URL은 같은 --run-id로 다시 실행하면 이어서 처리)")
+
+    work = open_work_queue(args.config, run_id)
+    merged = print_worker_summary(work)
+    work.close()
+
+    github_output = os.environ.get('GITHUB_OUTPUT')
+    if github_output:
+        total_new = merged.get("new_campaigns", 0)
+        with open(github_output, 'a') as f:
+            f.write(f"new_campaigns_count={total_new}\n")
+            if total_new > 0:
+                f.write("has_new_campaigns=true\n")
+            f.write(f"llm_calls={merged.get('llm_calls', 0)}\n")
+            f.write(f"llm_input_tokens={merged.get('llm_input_tokens', 0)}\n")
+            f.write(f"llm_output_tokens={merged.get('llm_output_tokens', 0)}\n")
+            f.write(f"llm_cost_usd={merged.get('llm_cost_usd', 0):.4f}\n")
+
+
+def build_default_mission(campaign_id: int, campaign_title: str) -> MissionTemplateData:
+    """캠페인 기본 미션 템플릿 (미션 정보가 없을 때)"""
+    return MissionTemplateData(
         campaign_id=campaign_id,
         title=f"{campaign_title} 참여 인증",
         description="캠페인 참여 후 인증샷을 업로드하세요.",
@@ -63,184 +253,371 @@ def create_default_missions(supabase: SupabaseService, campaign_id: int, campaig
         verification_type="IMAGE",
         reward_points=0
     )
-    supabase.insert_mission_template(default_mission)
 
 
-def save_campaign_sync(result: dict, supabase: SupabaseService, existing_urls: set) -> int:
-    """캠페인 저장 (동기 함수)"""
-    saved_count = 0
-    campaigns = result.get("campaigns", [])
-
-    for camp in campaigns:
-        campaign_url = camp.get("campaign_url")
-        if not campaign_url or campaign_url in existing_urls:
-            continue
-
-        # CampaignData 생성
-        campaign = CampaignData(
-            title=camp.get("title") or "Unknown",
-            campaign_url=campaign_url,
-            host_organizer=camp.get("host_organizer"),
-            description=camp.get("description"),
-            image_url=camp.get("image_url"),
-            start_date=camp.get("start_date"),
-            end_date=camp.get("end_date"),
-            region=camp.get("region"),
-            category=camp.get("category"),
-            campaign_type=camp.get("campaign_type") or "ONLINE"
-        )
-
-        # DB 저장
-        campaign_id = supabase.insert_campaign(campaign)
-        if campaign_id:
-            existing_urls.add(campaign_url)
-            saved_count += 1
-            print(f"    [OK] 저장 완료: {campaign.title[:40]}")
-
-            # 미션 템플릿 생성
-            missions = camp.get("missions", [])
-            if missions:
-                for idx, mission in enumerate(missions, 1):
-                    mission_data = MissionTemplateData(
-                        campaign_id=campaign_id,
-                        title=mission.get("title", f"{campaign.title} 미션 {idx}"),
-                        description=mission.get("description"),
-                        order=mission.get("order", idx),
-                        verification_type=mission.get("verification_type", "TEXT_REVIEW"),
-                        reward_points=10
-                    )
-                    supabase.insert_mission_template(mission_data)
-            else:
-                create_default_missions(supabase, campaign_id, campaign.title)
-        else:
-            print(f"    [FAIL] DB 저장 실패: {campaign.title[:40]}")
+def save_campaigns_batch(results: list, supabase: SupabaseService, existing_urls: set, canonicalize=None) -> int:
+    """
+    여러 LLM 결과의 캠페인을 일괄 저장 (동기 함수)
+    - campaign_url은 canonical 형태로 저장
+    - 캠페인: campaign_url 기준 다중 행 upsert 1회
+    - 미션 템플릿: 새로 저장된 캠페인의 미션을 모아 다중 행 insert 1회
+    """
+    campaigns = []
+    missions_by_url = {}
+
+    for result in results:
+        for camp in result.get("campaigns", []):
+            campaign_url = camp.get("campaign_url")
+            if campaign_url and canonicalize:
+                campaign_url = canonicalize(campaign_url)
+            if not campaign_url or campaign_url in existing_urls or campaign_url in missions_by_url:
+                continue
+
+            # CampaignData 생성
+            campaigns.append(CampaignData(
+                title=camp.get("title") or "Unknown",
+                campaign_url=campaign_url,
+                host_organizer=camp.get("host_organizer"),
+                description=camp.get("description"),
+                image_url=camp.get("image_url"),
+                start_date=camp.get("start_date"),
+                end_date=camp.get("end_date"),
+                region=camp.get("region"),
+                category=camp.get("category"),
+                campaign_type=camp.get("campaign_type") or "ONLINE"
+            ))
+            missions_by_url[campaign_url] = camp.get("missions", [])
+
+    if not campaigns:
+        return 0
 
-    return saved_count
+    # DB 저장
+    saved_ids = supabase.upsert_campaigns(campaigns)
 
+    # 저장된 URL은 배치 단위로 한 번에 기록 (URL 인덱스는 commit 1회)
+    existing_urls.update(c.campaign_url for c in campaigns if saved_ids.get(c.campaign_url))
 
-async def process_detail_page(url: str, browser: BrowserService, llm: LLMService, supabase: SupabaseService, existing_urls: set):
-    """상세 페이지 처리 (병렬 실행 단위)"""
-    print(f"  [START] 상세 분석: {url}")
-    
-    # 1. HTML 추출
-    html_content = await browser.get_page_content(url)
-    if not html_content:
-        # browser_service에서 이미 에러 메시지 출력됨
-        return 0
+    mission_rows = []
+    for campaign in campaigns:
+        campaign_id = saved_ids.get(campaign.campaign_url)
+        if not campaign_id:
+            # 이미 존재(동시 저장 포함)하거나 저장 실패한 캠페인
+            print(f"    [SKIP] 저장되지 않음: {campaign.title[:40]}")
+            continue
 
-    # 2. LLM 분석
-    result = await llm.extract_campaign_detail(html_content, url)
-    if not result:
-        print(f"  [FAIL] LLM 분석 실패: {url}")
-        return 0
+        print(f"    [OK] 저장 완료: {campaign.title[:40]}")
+
+        # 미션 템플릿 생성
+        missions = missions_by_url[campaign.campaign_url]
+        if missions:
+            for idx, mission in enumerate(missions, 1):
+                mission_rows.append(MissionTemplateData(
+                    campaign_id=campaign_id,
+                    title=mission.get("title", f"{campaign.title} 미션 {idx}"),
+                    description=mission.get("description"),
+                    order=mission.get("order", idx),
+                    verification_type=mission.get("verification_type", "TEXT_REVIEW"),
+                    reward_points=10
+                ))
+        else:
+            mission_rows.append(build_default_mission(campaign_id, campaign.title))
 
-    if not result.get("is_environmental_campaign"):
-        print(f"  [SKIP] 환경 캠페인 아님: {url}")
-        return 0
+    supabase.insert_mission_templates(mission_rows)
+    return len(saved_ids)
 
-    # 3. DB 저장 (동기 함수 호출)
-    # Supabase 클라이언트는 Thread-safe하지 않을 수 있으므로 주의 필요하지만,
-    # 간단한 insert 작업은 보통 문제 없음. 필요시 Lock 사용.
-    return save_campaign_sync(result, supabase, existing_urls)
 
+def save_results_jsonl(results: list, path: Path) -> int:
+    """LLM 결과를 JSONL 파일에 추가 (DB에 쓰지 않는 재추출 모드용)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for result in results:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+    return sum(len(result.get("campaigns") or []) for result in results)
 
-def ensure_https(url: str) -> str:
-    """URL을 HTTPS로 강제 변환"""
-    if not url:
-        return url
-    if url.startswith("http://"):
-        return url.replace("http://", "https://", 1)
-    if not url.startswith("http"):
-        return "https://" + url
-    return url
 
+async def main(args: argparse.Namespace = None, llm_model=None):
+    """
+    크롤러 실행
 
-async def main():
+    Args:
+        llm_model: Gemini 모델 대신 사용할 객체 (벤치마크의 가짜 모델 등, None이면 실제 API)
+    """
+    args = args or parse_args([])
+    main_started = time.perf_counter()
     print("\n" + "=" * 60)
     print("       환경 캠페인 크롤러 v4.0 (Async)")
     print("       Native Playwright + Google GenAI")
     print("=" * 60)
 
-    load_env()
-    config = load_config()
-    # 설정 파일에서 URL 로드 시 HTTPS 강제 적용
-    urls = [ensure_https(u) for u in config.get("urls", [])]
+    load_env(require_google_api_key=llm_model is None)
+    config = load_config(args.config)
+    work_options = (config.get("settings") or {}).get("work_queue") or {}
+    if args.worker and args.worker_count > 1 and work_options.get("scale_request_delay", True):
+        scale_request_delays(config, args.worker_count)
+    settings = config.get("settings") or {}
+    metrics = configure_metrics(settings)
+    startup = StartupTimer(metrics, started_at=main_started)
+    startup.record("import", IMPORT_SECONDS, background=False)
+    site_settings = SiteSettings(config)
+    # 설정 파일/추출 결과/저장된 URL 모두 같은 규칙으로 정규화 (HTTPS 강제 포함)
+    canonicalizer = UrlCanonicalizer(site_settings, known_urls=config.get("urls", []))
+    urls = list(dict.fromkeys(canonicalizer.canonicalize(u) for u in config.get("urls", [])))
     
     if not urls:
         print("[WARN] 크롤링할 URL이 없습니다.")
         return
 
+    if args.reextract_existing and not args.from_archive:
+        print("[ERROR] --reextract-existing은 --from-archive와 함께 사용해야 합니다.")
+        return
+
+    startup.mark("config")
+
     # 서비스 초기화
     try:
         supabase = SupabaseService()
-        browser = BrowserService(headless=True) # 디버깅 시 False로 변경
-        llm = LLMService()
+        startup.mark("supabase_client")
+        scheduler = DomainScheduler(site_settings)
+        browser_processes = args.browser_processes or (settings.get("browser") or {}).get("processes", 1)
+        if browser_processes > 1:
+            # 렌더링/HTML 직렬화를 워커 프로세스로 분산 (scheduler는 이 프로세스에서 도메인 간격 유지)
+            browser = BrowserProcessPool.from_settings(
+                config, processes=browser_processes, headless=True, scheduler=scheduler
+            )
+        else:
+            browser = BrowserService.from_settings(site_settings, headless=True, scheduler=scheduler) # 디버깅 시 False로 변경
+        snapshots = SnapshotStore.from_settings(settings, PROJECT_ROOT)
+        if args.from_archive:
+            if not snapshots.enabled:
+                raise ValueError("--from-archive를 사용하려면 settings.snapshot_archive.enabled가 true여야 합니다.")
+            # 네트워크/브라우저 없이 최근 스냅샷만 사용
+            fetcher = ArchiveFetcher(snapshots, since=time.time() - args.archive_hours * 3600)
+        else:
+            fetcher = TieredFetcher(
+                HttpFetcher(scheduler=scheduler), browser, site_settings,
+                snapshots=snapshots if snapshots.enabled else None,
+            )
+        llm_cache = LLMCache.from_settings(settings, PROJECT_ROOT, bypass=args.no_llm_cache)
+        llm = LLMService.from_settings(
+            settings, reducer=HtmlReducer.from_settings(settings), cache=llm_cache, model=llm_model
+        )
+        startup.mark("services")
     except Exception as e:
         print(f"[ERROR] 서비스 초기화 실패: {e}")
         return
 
-    existing_urls = supabase.get_existing_urls()
-    print(f"기존 캠페인 수: {len(existing_urls)}개")
+    # 목록 페이지 변경 감지 (변경 없으면 렌더링/LLM 추출 생략)
+    change_options = settings.get("change_detection") or {}
+    fingerprints = None
+    # 아카이브 재생은 목록 변경 여부와 무관하게 모두 다시 추출 (변경 감지 상태도 건드리지 않음)
+    if change_options.get("enabled", True) and not args.from_archive:
+        fingerprints = SourceFingerprintStore(PROJECT_ROOT / change_options.get("path", ".cache/source_fingerprints.json"))
+
+    # 실행 상태 체크포인트: 중단된 실행이면 남은 작업부터 이어서 처리
+    # 아카이브 재생은 일회성 재추출이므로 기록하지 않음
+    # 워커 모드는 공유 작업 테이블이 진행 상태를 대신함 (같은 --run-id로 다시 실행하면 이어서 처리)
+    crawl_state = None
+    work = None
+    if args.worker:
+        try:
+            # 작업 테이블은 writer 스레드와 동시에 (asyncio.to_thread로) 호출되므로 별도 클라이언트 사용
+            work_supabase = SupabaseService() if (settings.get("work_queue") or {}).get("backend") == "supabase" else None
+            work = WorkQueue.from_settings(
+                settings, PROJECT_ROOT, run_id=args.run_id or default_run_id(), worker_id=args.worker_id,
+                supabase=work_supabase,
+            )
+        except Exception as e:
+            print(f"[ERROR] 작업 테이블 초기화 실패: {e}")
+            return
+        print(f"[Worker] {work.worker_id} 시작 (run {work.run_id}, 전체 워커 {args.worker_count}개)")
+    elif not args.from_archive:
+        crawl_state = CrawlStateStore.from_settings(settings, PROJECT_ROOT)
+        if crawl_state.begin_run(resume=not args.no_resume):
+            print("[State] 중단된 이전 실행을 이어서 처리합니다. (--no-resume으로 새로 시작)")
+
+    # 기존 캠페인 URL: 로컬 인덱스를 워터마크 이후 행만 증분 동기화
+    index_options = settings.get("url_index") or {}
+    existing_urls = UrlIndex(
+        PROJECT_ROOT / index_options.get("path", ".cache/url_index.sqlite"),
+        canonicalize=lambda url: canonicalizer.canonicalize(url, track=False),
+        rules_hash=canonicalizer.rules_hash(),
+    )
+    page_size = index_options.get("page_size", 1000)
+    startup.mark("state")
+
+    # 기존 URL 동기화, 브라우저 실행, 첫 목록 수집을 동시에 진행
+    # (파이프라인은 상세 URL 중복 확인 직전에만 동기화 완료를 기다림)
+    async def sync_existing_urls():
+        started = time.perf_counter()
+        sync = existing_urls.rebuild if args.rebuild_url_index else existing_urls.sync
+        try:
+            fetched = await asyncio.to_thread(sync, supabase, page_size)
+        except Exception as e:
+            # 중복 확인 없이 저장하지 않도록 파이프라인의 상세 URL 투입도 실패 처리됨
+            print(f"[ERROR] 기존 캠페인 URL 동기화 실패: {e}")
+            raise
+        finally:
+            startup.record("url_index", time.perf_counter() - started)
+        print(f"기존 캠페인 수: {len(existing_urls)}개 (새로 동기화 {fetched}개)")
+
+    async def prelaunch_browser():
+        started = time.perf_counter()
+        try:
+            await browser.launch()
+        except Exception as e:
+            print(f"[WARN] 브라우저 미리 실행 실패 (첫 브라우저 수집 때 다시 시도): {e}")
+            return
+        startup.record("browser_launch", time.perf_counter() - started)
+
+    existing_task = asyncio.create_task(sync_existing_urls())
+    background = [existing_task]
+    # HTTP만 쓰는 사이트뿐이면 브라우저는 HTTP 단계에서 처리되지 않는 첫 페이지가 나올 때 실행됨
+    needs_browser = any(site_settings.get(url, "fetch_mode", "auto") != "http" for url in urls)
+    if not args.from_archive and needs_browser and (settings.get("browser") or {}).get("prelaunch", True):
+        background.append(asyncio.create_task(prelaunch_browser()))
+
+    # DB 쓰기는 전용 스레드에서 배치로 처리 (동기 Supabase 호출이 루프를 막지 않도록)
+    writer_options = settings.get("writer") or {}
+    if args.reextract_existing:
+        replay_output = PROJECT_ROOT / (settings.get("snapshot_archive") or {}).get(
+            "replay_output", ".cache/reextracted.jsonl"
+        )
+        print(f"[Archive] 재추출 결과는 DB 대신 파일로 저장: {replay_output}")
+        write_batch = lambda results: save_results_jsonl(results, replay_output)
+    else:
+        write_batch = lambda results: save_campaigns_batch(results, supabase, existing_urls, canonicalizer.canonicalize)
+    pipeline = None
+    on_written = crawl_state.mark_saved if crawl_state else None
+    on_failed = None
+    if work:
+        # 워커 모드: DB에 저장된 뒤에야 작업 테이블에 완료 표시 (저장 전에 죽으면 다른 워커가 회수)
+        # pipeline은 첫 저장 전에 생성됨
+        on_written = lambda keys: pipeline.on_saved(keys)
+        on_failed = lambda keys: pipeline.on_save_failed(keys)
+    writer = CampaignWriter(
+        write_batch=write_batch,
+        on_written=on_written,
+        on_failed=on_failed,
+        **writer_options,
+    )
+    writer.start()
+    monitor = LoopLagMonitor(gauge=lambda: writer.queue_depth)
+    monitor.start()
 
-    await browser.launch()
-    
-    total_new = 0
-    
+    completed = False
     try:
-        # 1. 목록 페이지에서 URL 수집
-        all_campaign_urls = set()
-        
-        print(f"\n[1단계] 목록 페이지 수집 ({len(urls)}개)")
-        for list_url in urls:
-            print(f"  접속 중: {list_url}")
-            html = await browser.get_page_content(list_url)
-            if html:
-                print(f"  [DEBUG] HTML Length: {len(html)}")
-                extracted = await llm.extract_campaign_urls(html, list_url)
-                # 추출된 URL도 HTTPS 강제 적용
-                extracted = [ensure_https(u) for u in extracted]
-                print(f"  -> 발견된 URL: {len(extracted)}개")
-                all_campaign_urls.update(extracted)
-            else:
-                print(f"  -> 접속 실패")
-
-        # 중복 제거 및 필터링
-        new_urls = [u for u in all_campaign_urls if u not in existing_urls]
-        print(f"\n[2단계] 상세 분석 대상: {len(new_urls)}개 (기존 {len(all_campaign_urls) - len(new_urls)}개 제외)")
-
-        if not new_urls:
-            print("새로운 캠페인이 없습니다.")
-            return
+        # 목록 → 상세 → 저장을 단계별 큐로 연결하여 동시에 처리
+        # 목록에서 발견된 URL은 바로 상세 분석 단계로 넘어감
+        pipeline = CrawlPipeline.from_settings(
+            settings,
+            fetcher=fetcher,
+            llm=llm,
+            site_settings=site_settings,
+            existing_urls=set() if args.reextract_existing else existing_urls,
+            writer=writer,
+            normalize_url=canonicalizer.canonicalize,  # 추출된 URL도 같은 규칙으로 정규화
+            fingerprints=fingerprints,
+            force_refresh=args.force_refresh,
+            state=crawl_state,
+            work=work,
+            existing_ready=existing_task,
+        )
 
-        # 2. 상세 페이지 병렬 처리
-        # 한 번에 너무 많은 요청을 보내면 차단될 수 있으므로 세마포어 사용 권장
-        # 여기서는 간단히 5개씩 끊어서 처리하거나 전체 병렬 처리
-        
-        BATCH_SIZE = 5
-        for i in range(0, len(new_urls), BATCH_SIZE):
-            batch_urls = new_urls[i:i+BATCH_SIZE]
-            print(f"\n  Batch {i//BATCH_SIZE + 1} 처리 중 ({len(batch_urls)}개)...")
-            
-            tasks = [
-                process_detail_page(url, browser, llm, supabase, existing_urls)
-                for url in batch_urls
-            ]
-            
-            results = await asyncio.gather(*tasks)
-            total_new += sum(results)
-            
-            # 배치 간 딜레이
-            if i + BATCH_SIZE < len(new_urls):
-                await asyncio.sleep(2)
+        print(f"\n[크롤링] 목록 {len(urls)}개에서 시작 "
+              f"(fetch {pipeline.fetch_concurrency} / extract {pipeline.extract_concurrency} / persist {pipeline.persist_concurrency}"
+              f"{f' / 상세 배치 {pipeline.detail_batch_size}개' if pipeline.batching else ''})")
+        startup.mark("pipeline_setup")
+        started = time.monotonic()
+        stats = await pipeline.run(urls)
+        elapsed = time.monotonic() - started
+
+        print(f"\n[요약] 목록 {stats.list_pages}개 (실패 {stats.list_failed}), "
+              f"상세 대상 {stats.detail_found}개 (기존 {stats.skipped_existing}개 제외), "
+              f"변경 없는 소스 {stats.unchanged_sources}개")
+        print(f"       접속 실패 {stats.fetch_failed}, LLM 실패 {stats.llm_failed}, "
+              f"환경 캠페인 아님 {stats.not_environmental}, 저장 요청 {stats.submitted}, 오류 {stats.errors}, "
+              f"예산 초과로 건너뜀 {stats.budget_skipped}")
+        print(f"       이어서 처리 {stats.resumed}, 환경 캠페인 아님 기억으로 건너뜀 {stats.known_non_environmental}")
+        completed = True
 
     finally:
+        # 아직 진행 중인 동기화/브라우저 실행을 마친 뒤 정리 (실패는 각 작업에서 출력)
+        await asyncio.gather(*background, return_exceptions=True)
+        if pipeline and pipeline.stats.first_fetch_seconds is not None:
+            startup.record("first_fetch", pipeline.stats.first_fetch_seconds)
+        print(f"[Startup] {startup.report()}")
+        # 남은 저장 작업을 마무리한 뒤 종료
+        total_new = await writer.close()
+        if crawl_state:
+            # 끝까지 처리한 경우만 완료로 기록 (예외/중단이면 다음 실행에서 이어서 처리)
+            if completed:
+                crawl_state.finish_run()
+            print(f"[State] {crawl_state.report()}")
+            crawl_state.close()
+        await monitor.stop()
+        print(f"[Writer] {writer.report()}")
+        print(f"[Loop] {monitor.report()}")
+        print(f"[Fetch] {fetcher.report()}")
+        await fetcher.close()
+        # 워커 프로세스의 Context 통계는 종료할 때 받으므로 종료 후 출력
         await browser.close()
+        print(f"[Browser] {browser.report()}")
+        if isinstance(browser, BrowserProcessPool):
+            for line in browser.worker_report():
+                print(f"[BrowserPool] {line}")
+        for line in scheduler.report():
+            print(f"[Scheduler] {line}")
+        if fingerprints:
+            fingerprints.save()
+            for line in fingerprints.report(urls):
+                print(f"[Fingerprint] {line}")
+        print(f"[URL] {canonicalizer.report()}")
+        print(f"[LLM] {llm.call_report()}")
+        print(f"[LLM Batch] {llm.batch_report()}")
+        for line in llm.usage.report():
+            print(f"[LLM Usage] {line}")
+        print(f"[LLM Cache] {llm_cache.summary()}")
+        llm_cache.close()
+        existing_urls.close()
+        pruned_records, pruned_files = snapshots.prune()
+        print(f"[Snapshot] {snapshots.report()}, 보관 기간이 지난 기록 {pruned_records}건 / 본문 {pruned_files}개 삭제")
+        snapshots.close()
+
+        if metrics.enabled:
+            for line in metrics.summary_lines():
+                print(f"[Metrics] {line}")
+            metrics_options = settings.get("metrics") or {}
+            metrics.write_json(PROJECT_ROOT / metrics_options.get("json_path", ".cache/metrics/run_report.json"))
+            metrics.write_prometheus(PROJECT_ROOT / metrics_options.get("prometheus_path", ".cache/metrics/crawler.prom"))
 
     print("\n" + "=" * 60)
     print(f"       크롤링 완료!")
     print(f"       새로 추가된 캠페인: {total_new}개")
+    print(f"       LLM 토큰: 입력 {llm.usage.total.input_tokens:,} / 출력 {llm.usage.total.output_tokens:,} "
+          f"(${llm.usage.cost():.4f})")
     print("=" * 60 + "\n")
 
+    if work:
+        print(f"[Worker] {work.report()}")
+        work.report_worker({
+            "worker_id": work.worker_id,
+            "pages": stats.processed,
+            "list_pages": stats.list_pages,
+            "submitted": stats.submitted,
+            "not_environmental": stats.not_environmental,
+            "failed": stats.fetch_failed + stats.llm_failed + stats.errors,
+            "new_campaigns": total_new,
+            "seconds": round(elapsed, 2),
+            "pages_per_second": round(stats.processed / elapsed, 2) if elapsed else 0.0,
+            "llm_calls": llm.usage.total.calls,
+            "llm_input_tokens": llm.usage.total.input_tokens,
+            "llm_output_tokens": llm.usage.total.output_tokens,
+            "llm_cost_usd": llm.usage.cost(),
+        })
+        # 먼저 끝난 워커는 그때까지 보고된 워커만 합산 (전체 합계는 마지막 워커 또는 --worker-summary)
+        print_worker_summary(work)
+        work.close()
+
     # GitHub Actions 연동: 결과 출력
     github_output = os.environ.get('GITHUB_OUTPUT')
     if github_output:
@@ -248,7 +625,21 @@ async def main():
             f.write(f"new_campaigns_count={total_new}\n")
             if total_new > 0:
                 f.write("has_new_campaigns=true\n")
+            for key, value in llm.usage.outputs().items():
+                f.write(f"{key}={value}\n")
+
+
+def main_cli():
+    args = parse_args()
+    if args.workers > 1:
+        run_workers(args)
+    elif args.worker_summary:
+        work = open_work_queue(args.config, args.run_id or default_run_id())
+        print_worker_summary(work)
+        work.close()
+    else:
+        asyncio.run(main(args))
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    main_cli()
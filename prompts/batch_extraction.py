@@ -0,0 +1,81 @@
+"""여러 상세 페이지를 한 번에 분석하는 배치 추출 프롬프트"""
+
+BATCH_EXTRACTION_PROMPT = """
+아래에 여러 웹페이지의 HTML이 "### 문서 <key>" 구분선으로 나뉘어 있습니다.
+각 문서를 **독립적으로** 분석하여 환경 캠페인 상세 정보를 수집하세요. 문서끼리 정보를 섞지 마세요.
+
+## 문서 목록
+{documents}
+
+## 작업 순서 (문서마다)
+1. HTML 내용을 바탕으로 환경/에코/친환경/탄소중립/제로웨이스트 관련 캠페인인지 판단
+2. 캠페인 상세 정보 및 미션 추출
+
+## 추출할 캠페인 정보
+- title: 캠페인 제목 (필수)
+- description: 간단 소개 (필수,200자 이내)
+- host_organizer: 주최 기관명 (필수)
+- image_url: 썸네일 이미지 URL (절대 경로, jpg, png, svg 형식)
+- start_date / end_date: 캠페인 시작일 / 종료일 (YYYY-MM-DD 형식)
+- region: 지역 (주최 지역, 없다면 "전국"으로 기입)
+- category: 카테고리 (재활용/대중교통/에너지절약/제로웨이스트/자연보호/교육/기타 중 선택)
+- campaign_type: ONLINE 또는 OFFLINE
+
+## 추출할 미션 정보
+사용자가 캠페인을 완료하기 위해 직접 수행해야 하는 구체적인 행동('참여 방법', '활동 내용', '미션', '인증 방법')을 순서대로 추출하세요.
+개인정보 수집 동의, 단순 소개 문구, 인사말은 제외하세요.
+- title: 웹페이지에 적힌 텍스트 **그대로** (요약 금지)
+- description: 웹페이지에 적힌 상세 내용 **그대로** (500자 이내)
+- verification_type: 사진/이미지→IMAGE, 텍스트/소감/설문/링크제출→TEXT_REVIEW, 퀴즈→QUIZ
+- order: 수행 순서 (1부터 시작)
+
+## 출력 형식 (반드시 JSON만 출력)
+```json
+{{
+    "results": [
+        {{
+            "key": "문서 key",
+            "page_type": "detail",
+            "is_environmental_campaign": true 또는 false,
+            "campaigns": [
+                {{
+                    "title": "캠페인 제목",
+                    "campaign_url": "문서의 URL",
+                    "description": "캠페인 설명...",
+                    "host_organizer": "주최 기관",
+                    "image_url": "https://example.com/image.jpg",
+                    "start_date": "2025-01-01",
+                    "end_date": "2025-12-31",
+                    "region": "서울",
+                    "category": "제로웨이스트",
+                    "campaign_type": "ONLINE",
+                    "missions": [
+                        {{
+                            "title": "미션 제목",
+                            "description": "미션 설명",
+                            "verification_type": "IMAGE 또는 TEXT_REVIEW 또는 QUIZ",
+                            "order": 1
+                        }}
+                    ]
+                }}
+            ]
+        }}
+    ]
+}}
+```
+
+## 중요 규칙
+1. 모든 문서에 대해 key가 일치하는 결과를 하나씩 출력
+2. 환경 캠페인이 아니면 is_environmental_campaign: false, campaigns는 빈 배열
+3. 해당 캠페인의 모든 정보를 campaigns[0]에 담기
+4. URL은 반드시 절대 경로 (https://로 시작), campaign_url은 문서의 URL 그대로
+5. 정보가 없는 필드는 null, 미션이 없으면 missions는 빈 배열 []
+6. JSON 외의 다른 텍스트 출력 금지
+"""
+
+# 문서 하나의 구분 블록
+BATCH_DOCUMENT_TEMPLATE = """
+### 문서 {key}
+URL: {url}
+{html}
+"""
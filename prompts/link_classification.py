@@ -0,0 +1,28 @@
+"""목록 페이지 후보 링크 분류 프롬프트 (결정적으로 수집된 링크 목록 분석)"""
+
+LINK_CLASSIFICATION_PROMPT = """
+캠페인 목록 페이지에서 수집한 링크 후보 목록입니다. 각 줄은 "번호. 링크 텍스트 | URL" 형식입니다.
+
+## 목록 페이지 URL
+{url}
+
+## 링크 후보
+{candidates}
+
+## 분류 규칙
+1. 개별 캠페인의 상세 페이지로 이동하는 링크만 고르세요.
+   - 메뉴, 로그인, 공지사항, 페이지 번호, SNS 공유, 배너 링크는 제외
+2. 환경/에코/친환경/탄소중립/제로웨이스트/재활용 관련 캠페인만 고르세요.
+3. 링크 텍스트가 없으면 URL 경로로 판단하세요.
+
+## 출력 형식 (JSON만 출력)
+```json
+{{
+    "campaign_indices": [1, 4, 7]
+}}
+```
+
+## 중요
+- JSON 외의 다른 텍스트 출력 금지
+- 목록에 있는 번호만 사용하세요
+"""
@@ -1,4 +1,21 @@
-from .supabase_client import SupabaseService
-from .gemini_rpa import GeminiRPAService
+"""
+크롤러 서비스 패키지
+- 무거운 클라이언트(supabase, Gemini CLI)는 처음 접근할 때 import (비동기 크롤링 경로의 시작 시간 단축)
+"""
+
+from importlib import import_module
+
+_LAZY_EXPORTS = {
+    "SupabaseService": ".supabase_client",
+    "GeminiRPAService": ".gemini_rpa",
+}
 
 __all__ = ["SupabaseService", "GeminiRPAService"]
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,453 @@
+"""브라우저 렌더링을 여러 프로세스로 나눠 CPU 코어를 모두 사용하는 워커 풀"""
+
+import asyncio
+import itertools
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from services.browser_service import BrowserService, RenderResult
+from services.html_reducer import HtmlReducer
+from services.link_extractor import collect_links
+from services.metrics import metrics
+from services.rate_limiter import DomainScheduler
+from services.site_settings import SiteSettings
+
+# 워커가 부모에게 보내는 메시지 종류
+_RESULT = "result"
+_STATS = "stats"
+
+
+# ----------------------------------------------------------------------
+# 워커 프로세스
+# ----------------------------------------------------------------------
+
+def _worker_main(conn, config: Dict, options: Dict):
+    """워커 프로세스 진입점 (spawn으로 시작되므로 모듈 최상위 함수)"""
+    # Ctrl+C는 부모가 처리하고 워커는 close()로 정리
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        asyncio.run(_serve(conn, config, options))
+    except (EOFError, OSError):
+        # 부모 프로세스가 먼저 종료됨
+        pass
+
+
+async def _serve(conn, config: Dict, options: Dict):
+    """
+    부모가 보낸 URL을 자체 브라우저로 렌더링하고 HTML 후처리까지 마친 결과를 반환
+    - HTML 축소(LLMService와 같은 settings.html_reduction 설정)와 목록의 후보 링크 수집을 이 프로세스에서 수행
+    - 부모에는 축소된 HTML과 후보 링크만 전달 (수 MB 원본 HTML은 부모로 넘어가지 않음)
+    """
+    site_settings = SiteSettings(config)
+    browser = BrowserService(
+        headless=options["headless"],
+        site_settings=site_settings,
+        pool_size=options["pool_size"],
+        max_uses=options["max_uses"],
+    )
+    reducer = HtmlReducer.from_settings(config.get("settings"))
+    tasks = set()
+
+    def process(url: str, kind: str, html: str):
+        # 후보 링크는 축소 전 원본에서 수집 (파이프라인의 수집 방식과 동일)
+        candidates, unresolved = None, []
+        if kind == "list":
+            candidates, unresolved = collect_links(html, url, site_settings.get(url, "link_templates"))
+        reduced, stats = reducer.reduce(html)
+        return reduced, stats.summary(), candidates, unresolved
+    # 첫 요청 전에 브라우저 실행 (실패하면 첫 렌더링 때 다시 시도하므로 예외는 여기서 소비)
+    prelaunch = asyncio.create_task(browser.launch())
+    prelaunch.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    async def handle(request_id: int, url: str, kind: str):
+        started = time.perf_counter()
+        try:
+            rendered = await browser.render(url)
+        except Exception as e:
+            # 브라우저 실행 실패 등: 워커는 살려두고 빈 결과 반환
+            print(f"[BrowserPool] 워커 {os.getpid()} 렌더링 실패 {url}: {e}")
+            rendered = RenderResult()
+
+        html = rendered.html
+        reduced, reduction, candidates, unresolved = "", "", None, []
+        process_started = time.perf_counter()
+        if html:
+            # 파싱 중에도 다른 페이지의 렌더링/요청 수신이 진행되도록 스레드에서 실행
+            reduced, reduction, candidates, unresolved = await asyncio.to_thread(process, url, kind, html)
+        conn.send((_RESULT, request_id, {
+            "html": reduced,
+            "raw_bytes": len(html.encode("utf-8")),
+            "sent_bytes": len(reduced.encode("utf-8")),
+            "candidates": candidates,
+            "unresolved": unresolved,
+            "reduction": reduction,
+            "process_seconds": time.perf_counter() - process_started,
+            "status": rendered.status,
+            "retry_after": rendered.retry_after,
+            "strategy": rendered.strategy,
+            "ready_seconds": rendered.ready_seconds,
+            "navigation_seconds": rendered.navigation_seconds,
+            "seconds": time.perf_counter() - started,
+            "cpu_seconds": time.process_time(),
+        }))
+
+    try:
+        while True:
+            message = await asyncio.to_thread(conn.recv)
+            if message is None:
+                break
+            task = asyncio.create_task(handle(*message))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        conn.send((_STATS, None, {
+            "contexts_created": browser.contexts_created,
+            "contexts_recycled": browser.contexts_recycled,
+            "blocked_requests": browser.blocked_requests,
+            "cpu_seconds": time.process_time(),
+        }))
+    finally:
+        await browser.close()
+        conn.close()
+
+
+# ----------------------------------------------------------------------
+# 부모 프로세스
+# ----------------------------------------------------------------------
+
+@dataclass
+class _WorkerHandle:
+    """워커 프로세스 하나의 상태와 통계"""
+    index: int
+    process: Optional[multiprocessing.Process] = None
+    conn: Optional[object] = None
+    reader: Optional[threading.Thread] = None
+    pending: Dict[int, asyncio.Future] = field(default_factory=dict)
+    alive: bool = False
+    started_at: float = 0.0
+
+    # 통계
+    requests: int = 0
+    failures: int = 0
+    restarts: int = 0
+    render_seconds: float = 0.0
+    busy_seconds: float = 0.0
+    busy_since: float = 0.0
+    uptime_seconds: float = 0.0
+    peak_pending: int = 0
+    raw_bytes: int = 0
+    sent_bytes: int = 0
+    cpu_seconds: float = 0.0  # 이전 프로세스(재시작 전)까지의 누적
+    last_cpu: float = 0.0  # 현재 프로세스의 누적 CPU 시간
+
+    def utilization(self, now: float) -> float:
+        """가동 시간 중 렌더링 요청을 처리하던 시간 비율"""
+        busy = self.busy_seconds + (now - self.busy_since if self.pending else 0.0)
+        uptime = self.uptime_seconds + (now - self.started_at if self.alive else 0.0)
+        return busy / uptime if uptime > 0 else 0.0
+
+
+class BrowserProcessPool(BrowserService):
+    """
+    BrowserService를 워커 프로세스마다 하나씩 띄워 렌더링을 분산 (BrowserService와 같은 인터페이스)
+    - 워커마다 자체 Playwright + Chromium + Context 풀 (전체 pool_size를 워커 수로 나눔)
+    - 부모는 도메인 간격(scheduler)과 429/503 재시도만 담당하고, URL은 진행 중 요청이 가장 적은 워커에 배분
+    - 워커가 HTML 축소와 목록의 후보 링크 수집까지 수행하고 축소본 + 후보 링크만 반환
+      (수 MB HTML의 파싱이 부모의 이벤트 루프 코어 하나에 몰리지 않고 워커 코어로 분산)
+    - 워커가 죽거나 request_timeout_seconds 동안 응답이 없으면 다시 시작하고,
+      진행 중이던 요청은 다른 워커에서 한 번 재시도
+    - 워커별 처리 건수, 평균 렌더링 시간, 사용률, CPU 시간, 재시작 횟수 집계
+    """
+
+    def __init__(
+        self,
+        config: Dict,
+        processes: int = 2,
+        headless: bool = True,
+        scheduler: Optional[DomainScheduler] = None,
+        max_retries: int = 2,
+        pool_size: int = 4,
+        max_uses: int = 20,
+        request_timeout_seconds: float = 120.0,
+        max_restarts: int = 5,
+        start_method: str = "spawn",
+    ):
+        super().__init__(
+            headless=headless,
+            scheduler=scheduler,
+            max_retries=max_retries,
+            site_settings=SiteSettings(config),
+            pool_size=pool_size,
+            max_uses=max_uses,
+        )
+        # 워커에는 설정 중 사이트별 설정만 전달 (pickle 크기 최소화)
+        self.config = {"settings": config.get("settings") or {}, "sites": config.get("sites") or {}}
+        self.processes = max(1, processes)
+        self.request_timeout = request_timeout_seconds
+        self.max_restarts = max_restarts
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: List[_WorkerHandle] = []
+        self._request_ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing = False
+
+        self.worker_crashes = 0
+        self.crash_retries = 0
+
+    @classmethod
+    def from_settings(cls, config: Dict, processes: Optional[int] = None, **kwargs) -> "BrowserProcessPool":
+        """sites.yaml의 settings.browser 섹션으로 생성 (processes를 주면 설정값 대신 사용)"""
+        options = ((config.get("settings") or {}).get("browser") or {})
+        return cls(
+            config,
+            processes=processes or options.get("processes", 2),
+            pool_size=options.get("pool_size", 4),
+            max_uses=options.get("max_uses", 20),
+            request_timeout_seconds=options.get("request_timeout_seconds", 120.0),
+            max_restarts=options.get("max_restarts", 5),
+            **kwargs,
+        )
+
+    @property
+    def contexts_per_worker(self) -> int:
+        return max(1, math.ceil(self.pool_size / self.processes))
+
+    async def launch(self):
+        """워커 프로세스 시작 (첫 페이지 수집 시 자동 호출, 동시 호출 시 한 번만 실행)"""
+        async with self._launch_lock:
+            if self._workers:
+                return
+            self._loop = asyncio.get_running_loop()
+            self._workers = [_WorkerHandle(index=i) for i in range(self.processes)]
+            for worker in self._workers:
+                self._start_worker(worker)
+            print(
+                f"[BrowserPool] 워커 프로세스 {self.processes}개 시작 "
+                f"(워커당 Context {self.contexts_per_worker}개)"
+            )
+
+    def _start_worker(self, worker: _WorkerHandle):
+        parent_conn, child_conn = self._context.Pipe()
+        options = {
+            "headless": self.headless,
+            "pool_size": self.contexts_per_worker,
+            "max_uses": self.max_uses,
+        }
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(child_conn, self.config, options),
+            name=f"browser-worker-{worker.index}",
+            daemon=True,
+        )
+        worker.process.start()
+        # 자식 쪽 끝을 닫아야 워커 종료 시 부모가 EOF를 받음
+        child_conn.close()
+        worker.conn = parent_conn
+        worker.alive = True
+        worker.started_at = time.monotonic()
+        worker.last_cpu = 0.0
+        worker.reader = threading.Thread(
+            target=self._read_loop, args=(worker, parent_conn), name=f"browser-worker-reader-{worker.index}", daemon=True
+        )
+        worker.reader.start()
+
+    def _read_loop(self, worker: _WorkerHandle, conn):
+        """워커 응답 수신 스레드 (역직렬화를 이벤트 루프 밖에서 처리)"""
+        while True:
+            try:
+                kind, request_id, payload = conn.recv()
+            except (EOFError, OSError):
+                break
+            self._call_soon(self._on_message, worker, kind, request_id, payload)
+        self._call_soon(self._on_exit, worker, conn)
+
+    def _call_soon(self, callback, *args):
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힘 (종료 중)
+            pass
+
+    def _on_message(self, worker: _WorkerHandle, kind: str, request_id: Optional[int], payload: Dict):
+        if kind == _STATS:
+            self.contexts_created += payload["contexts_created"]
+            self.contexts_recycled += payload["contexts_recycled"]
+            self.blocked_requests += payload["blocked_requests"]
+            worker.last_cpu = payload["cpu_seconds"]
+            return
+        worker.last_cpu = payload["cpu_seconds"]
+        future = self._pop_pending(worker, request_id)
+        if future and not future.done():
+            future.set_result(payload)
+
+    def _pop_pending(self, worker: _WorkerHandle, request_id: int) -> Optional[asyncio.Future]:
+        future = worker.pending.pop(request_id, None)
+        if future is not None and not worker.pending:
+            worker.busy_seconds += time.monotonic() - worker.busy_since
+        return future
+
+    def _on_exit(self, worker: _WorkerHandle, conn):
+        """워커 종료 처리 (진행 중 요청은 재시도 대상으로 돌려주고, 종료 중이 아니면 다시 시작)"""
+        if worker.conn is not conn:
+            # 이미 교체된 이전 프로세스
+            return
+        worker.alive = False
+        worker.uptime_seconds += time.monotonic() - worker.started_at
+        worker.cpu_seconds += worker.last_cpu
+        worker.last_cpu = 0.0
+        for request_id in list(worker.pending):
+            future = self._pop_pending(worker, request_id)
+            if not future.done():
+                future.set_result(None)
+        if worker.process:
+            worker.process.join(timeout=1)
+        if self._closing:
+            return
+
+        self.worker_crashes += 1
+        exitcode = worker.process.exitcode if worker.process else None
+        metrics.count("browser_worker", "crash")
+        if worker.restarts >= self.max_restarts:
+            print(f"[BrowserPool] 워커 {worker.index} 종료 (exit {exitcode}), 재시작 한도 초과로 중단")
+            return
+        worker.restarts += 1
+        print(f"[BrowserPool] 워커 {worker.index} 종료 (exit {exitcode}), 다시 시작 ({worker.restarts}/{self.max_restarts})")
+        self._start_worker(worker)
+
+    def _pick_worker(self) -> Optional[_WorkerHandle]:
+        """진행 중 요청이 가장 적은 워커"""
+        alive = [w for w in self._workers if w.alive]
+        if not alive:
+            return None
+        return min(alive, key=lambda w: (len(w.pending), w.requests))
+
+    async def _request(self, worker: _WorkerHandle, url: str, kind: str) -> Optional[Dict]:
+        """
+        워커 하나에 렌더링 요청
+
+        Returns:
+            워커 응답 (워커가 도중에 종료되면 None)
+        """
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        if not worker.pending:
+            worker.busy_since = time.monotonic()
+        worker.pending[request_id] = future
+        worker.peak_pending = max(worker.peak_pending, len(worker.pending))
+        try:
+            worker.conn.send((request_id, url, kind))
+        except (BrokenPipeError, OSError):
+            # 종료 처리는 수신 스레드가 EOF를 받아 진행
+            self._pop_pending(worker, request_id)
+            return None
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.request_timeout)
+        except asyncio.TimeoutError:
+            self._pop_pending(worker, request_id)
+            print(f"[BrowserPool] 워커 {worker.index} 응답 없음 ({self.request_timeout:.0f}초), 프로세스 재시작: {url}")
+            if worker.process and worker.process.is_alive():
+                worker.process.kill()
+            return {}
+
+    async def render(self, url: str, kind: str = "detail") -> RenderResult:
+        """
+        워커 프로세스에서 페이지 1회 렌더링 (워커가 도중에 종료되면 다른 워커에서 한 번 재시도)
+        - 반환되는 html은 축소본(reduced=True), 목록이면 후보 링크 포함
+        """
+        if not self._workers:
+            await self.launch()
+
+        for attempt in range(2):
+            worker = self._pick_worker()
+            if worker is None:
+                print(f"[BrowserPool] 사용 가능한 워커가 없어 스킵: {url}")
+                return RenderResult()
+            payload = await self._request(worker, url, kind)
+            if payload is None:
+                if attempt == 0:
+                    self.crash_retries += 1
+                    print(f"[BrowserPool] 워커 {worker.index} 종료로 재시도: {url}")
+                continue
+
+            worker.requests += 1
+            metrics.count("browser_worker", f"worker{worker.index}", url)
+            if not payload:
+                # 응답 시간 초과
+                worker.failures += 1
+                return RenderResult()
+            worker.render_seconds += payload["seconds"]
+            worker.raw_bytes += payload["raw_bytes"]
+            worker.sent_bytes += payload["sent_bytes"]
+            rendered = RenderResult(
+                html=payload["html"] or "",
+                status=payload["status"],
+                retry_after=payload["retry_after"],
+                strategy=payload["strategy"],
+                ready_seconds=payload["ready_seconds"],
+                navigation_seconds=payload["navigation_seconds"],
+                reduced=bool(payload["html"]),
+                candidates=payload["candidates"],
+                unresolved=payload["unresolved"],
+            )
+            if not rendered.html:
+                worker.failures += 1
+            else:
+                print(f"[BrowserPool] 워커 {worker.index} HTML 축소 {payload['reduction']}: {url}")
+                metrics.observe("html_reduction", payload["process_seconds"], url)
+            if rendered.navigation_seconds:
+                metrics.observe("navigation", rendered.navigation_seconds, url)
+            if rendered.strategy:
+                self._record_ready(url, rendered)
+            metrics.observe("browser_worker_render", payload["seconds"], url)
+            return rendered
+        return RenderResult()
+
+    def worker_report(self) -> List[str]:
+        """워커별 처리 건수 / 사용률 / CPU 시간 요약"""
+        now = time.monotonic()
+        lines = []
+        for w in self._workers:
+            avg = w.render_seconds / w.requests if w.requests else 0.0
+            ratio = w.sent_bytes / w.raw_bytes if w.raw_bytes else 1.0
+            lines.append(
+                f"워커 {w.index}: 처리 {w.requests}건 (실패 {w.failures}), 평균 {avg:.1f}초, "
+                f"사용률 {w.utilization(now):.0%}, 최대 동시 {w.peak_pending}, "
+                f"CPU {w.cpu_seconds + w.last_cpu:.1f}초, 전송 {w.sent_bytes / 1e6:.1f}MB (원본 대비 {ratio:.0%}), "
+                f"재시작 {w.restarts}"
+            )
+        return lines
+
+    def report(self) -> str:
+        """풀 사용 및 페이지 준비 시간 통계 요약"""
+        return (
+            f"워커 프로세스 {self.processes}개, 비정상 종료 {self.worker_crashes}회 (재시도 {self.crash_retries}건), "
+            + super().report()
+        )
+
+    async def close(self):
+        """워커 프로세스 종료 (진행 중 요청을 마치고 통계를 받은 뒤 종료)"""
+        self._closing = True
+        for worker in self._workers:
+            if worker.alive:
+                try:
+                    worker.conn.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+        for worker in self._workers:
+            if worker.process:
+                await asyncio.to_thread(worker.process.join, 30)
+                if worker.process.is_alive():
+                    worker.process.kill()
+                    await asyncio.to_thread(worker.process.join, 5)
+            if worker.reader:
+                await asyncio.to_thread(worker.reader.join, 5)
+        # 수신 스레드가 예약한 통계/종료 처리 반영
+        await asyncio.sleep(0)
@@ -1,63 +1,297 @@
 import asyncio
-from playwright.async_api import async_playwright, Browser, Playwright
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+from urllib.parse import urlparse
+
+from services.link_extractor import LinkCandidate
+from services.metrics import metrics
+from services.page_readiness import wait_until_ready
+from services.rate_limiter import THROTTLE_STATUSES, DomainScheduler
+from services.site_settings import SiteSettings
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright, Route
+
+# DOM만 읽으므로 기본적으로 차단하는 리소스 타입
+DEFAULT_BLOCK_RESOURCE_TYPES = ["image", "media", "font"]
+
+# 광고/분석 스크립트 호스트 (하위 도메인 포함)
+DEFAULT_BLOCK_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "facebook.net",
+    "wcs.naver.net",
+    "hotjar.com",
+]
+
+
+def _host_matches(host: str, patterns: List[str]) -> bool:
+    """호스트가 패턴 도메인 또는 그 하위 도메인인지"""
+    return any(host == p or host.endswith("." + p) for p in patterns)
+
+
+@dataclass
+class RenderResult:
+    """페이지 1회 렌더링 결과"""
+    html: str = ""
+    status: Optional[int] = None  # 응답 상태 (접속 실패 시 None)
+    retry_after: Optional[str] = None
+    strategy: str = ""  # readiness 전략
+    ready_seconds: float = 0.0
+    navigation_seconds: float = 0.0
+    # 워커 프로세스에서 미리 처리한 결과 (BrowserProcessPool): html이 이미 축소본인지, 목록의 후보 링크
+    reduced: bool = False
+    candidates: Optional[List[LinkCandidate]] = None
+    unresolved: List[str] = field(default_factory=list)
+
+
+@dataclass
+class _PooledPage:
+    """재사용되는 Context + Page"""
+    context: "BrowserContext"
+    page: "Page"
+    uses: int = 0
+    # 현재 수집 중인 사이트의 리소스 차단 설정 (라우트 핸들러가 참조)
+    rules: Dict = field(default_factory=dict)
+
 
 class BrowserService:
     """
     Playwright 브라우저 관리 서비스 (Async)
     - 단일 브라우저 인스턴스 공유
-    - 요청마다 독립된 Context 생성 (병렬 처리 시 충돌 방지)
+    - Context/Page 풀을 재사용 (max_uses회 사용 또는 오류 시 교체)
+    - 이미지/폰트/미디어 및 광고·분석 호스트 요청 차단 (사이트별 허용 목록 지원)
+    - 고정 대기 대신 사이트별 readiness 전략으로 렌더링 완료 감지
+    - scheduler가 있으면 도메인별 요청 간격 준수 및 429/503 시 재시도
     """
 
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: bool = True,
+        scheduler: Optional[DomainScheduler] = None,
+        max_retries: int = 2,
+        site_settings: Optional[SiteSettings] = None,
+        pool_size: int = 4,
+        max_uses: int = 20,
+    ):
         self.headless = headless
-        self.playwright: Playwright = None
-        self.browser: Browser = None
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.site_settings = site_settings or SiteSettings({})
+        self.pool_size = pool_size
+        self.max_uses = max_uses
+        self.playwright: "Playwright" = None
+        self.browser: "Browser" = None
+
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._created = 0
+        self._pool_lock = asyncio.Lock()
+        self._launch_lock = asyncio.Lock()
+
+        # 통계
+        self.contexts_created = 0
+        self.contexts_recycled = 0
+        self.blocked_requests = 0
+        # 전략별 준비 시간 [건수, 합계(초), 최대(초)] (URL별 기록은 metrics에 위임)
+        self.ready_times: Dict[str, List[float]] = {}
+
+    @classmethod
+    def from_settings(cls, site_settings: SiteSettings, **kwargs) -> "BrowserService":
+        """sites.yaml의 settings.browser 섹션으로 생성"""
+        options = site_settings.defaults.get("browser") or {}
+        return cls(
+            site_settings=site_settings,
+            pool_size=options.get("pool_size", 4),
+            max_uses=options.get("max_uses", 20),
+            **kwargs,
+        )
 
     async def launch(self):
-        """브라우저 시작"""
-        if not self.playwright:
-            self.playwright = await async_playwright().start()
-        
-        if not self.browser:
-            # 봇 탐지 회피를 위한 기본 인자 설정
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox"
-                ]
-            )
+        """브라우저 시작 (첫 페이지 수집 시 자동 호출, 동시 호출 시 한 번만 실행)"""
+        async with self._launch_lock:
+            if not self.playwright:
+                # playwright는 브라우저가 실제로 필요할 때만 import (HTTP만 쓰는 실행은 로드하지 않음)
+                from playwright.async_api import async_playwright
 
-    async def get_page_content(self, url: str) -> str:
-        """
-        URL에 접속하여 페이지 HTML 콘텐츠 반환
-        - 새 Context 생성 -> 페이지 접속 -> HTML 추출 -> Context 종료
-        """
-        if not self.browser:
-            await self.launch()
+                self.playwright = await async_playwright().start()
 
+            if not self.browser:
+                # 봇 탐지 회피를 위한 기본 인자 설정
+                self.browser = await self.playwright.chromium.launch(
+                    headless=self.headless,
+                    args=[
+                        "--disable-blink-features=AutomationControlled",
+                        "--no-sandbox",
+                        "--disable-setuid-sandbox"
+                    ]
+                )
+
+    # ------------------------------------------------------------------
+    # Context/Page 풀
+    # ------------------------------------------------------------------
+
+    def _blocking_rules(self, url: str) -> Dict:
+        """사이트별 리소스 차단 규칙 (settings.browser + sites.<host>.browser)"""
+        options = self.site_settings.get(url, "browser") or {}
+        allow_types = set(options.get("allow_resource_types") or [])
+        return {
+            "block_types": set(options.get("block_resource_types", DEFAULT_BLOCK_RESOURCE_TYPES)) - allow_types,
+            "block_hosts": list(options.get("block_hosts", DEFAULT_BLOCK_HOSTS)),
+            "allow_hosts": list(options.get("allow_hosts") or []),
+        }
+
+    async def _create_pooled_page(self) -> _PooledPage:
         # 봇 탐지 회피를 위한 User-Agent 설정
         context = await self.browser.new_context(
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             viewport={"width": 1920, "height": 1080}
         )
-        
         page = await context.new_page()
-        
+        pooled = _PooledPage(context=context, page=page)
+
+        async def handle_route(route: "Route"):
+            request = route.request
+            rules = pooled.rules
+            host = (urlparse(request.url).hostname or "").lower()
+            if not _host_matches(host, rules.get("allow_hosts", [])):
+                if request.resource_type in rules.get("block_types", ()) \
+                        or _host_matches(host, rules.get("block_hosts", [])):
+                    self.blocked_requests += 1
+                    await route.abort()
+                    return
+            await route.continue_()
+
+        await page.route("**/*", handle_route)
+        self.contexts_created += 1
+        return pooled
+
+    async def _acquire_page(self) -> _PooledPage:
+        """유휴 Page를 꺼내거나, 풀 여유가 있으면 새로 생성"""
+        if not self.browser:
+            await self.launch()
+
+        while True:
+            async with self._pool_lock:
+                if self._idle.empty() and self._created < self.pool_size:
+                    self._created += 1
+                    try:
+                        return await self._create_pooled_page()
+                    except Exception:
+                        self._created -= 1
+                        # 빈 자리가 생겼으므로 대기 중인 요청이 다시 생성 시도하도록 깨움
+                        self._idle.put_nowait(None)
+                        raise
+            pooled = await self._idle.get()
+            if pooled is not None:
+                return pooled
+            # None: 교체/생성 실패로 풀에 빈 자리가 생김 → 다시 생성 시도
+
+    async def _release_page(self, pooled: _PooledPage, failed: bool):
+        """사용한 Page 반납 (오류 또는 사용 횟수 초과 시 폐기 후 재생성 대상)"""
+        pooled.uses += 1
+        if failed or pooled.uses >= self.max_uses:
+            self.contexts_recycled += 1
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
+            async with self._pool_lock:
+                self._created -= 1
+                # 대기 중인 요청이 있으면 바로 새 Page 공급
+                if self.browser:
+                    try:
+                        self._created += 1
+                        self._idle.put_nowait(await self._create_pooled_page())
+                        return
+                    except Exception:
+                        self._created -= 1
+                # 새 Page를 만들지 못함: 대기 중인 요청을 깨워 _acquire_page에서 다시 생성 시도
+                self._idle.put_nowait(None)
+            return
+        self._idle.put_nowait(pooled)
+
+    # ------------------------------------------------------------------
+    # 페이지 수집
+    # ------------------------------------------------------------------
+
+    async def get_page_content(self, url: str) -> str:
+        """
+        URL에 접속하여 페이지 HTML 콘텐츠 반환
+        - 도메인별 요청 허가 대기 -> 페이지 수집
+        - 429/503 응답이면 scheduler가 지정한 시간만큼 기다린 뒤 재시도
+        """
+        return (await self.get_rendered(url)).html
+
+    async def get_rendered(self, url: str, kind: str = "detail") -> RenderResult:
+        """get_page_content와 같지만 렌더링 결과 전체 반환 (차단 응답 반복 시 빈 결과)"""
+        for attempt in range(self.max_retries + 1):
+            if self.scheduler:
+                await self.scheduler.acquire(url)
+
+            rendered, throttled = await self._fetch_once(url, kind)
+            if not throttled:
+                return rendered
+            if attempt < self.max_retries:
+                print(f"[Browser] 재시도 대기 ({attempt + 1}/{self.max_retries}): {url}")
+
+        print(f"[Browser] 차단 응답 반복으로 스킵: {url}")
+        return RenderResult()
+
+    async def _fetch_once(self, url: str, kind: str = "detail"):
+        """
+        페이지 1회 수집 (렌더링 후 응답 상태를 scheduler에 반영)
+
+        Returns:
+            (렌더링 결과, 차단/과부하 응답 여부)
+        """
+        rendered = await self.render(url, kind)
+        if self.scheduler and rendered.status:
+            if self.scheduler.report_response(url, rendered.status, rendered.retry_after):
+                return RenderResult(), True
+        return rendered, False
+
+    async def render(self, url: str, kind: str = "detail") -> RenderResult:
+        """
+        페이지 1회 렌더링
+        - 풀에서 Page 획득 -> 페이지 접속 -> readiness 대기 -> HTML 추출 -> 풀에 반납
+        - 429/503 응답이면 렌더링 없이 상태만 반환
+        - kind는 BrowserProcessPool에서 워커 측 후처리(목록이면 후보 링크 수집)에 사용
+        """
+        pooled = await self._acquire_page()
+        pooled.rules = self._blocking_rules(url)
+        page = pooled.page
+        failed = False
+        rendered = RenderResult()
+
         try:
             # 페이지 접속
-            await page.goto(url, wait_until="domcontentloaded", timeout=30000)
-            
-            # 스크롤을 내려서 Lazy Loading 이미지/콘텐츠 로드 유도
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await asyncio.sleep(3) # 스크롤 후 대기 (충분히)
-            
+            started = time.perf_counter()
+            response = await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+            rendered.navigation_seconds = time.perf_counter() - started
+            metrics.observe("navigation", rendered.navigation_seconds, url)
+            if response:
+                rendered.status = response.status
+                rendered.retry_after = response.headers.get("retry-after")
+                if response.status in THROTTLE_STATUSES:
+                    return rendered
+
+            # Lazy Loading 콘텐츠까지 렌더링될 때까지 대기 (전략은 사이트별 설정)
+            readiness = self.site_settings.get(url, "readiness") or {}
+            rendered.ready_seconds = await wait_until_ready(page, readiness)
+            rendered.strategy = readiness.get("strategy", "scroll")
+            self._record_ready(url, rendered)
+            print(f"[Browser] 준비 완료 {rendered.ready_seconds:.1f}초 ({rendered.strategy}): {url}")
+
             # HTML 추출
-            content = await page.content()
-            return content
-            
+            rendered.html = await page.content()
+            return rendered
+
         except Exception as e:
+            failed = True
             error_msg = str(e)
             # SSL 인증서 관련 에러 처리
             if "ERR_CERT" in error_msg:
@@ -70,17 +304,43 @@ class BrowserService:
                 print(f"[Browser] 타임아웃: {url}")
             else:
                 print(f"[Browser] Error fetching {url}: {e}")
-            return ""
-            
+            return RenderResult(status=rendered.status)
+
         finally:
-            await context.close()
+            await self._release_page(pooled, failed)
+
+    def _record_ready(self, url: str, rendered: RenderResult):
+        """전략별 준비 시간 기록"""
+        stats = self.ready_times.setdefault(rendered.strategy, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += rendered.ready_seconds
+        stats[2] = max(stats[2], rendered.ready_seconds)
+        metrics.observe("readiness_wait", rendered.ready_seconds, url)
+
+    def report(self) -> str:
+        """풀 사용 및 페이지 준비 시간 통계 요약"""
+        text = (
+            f"Context 생성 {self.contexts_created}, 교체 {self.contexts_recycled}, "
+            f"차단한 요청 {self.blocked_requests}"
+        )
+        for strategy, (count, total, longest) in sorted(self.ready_times.items()):
+            text += (
+                f", 준비({strategy}) {count}건 평균 {total / count:.1f}초"
+                f" / 최대 {longest:.1f}초"
+            )
+        return text
 
     async def close(self):
         """브라우저 및 Playwright 종료"""
+        # 풀의 Context는 브라우저 종료 시 함께 정리됨
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        self._created = 0
+
         if self.browser:
             await self.browser.close()
             self.browser = None
-            
+
         if self.playwright:
             await self.playwright.stop()
             self.playwright = None
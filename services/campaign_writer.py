@@ -0,0 +1,129 @@
+"""이벤트 루프를 막지 않는 캠페인 저장 단계 (전용 writer 스레드 + write-behind 배치)"""
+
+import asyncio
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from services.metrics import metrics
+
+_STOP = object()
+
+
+class CampaignWriter:
+    """
+    전용 스레드에서 DB 저장을 수행하는 writer
+    - submit(): 크기 제한 큐에 LLM 결과를 넣고 즉시 반환 (큐가 가득 차면 대기 → backpressure)
+    - writer 스레드: batch_size개 또는 flush_interval초마다 모아서 write_batch 호출
+    - 캠페인 저장은 writer 스레드에서만 수행 (Supabase 동기 클라이언트는 스레드 안전이 보장되지 않음)
+      · 같은 클라이언트를 쓰는 기존 URL 동기화(asyncio.to_thread)는 파이프라인이 첫 저장 전에 완료를 기다리므로 겹치지 않음
+      · 저장과 동시에 호출되는 공유 작업 테이블(SupabaseWorkQueue)은 별도 클라이언트를 사용
+    - existing_urls 갱신도 writer 스레드만 수행하고, 배치 간 중복은 DB upsert(on_conflict)가 차단
+    - on_written이 있으면 write_batch가 예외 없이 끝난 배치의 key 목록으로 호출 (체크포인트/작업 테이블 완료 표시용)
+    - on_failed가 있으면 write_batch가 예외로 끝난 배치의 key 목록으로 호출
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict]], int],
+        max_queue: int = 100,
+        batch_size: int = 20,
+        flush_interval: float = 1.0,
+        on_written: Optional[Callable[[List[str]], None]] = None,
+        on_failed: Optional[Callable[[List[str]], None]] = None,
+    ):
+        self.write_batch = write_batch
+        self.on_written = on_written
+        self.on_failed = on_failed
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="campaign-writer", daemon=True)
+        self._lock = threading.Lock()
+
+        # 통계 (writer 스레드에서 갱신)
+        self.saved = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.max_queue_depth = 0
+        self.write_seconds = 0.0
+
+    def start(self):
+        """writer 스레드 시작"""
+        self._thread.start()
+
+    @property
+    def queue_depth(self) -> int:
+        """현재 대기 중인 결과 수"""
+        return self._queue.qsize()
+
+    async def submit(self, result: Dict, key: Optional[str] = None):
+        """저장할 LLM 결과 투입 (큐가 가득 차면 이벤트 루프를 막지 않고 대기, key는 on_written에 전달)"""
+        while True:
+            try:
+                self._queue.put_nowait((key, result))
+                break
+            except queue.Full:
+                await asyncio.sleep(0.05)
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+    def _collect_batch(self) -> List:
+        """첫 항목을 기다린 뒤 flush_interval 동안 batch_size까지 추가 수집"""
+        items = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(items) < self.batch_size and items[-1] is not _STOP:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return items
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            items = self._collect_batch()
+            if items[-1] is _STOP:
+                stopping = True
+                items.pop()
+            if not items:
+                continue
+
+            started = time.monotonic()
+            try:
+                saved = self.write_batch([result for _, result in items])
+            except Exception as e:
+                print(f"  [ERROR] 저장 배치 실패 ({len(items)}건): {e}")
+                saved = 0
+                with self._lock:
+                    self.failed_batches += 1
+                if self.on_failed:
+                    self.on_failed([key for key, _ in items if key])
+            else:
+                if self.on_written:
+                    self.on_written([key for key, _ in items if key])
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self.saved += saved
+                self.batches += 1
+                self.write_seconds += elapsed
+                metrics.observe("db_write", elapsed)
+                metrics.count("db_write", "saved", value=saved)
+                metrics.count("db_write", "not_saved", value=len(items) - saved)
+
+    async def close(self) -> int:
+        """남은 결과를 모두 저장하고 스레드 종료 (저장된 캠페인 수 반환)"""
+        if self._thread.is_alive():
+            await asyncio.to_thread(self._queue.put, _STOP)
+            await asyncio.to_thread(self._thread.join)
+        return self.saved
+
+    def report(self) -> str:
+        """writer 통계 요약"""
+        return (
+            f"저장 {self.saved}건 / 배치 {self.batches}회 (실패 {self.failed_batches}), "
+            f"쓰기 시간 {self.write_seconds:.1f}초, 최대 큐 깊이 {self.max_queue_depth}"
+        )
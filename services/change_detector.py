@@ -0,0 +1,145 @@
+"""목록 페이지 변경 감지 (소스별 fingerprint 저장)"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Union
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def link_set_hash(urls: Iterable[str]) -> str:
+    """링크 집합의 해시 (순서 무관)"""
+    digest = hashlib.sha256()
+    for url in sorted(set(urls)):
+        digest.update(url.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+@contextmanager
+def _file_lock(path: Path):
+    """프로세스 간 배타 잠금 (--workers로 여러 프로세스가 같은 파일을 동시에 저장)"""
+    with open(path, "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def html_hash(html: str) -> str:
+    """공백 정규화 후 HTML 해시 (후보 링크가 없는 페이지용)"""
+    normalized = _WHITESPACE_RE.sub(" ", html or "").strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class SourceFingerprintStore:
+    """
+    목록 URL별 변경 감지 정보를 JSON 파일로 저장
+    - etag / last_modified: HTTP 조건부 요청용 (304면 렌더링까지 생략)
+    - link_hash: 정규화된 후보 링크 집합 해시 (같으면 LLM 추출 생략)
+    - campaign_urls: 마지막으로 추출한 상세 URL (변경 없을 때 재사용)
+    - last_checked / last_changed: 마지막 확인 / 변경 시각 (epoch 초)
+    - 저장 시 파일 잠금 후 디스크의 내용과 병합 (여러 워커 프로세스가 각자 갱신한 소스를 서로 덮어쓰지 않음)
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.sources: Dict[str, Dict] = {}
+        self.unchanged: List[str] = []
+        self._dirty: Set[str] = set()  # 이 프로세스에서 갱신한 소스
+        if self.path.exists():
+            self.sources = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[Fingerprint] 저장 파일을 읽을 수 없어 새로 시작합니다: {e}")
+            return {}
+
+    def get(self, url: str) -> Optional[Dict]:
+        """소스의 저장된 fingerprint"""
+        return self.sources.get(url)
+
+    def update_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """HTTP 검증자(ETag/Last-Modified) 갱신"""
+        entry = self.sources.setdefault(url, {})
+        self._dirty.add(url)
+        entry["etag"] = etag
+        entry["last_modified"] = last_modified
+
+    def is_unchanged(self, url: str, fingerprint: str) -> bool:
+        """링크 집합 해시가 이전과 같은지"""
+        entry = self.sources.get(url)
+        return bool(entry and entry.get("link_hash") == fingerprint and "campaign_urls" in entry)
+
+    def mark_checked(self, url: str):
+        """변경 없음 확인 기록"""
+        entry = self.sources.setdefault(url, {})
+        self._dirty.add(url)
+        entry["last_checked"] = time.time()
+        self.unchanged.append(url)
+
+    def record(self, url: str, fingerprint: str, campaign_urls: List[str]):
+        """변경된 소스의 새 fingerprint 및 추출 결과 저장"""
+        now = time.time()
+        entry = self.sources.setdefault(url, {})
+        self._dirty.add(url)
+        entry["link_hash"] = fingerprint
+        entry["campaign_urls"] = list(campaign_urls)
+        entry["last_checked"] = now
+        entry["last_changed"] = now
+
+    def report(self, urls: Iterable[str]) -> List[str]:
+        """소스별 마지막 변경 시각 요약"""
+        lines = []
+        for url in urls:
+            entry = self.sources.get(url) or {}
+            changed = entry.get("last_changed")
+            changed_text = datetime.fromtimestamp(changed).strftime("%Y-%m-%d %H:%M") if changed else "기록 없음"
+            status = "변경 없음" if url in self.unchanged else "확인"
+            lines.append(f"{url}: 마지막 변경 {changed_text} ({status})")
+        return lines
+
+    def save(self):
+        """JSON 파일로 저장 (다른 프로세스가 그사이 저장한 소스는 유지하고 이 프로세스가 갱신한 소스만 덮어씀)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(self.path.with_name(self.path.name + ".lock")):
+            merged = self._load() if self.path.exists() else {}
+            merged.update({url: self.sources[url] for url in self._dirty if url in self.sources})
+            # 임시 파일은 프로세스마다 다른 이름 (같은 .tmp를 여러 프로세스가 replace하면 FileNotFoundError)
+            fd, tmp_name = tempfile.mkstemp(prefix=self.path.name + ".", suffix=".tmp", dir=self.path.parent)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(merged, f, ensure_ascii=False, indent=2)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        self.sources = merged
+        self._dirty.clear()
@@ -0,0 +1,227 @@
+"""크롤링 진행 상태 체크포인트 (중단된 실행 이어서 처리 + 환경 캠페인 아님 판정 기억)"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+# URL별 상태
+PENDING = "pending"  # 작업 큐에 투입됨 (frontier)
+FETCHED = "fetched"  # HTML 수집 완료
+EXTRACTED = "extracted"  # 분석 완료 (상세: 결과 JSON 보관, 저장 대기 / 목록: 상세 URL 투입 완료)
+SAVED = "saved"  # DB 저장 완료
+SKIPPED = "skipped_non_environmental"  # 환경 캠페인 아님 (TTL 동안 다음 실행에서도 건너뜀)
+FAILED = "failed"  # 수집/분석 실패
+
+_RUNNING = "running"
+_FINISHED = "finished"
+
+
+@dataclass
+class Checkpoint:
+    """중단된 실행에서 이어서 처리할 작업"""
+    completed_lists: Set[str] = field(default_factory=set)  # 다시 렌더링하지 않을 목록 URL
+    lists: List[Tuple[str, int]] = field(default_factory=list)  # (URL, 깊이) 아직 처리하지 않은 다음 페이지 목록
+    details: List[Tuple[str, str, int]] = field(default_factory=list)  # (URL, 발견한 목록 URL, 깊이) 다시 수집/분석할 상세
+    unsaved: List[Tuple[str, str, Dict]] = field(default_factory=list)  # (URL, 목록 URL, 결과) 저장만 남은 상세
+    known: Set[str] = field(default_factory=set)  # 이번 실행에서 이미 다룬 URL 전체
+
+
+class CrawlStateStore:
+    """
+    실행 중 URL별 상태를 SQLite에 바로 기록하여 중단(취소/타임아웃) 후 다음 실행이 이어서 처리
+    - 실행 상태(meta.run_status)가 running인 채로 끝났으면 다음 실행은 재개:
+      처리한 목록 페이지는 다시 렌더링하지 않고, 남은 상세 URL(frontier)과 저장 전 결과만 처리
+    - 정상 종료(finish_run) 후 다음 실행은 새로 시작:
+      환경 캠페인 아님 판정만 non_environmental_ttl_hours 동안 남기고 나머지 기록 삭제
+    - writer 스레드에서도 저장 완료를 기록하므로 lock으로 보호
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ".cache/crawl_state.sqlite",
+        non_environmental_ttl_hours: float = 168,
+        enabled: bool = True,
+    ):
+        self.path = Path(path)
+        self.non_environmental_ttl = non_environmental_ttl_hours * 3600 if non_environmental_ttl_hours else 0
+        self.enabled = enabled
+        self.resuming = False
+
+        self.resumed = 0
+        self.known_skips = 0
+        self.updates = 0
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS crawl_state (
+                    url TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    source TEXT,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    updated_at REAL NOT NULL,
+                    depth INTEGER NOT NULL DEFAULT 0
+                )
+                """
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(crawl_state)")}
+            if "depth" not in columns:
+                self._conn.execute("ALTER TABLE crawl_state ADD COLUMN depth INTEGER NOT NULL DEFAULT 0")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            self._conn.commit()
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict], project_root: Path) -> "CrawlStateStore":
+        """sites.yaml의 settings.crawl_state 섹션으로 생성"""
+        options = dict((settings or {}).get("crawl_state") or {})
+        path = Path(options.pop("path", ".cache/crawl_state.sqlite"))
+        if not path.is_absolute():
+            path = project_root / path
+        return cls(path=path, **options)
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def begin_run(self, resume: bool = True) -> bool:
+        """
+        실행 시작 (이전 실행이 중단된 상태고 resume이면 재개)
+
+        Returns:
+            이전 실행을 이어서 처리하면 True
+        """
+        if not self.enabled:
+            return False
+        with self._lock:
+            self.resuming = resume and self._meta("run_status") == _RUNNING
+            if not self.resuming:
+                cutoff = time.time() - self.non_environmental_ttl
+                self._conn.execute(
+                    "DELETE FROM crawl_state WHERE NOT (status = ? AND updated_at >= ?)", (SKIPPED, cutoff)
+                )
+                self._set_meta("run_started", str(time.time()))
+            self._set_meta("run_status", _RUNNING)
+            self._conn.commit()
+        return self.resuming
+
+    def finish_run(self):
+        """정상 종료 기록 (다음 실행은 새로 시작)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._set_meta("run_status", _FINISHED)
+            self._conn.commit()
+
+    def mark(
+        self,
+        url: str,
+        kind: str,
+        status: str,
+        source: Optional[str] = None,
+        result: Optional[Dict] = None,
+        depth: int = 0,
+    ):
+        """URL 상태 기록 (source/result를 생략하면 기존 값 유지)"""
+        if not self.enabled:
+            return
+        payload = json.dumps(result, ensure_ascii=False) if result is not None else None
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO crawl_state (url, kind, source, status, result, updated_at, depth)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    status = excluded.status,
+                    source = COALESCE(excluded.source, crawl_state.source),
+                    result = COALESCE(excluded.result, crawl_state.result),
+                    updated_at = excluded.updated_at
+                """,
+                (url, kind, source, status, payload, time.time(), depth),
+            )
+            self._conn.commit()
+            self.updates += 1
+
+    def mark_saved(self, urls: List[str]):
+        """저장 완료 기록 (writer 스레드에서 호출, 보관하던 결과 JSON은 삭제)"""
+        if not self.enabled or not urls:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE crawl_state SET status = ?, result = NULL, updated_at = ? WHERE url = ?",
+                [(SAVED, now, url) for url in urls],
+            )
+            self._conn.commit()
+            self.updates += len(urls)
+
+    def is_known_non_environmental(self, url: str) -> bool:
+        """TTL 안에 환경 캠페인 아님으로 판정된 URL인지"""
+        if not self.enabled:
+            return False
+        cutoff = time.time() - self.non_environmental_ttl
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM crawl_state WHERE url = ? AND status = ? AND updated_at >= ?", (url, SKIPPED, cutoff)
+            ).fetchone()
+        if row:
+            self.known_skips += 1
+        return row is not None
+
+    def checkpoint(self) -> Checkpoint:
+        """중단된 실행에서 남은 작업 (재개가 아니면 빈 체크포인트)"""
+        checkpoint = Checkpoint()
+        if not self.resuming:
+            return checkpoint
+        with self._lock:
+            rows = self._conn.execute("SELECT url, kind, source, status, result, depth FROM crawl_state").fetchall()
+        for url, kind, source, status, result, depth in rows:
+            checkpoint.known.add(url)
+            if kind == "list":
+                if status in (EXTRACTED, FAILED):
+                    checkpoint.completed_lists.add(url)
+                elif depth > 0:
+                    # 설정 파일의 목록(깊이 0)은 run()에서 다시 투입
+                    checkpoint.lists.append((url, depth))
+            elif status in (PENDING, FETCHED):
+                checkpoint.details.append((url, source or url, depth))
+            elif status == EXTRACTED and result:
+                checkpoint.unsaved.append((url, source or url, json.loads(result)))
+        self.resumed = len(checkpoint.lists) + len(checkpoint.details) + len(checkpoint.unsaved)
+        return checkpoint
+
+    def counts(self) -> Dict[str, int]:
+        """상태별 URL 수"""
+        if not self.enabled:
+            return {}
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM crawl_state GROUP BY status").fetchall()
+        return dict(rows)
+
+    def report(self) -> str:
+        """체크포인트 요약"""
+        if not self.enabled:
+            return "비활성화"
+        counts = ", ".join(f"{status} {count}" for status, count in sorted(self.counts().items())) or "기록 없음"
+        mode = f"이전 실행 재개 (남은 작업 {self.resumed}건)" if self.resuming else "새 실행"
+        return f"{mode}, 환경 캠페인 아님 기억으로 건너뜀 {self.known_skips}건, 상태 기록 {self.updates}회 / {counts}"
+
+    def close(self):
+        """DB 연결 종료"""
+        if self._conn:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
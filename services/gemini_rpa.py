@@ -4,16 +4,230 @@ import subprocess
 import json
 import re
 import os
+import queue
+import shutil
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List
 from pathlib import Path
 
+# JSON 객체 경계 판단에 필요한 문자만 (나머지는 건너뜀)
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+
+def find_json_objects(text: str) -> List[str]:
+    """
+    문자열에서 중괄호 균형이 맞는 JSON 객체 후보를 한 번의 순회로 추출 (문서 순서)
+    - 문자열 리터럴 안의 중괄호와 이스케이프는 무시
+    - 닫히지 않은 여는 중괄호(설명문 속 "{" 등)가 있으면 그 안에서 닫힌 객체를 후보로 사용
+    - 처음 "{"부터 마지막 "}"까지 잡는 탐욕적 정규식과 달리 역추적이 없어 응답 길이에 선형
+    """
+    top_level = []
+    nested = []  # (여는 위치, 닫는 위치, 감싸는 여는 위치)
+    stack: List[int] = []
+    in_string = False
+    skip = -1
+    for match in _JSON_TOKEN_RE.finditer(text):
+        pos = match.start()
+        ch = text[pos]
+        if in_string:
+            if pos == skip:
+                continue
+            if ch == "\\":
+                skip = pos + 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            # 객체 밖의 따옴표는 설명문으로 간주
+            in_string = bool(stack)
+        elif ch == "{":
+            stack.append(pos)
+        elif ch == "}" and stack:
+            begin = stack.pop()
+            if stack:
+                nested.append((begin, pos, stack[-1]))
+            else:
+                top_level.append((begin, pos))
+
+    if stack:
+        unclosed = set(stack)
+        top_level += [(begin, end) for begin, end, parent in nested if parent in unclosed]
+        top_level.sort()
+    return [text[begin:end + 1] for begin, end in top_level]
+
+
+def _kill_process_tree(process: subprocess.Popen):
+    """CLI 프로세스와 자식(node, MCP 서버, 브라우저 등)까지 모두 강제 종료"""
+    if process.poll() is not None:
+        return
+    if os.name == "nt":
+        subprocess.run(
+            f"taskkill /F /T /PID {process.pid}", shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+    else:
+        # start_new_session=True로 실행했으므로 PID가 곧 프로세스 그룹 ID
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    try:
+        process.wait(timeout=5)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+class _CliSession:
+    """
+    ACP(Agent Client Protocol) 모드로 띄운 Gemini CLI 프로세스 하나
+    - stdin/stdout으로 JSON-RPC 메시지를 한 줄씩 주고받음
+    - 프로세스는 유지하고 max_prompts마다 새 대화 세션을 열어 이전 응답이 프롬프트에 쌓이지 않게 함
+    """
+
+    def __init__(self, cmd: List[str], env: Dict, cwd: str, timeout: int, max_prompts: int):
+        self.timeout = timeout
+        self.max_prompts = max_prompts
+        self.cwd = cwd
+        self.prompts = 0
+        self.session_id: Optional[str] = None
+        self._ids = 0
+        self._messages: "queue.Queue[Optional[Dict]]" = queue.Queue()
+        self.process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            stdin=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            env=env,
+            cwd=cwd,
+            start_new_session=os.name != "nt",
+        )
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        try:
+            self._request("initialize", {
+                "protocolVersion": 1,
+                "clientCapabilities": {"fs": {"readTextFile": False, "writeTextFile": False}},
+            })
+        except BaseException:
+            # 핸드셰이크 실패(ACP 미지원, 타임아웃 등) 시 프로세스 그룹이 남지 않도록 정리
+            self.close()
+            raise
+
+    def _read_loop(self):
+        for line in self.process.stdout:
+            line = line.strip()
+            if not line.startswith("{"):
+                # 진단 메시지 등 JSON-RPC가 아닌 출력
+                continue
+            try:
+                self._messages.put(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        self._messages.put(None)
+
+    def _send(self, message: Dict):
+        message["jsonrpc"] = "2.0"
+        self.process.stdin.write(json.dumps(message, ensure_ascii=False) + "\n")
+        self.process.stdin.flush()
+
+    def _answer(self, message: Dict):
+        """CLI가 보낸 요청에 응답 (--yolo라 권한 요청은 항상 허용)"""
+        if message["method"] == "session/request_permission":
+            options = message.get("params", {}).get("options") or []
+            allow = next((o for o in options if str(o.get("kind", "")).startswith("allow")), None)
+            if allow:
+                outcome = {"outcome": "selected", "optionId": allow["optionId"]}
+            else:
+                outcome = {"outcome": "cancelled"}
+            self._send({"id": message["id"], "result": {"outcome": outcome}})
+        else:
+            self._send({"id": message["id"], "error": {"code": -32601, "message": "Method not found"}})
 
-class GeminiRPAService:
-    """Gemini CLI를 subprocess로 호출하여 Playwright MCP 작업 수행"""
+    def _request(self, method: str, params: Dict, chunks: Optional[List[str]] = None) -> Dict:
+        """
+        요청을 보내고 응답까지 대기 (그동안 오는 응답 조각은 chunks에 모음)
 
-    def __init__(self, timeout: int = 120, debug: bool = False):
+        Raises:
+            TimeoutError: timeout 안에 응답이 없음
+            RuntimeError: 프로세스 종료 또는 오류 응답
+        """
+        self._ids += 1
+        request_id = self._ids
+        self._send({"id": request_id, "method": method, "params": params})
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(method)
+            try:
+                message = self._messages.get(timeout=remaining)
+            except queue.Empty:
+                raise TimeoutError(method)
+            if message is None:
+                raise RuntimeError(f"Gemini CLI 종료 (코드 {self.process.poll()})")
+            if "method" in message:
+                if "id" in message:
+                    self._answer(message)
+                elif chunks is not None and message["method"] == "session/update":
+                    update = message.get("params", {}).get("update") or {}
+                    content = update.get("content") or {}
+                    if update.get("sessionUpdate") == "agent_message_chunk" and content.get("type") == "text":
+                        chunks.append(content.get("text", ""))
+                continue
+            if message.get("id") != request_id:
+                continue
+            if "error" in message:
+                raise RuntimeError(message["error"].get("message", message["error"]))
+            return message.get("result") or {}
+
+    def prompt(self, text: str) -> str:
+        """프롬프트 1회 실행 후 응답 텍스트 반환"""
+        if self.session_id is None or self.prompts >= self.max_prompts:
+            self.session_id = self._request("session/new", {"cwd": self.cwd, "mcpServers": []})["sessionId"]
+            self.prompts = 0
+        self.prompts += 1
+        chunks: List[str] = []
+        self._request(
+            "session/prompt",
+            {"sessionId": self.session_id, "prompt": [{"type": "text", "text": text}]},
+            chunks,
+        )
+        return "".join(chunks)
+
+    def close(self):
+        """프로세스 그룹 종료"""
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+        _kill_process_tree(self.process)
+
+
+class GeminiRPAService:
+    """
+    Gemini CLI를 subprocess로 호출하여 Playwright MCP 작업 수행
+    - persistent: CLI를 ACP 모드로 띄워 두고 재사용 (프롬프트마다 Node/MCP/브라우저 기동 비용 없음)
+    - pool_size개의 CLI 세션에 execute_prompts()로 프롬프트를 동시에 배분
+    - ACP 초기화에 실패하면 프롬프트마다 CLI를 새로 실행하는 방식으로 전환
+    - 타임아웃 시 프로세스 그룹(POSIX) / 프로세스 트리(Windows) 전체 강제 종료
+    """
+
+    def __init__(
+        self,
+        timeout: int = 120,
+        debug: bool = False,
+        pool_size: int = 1,
+        persistent: bool = True,
+        max_prompts_per_session: int = 10,
+    ):
         self.timeout = timeout
         self.debug = debug
+        self.pool_size = max(1, pool_size)
+        self.persistent = persistent
+        self.max_prompts_per_session = max_prompts_per_session
         self.api_key = os.getenv("GOOGLE_API_KEY")
         self.model = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
         self.project_root = Path(__file__).parent.parent
@@ -21,83 +235,203 @@ class GeminiRPAService:
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY 환경변수가 필요합니다.")
 
-    def execute_prompt(self, prompt: str) -> Optional[Dict]:
-        """
-        Gemini CLI를 subprocess로 호출하여 MCP 작업 수행
+        # Windows의 gemini.cmd도 shell 없이 실행하도록 전체 경로 사용
+        self.cli = os.getenv("GEMINI_CLI") or shutil.which("gemini") or "gemini"
+        # None: 세션 폐기/생성 실패로 빈 자리가 생겼음을 대기 중인 스레드에 알리는 신호
+        self._idle: "queue.Queue[Optional[_CliSession]]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
 
-        Args:
-            prompt: Gemini에게 전달할 프롬프트
+        # 통계
+        self.sessions_started = 0
+        self.sessions_killed = 0
 
-        Returns:
-            파싱된 JSON 응답 또는 None
-        """
+    def _env(self) -> Dict:
         env = os.environ.copy()
         env["GOOGLE_API_KEY"] = self.api_key
         env["CI"] = "true"        # CI 환경으로 인식시켜 인터랙티브 UI 비활성화
         env["NO_COLOR"] = "1"     # 색상 출력 비활성화
         env["TERM"] = "dumb"      # 단순 터미널로 인식
+        return env
+
+    # ------------------------------------------------------------------
+    # CLI 세션 풀
+    # ------------------------------------------------------------------
+
+    def _acquire_session(self) -> Optional[_CliSession]:
+        """유휴 세션을 꺼내거나, 풀 여유가 있으면 새로 시작 (ACP를 쓸 수 없으면 None)"""
+        woken = False
+        while True:
+            with self._lock:
+                if not self.persistent:
+                    if woken:
+                        # 프롬프트마다 실행으로 전환됨: 다음 대기 스레드에도 신호를 넘김
+                        self._idle.put(None)
+                    return None
+                create = self._idle.empty() and self._created < self.pool_size
+                if create:
+                    self._created += 1
+            if create:
+                return self._start_session()
+            session = self._idle.get()
+            if session is not None:
+                return session
+            woken = True
+            # None: 빈 자리가 생김 → 다시 생성 시도 (ACP 전환 실패 시 위에서 None 반환)
+
+    def _start_session(self) -> Optional[_CliSession]:
+        """새 CLI 세션 시작 (실패하면 자리를 반납하고 대기 중인 스레드를 깨움)"""
+        cmd = [self.cli, "-m", self.model, "--yolo", "--experimental-acp"]
+        try:
+            session = _CliSession(
+                cmd, self._env(), str(self.project_root), self.timeout, self.max_prompts_per_session
+            )
+        except FileNotFoundError:
+            self._free_slot()
+            raise
+        except Exception as e:
+            with self._lock:
+                self.persistent = False
+            self._free_slot()
+            print(f"  [WARN] Gemini CLI 세션 시작 실패, 프롬프트마다 새로 실행합니다: {e}")
+            return None
+        self.sessions_started += 1
+        return session
+
+    def _free_slot(self):
+        """세션 자리 반납 후 _idle.get()에서 기다리는 스레드 하나를 깨움"""
+        with self._lock:
+            self._created -= 1
+        self._idle.put(None)
+
+    def _release_session(self, session: _CliSession, failed: bool):
+        """사용한 세션 반납 (오류/타임아웃이면 프로세스 그룹 종료 후 폐기)"""
+        if failed:
+            self.sessions_killed += 1
+            session.close()
+            self._free_slot()
+            return
+        self._idle.put(session)
+
+    def _run_in_session(self, session: _CliSession, prompt: str) -> Optional[str]:
+        failed = True
+        try:
+            stdout = session.prompt(prompt)
+            failed = False
+            return stdout
+        except TimeoutError:
+            print(f"  [ERROR] Gemini CLI 타임아웃 ({self.timeout}초) - 프로세스 그룹 강제 종료됨")
+            return None
+        except Exception as e:
+            print(f"  [ERROR] Gemini CLI 세션 오류: {e}")
+            return None
+        finally:
+            self._release_session(session, failed)
 
-        # Windows에서 gemini CLI 호출 (shell=True로 .cmd 파일 인식)
+    def _run_once(self, prompt: str) -> Optional[str]:
+        """CLI를 새로 실행하여 프롬프트 1회 처리"""
         # -o json: JSON 형식 출력
         # 프롬프트는 stdin으로 전달하여 쉘 이스케이프 문제 및 길이 제한 해결
-        cmd = f'gemini -m {self.model} --yolo -o json'
+        cmd = [self.cli, "-m", self.model, "--yolo", "-o", "json"]
+
+        # Popen 사용으로 타임아웃 시 프로세스 강제 종료 가능
+        # 새 세션(프로세스 그룹)으로 실행해 타임아웃 시 node, chrome 등 자식까지 함께 종료
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            stdin=subprocess.PIPE,  # stdin으로 프롬프트 전달
+            text=True,
+            encoding='utf-8',  # UTF-8 명시
+            env=self._env(),
+            cwd=str(self.project_root),
+            start_new_session=os.name != "nt",
+        )
 
+        try:
+            # 프롬프트를 stdin으로 전달 (개행 문자 추가)
+            stdout, stderr = process.communicate(input=prompt + "\n", timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_tree(process)
+            print(f"  [ERROR] Gemini CLI 타임아웃 ({self.timeout}초) - 프로세스 트리 강제 종료됨")
+            return None
+
+        if process.returncode != 0:
+            print(f"  [WARN] Gemini CLI 종료 코드: {process.returncode}")
+            if stderr:
+                print(f"  [STDERR] {stderr[:200]}")
+            # 에러가 있어도 stdout에 JSON이 있을 수 있으므로 계속 진행
+        return stdout
+
+    def execute_prompt(self, prompt: str) -> Optional[Dict]:
+        """
+        Gemini CLI로 MCP 작업 수행 (유휴 CLI 세션 사용, 없으면 새로 실행)
+
+        Args:
+            prompt: Gemini에게 전달할 프롬프트
+
+        Returns:
+            파싱된 JSON 응답 또는 None
+        """
         if self.debug:
             print(f"\n{'='*60}")
-            print(f"[DEBUG-CMD] {cmd}")
+            print(f"[DEBUG-CMD] {self.cli} -m {self.model} --yolo {'--experimental-acp' if self.persistent else '-o json'}")
             print(f"[DEBUG-PROMPT] {prompt[:500]}{'...' if len(prompt) > 500 else ''}")
             print(f"{'='*60}")
 
         try:
-            # Popen 사용으로 타임아웃 시 프로세스 강제 종료 가능
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                stdin=subprocess.PIPE,  # stdin으로 프롬프트 전달
-                text=True,
-                encoding='utf-8',  # UTF-8 명시
-                env=env,
-                cwd=str(self.project_root),
-                shell=True  # Windows PowerShell에서 .cmd 파일 인식
-            )
-
-            try:
-                # 프롬프트를 stdin으로 전달 (개행 문자 추가)
-                stdout, stderr = process.communicate(input=prompt + "\n", timeout=self.timeout)
-
-                if process.returncode != 0:
-                    print(f"  [WARN] Gemini CLI 종료 코드: {process.returncode}")
-                    if stderr:
-                        print(f"  [STDERR] {stderr[:200]}")
-                    # 에러가 있어도 stdout에 JSON이 있을 수 있으므로 계속 진행
-                
-                if self.debug:
-                    print(f"[DEBUG-RAW] 응답 길이: {len(stdout)}자")
-                    if len(stdout) < 5000:
-                        print(f"{stdout}")
-                    else:
-                        print(f"{stdout[:2000]}...[생략]...{stdout[-500:]}")
-                    print(f"{'='*60}")
-
-                return self._parse_json_response(stdout)
-
-            except subprocess.TimeoutExpired:
-                # 타임아웃 시 프로세스 트리 강제 종료 (Windows)
-                # shell=True로 실행된 경우 process.pid는 cmd.exe의 PID이므로
-                # /T 옵션을 사용하여 자식 프로세스(gemini, node, chrome 등)까지 모두 종료해야 함
-                subprocess.run(f"taskkill /F /T /PID {process.pid}", shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                print(f"  [ERROR] Gemini CLI 타임아웃 ({self.timeout}초) - 프로세스 트리 강제 종료됨")
-                return None
-
+            session = self._acquire_session()
+            stdout = self._run_in_session(session, prompt) if session else self._run_once(prompt)
         except FileNotFoundError:
             print("  [ERROR] Gemini CLI를 찾을 수 없습니다.")
             print("         - 설치: npm install -g @google/gemini-cli")
-            print("         - 확인: where gemini (PowerShell에서)")
+            print("         - 확인: which gemini (Windows: where gemini)")
             return None
         except Exception as e:
             print(f"  [ERROR] Gemini CLI 실행 실패: {e}")
             return None
+        if stdout is None:
+            return None
+
+        if self.debug:
+            print(f"[DEBUG-RAW] 응답 길이: {len(stdout)}자")
+            if len(stdout) < 5000:
+                print(f"{stdout}")
+            else:
+                print(f"{stdout[:2000]}...[생략]...{stdout[-500:]}")
+            print(f"{'='*60}")
+
+        return self._parse_json_response(stdout)
+
+    def execute_prompts(self, prompts: List[str]) -> List[Optional[Dict]]:
+        """
+        여러 프롬프트를 pool_size개의 CLI 세션에 나눠 동시에 실행
+
+        Returns:
+            프롬프트 순서대로 파싱된 JSON 응답 (실패한 항목은 None)
+        """
+        if len(prompts) <= 1 or self.pool_size == 1:
+            return [self.execute_prompt(prompt) for prompt in prompts]
+        with ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="gemini-cli") as executor:
+            return list(executor.map(self.execute_prompt, prompts))
+
+    def close(self):
+        """유휴 CLI 세션 모두 종료"""
+        while True:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if session is None:
+                continue
+            session.close()
+            with self._lock:
+                self._created -= 1
+
+    def report(self) -> str:
+        """CLI 세션 사용 요약"""
+        mode = "ACP 세션 재사용" if self.persistent else "프롬프트마다 실행"
+        return f"{mode}, 세션 시작 {self.sessions_started}, 강제 종료 {self.sessions_killed}"
 
     def _parse_json_response(self, response: str) -> Optional[Dict]:
         """
@@ -144,16 +478,16 @@ class GeminiRPAService:
                 except json.JSONDecodeError:
                     pass
 
-        # 패턴 3: 순수 JSON 객체
+        # 패턴 3: 순수 JSON 객체 (중괄호 균형으로 찾은 후보를 문서 순서대로)
         if not result:
-            json_object_pattern = r'\{[\s\S]*\}'
-            match = re.search(json_object_pattern, response)
-            if match:
+            for candidate in find_json_objects(response):
                 try:
-                    result = json.loads(match.group(0))
-                    parse_method = "순수 JSON 객체"
+                    result = json.loads(candidate)
                 except json.JSONDecodeError:
-                    pass
+                    continue
+                if result:
+                    parse_method = "순수 JSON 객체"
+                    break
 
         if result:
             # Gemini CLI -o json 출력의 경우 실제 응답은 'response' 필드에 있음
@@ -0,0 +1,269 @@
+"""LLM 프롬프트 전송 전 HTML 축소 파이프라인"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from html import escape
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+
+# 본문과 무관한 노드 (하위 트리 전체 제거)
+NON_CONTENT_TAGS = {
+    "script", "style", "noscript", "svg", "template", "iframe",
+    "canvas", "object", "embed", "link", "meta",
+}
+
+# 반복되는 레이아웃 영역 (네비게이션, 푸터 등)
+BOILERPLATE_TAGS = {"nav", "footer", "aside"}
+BOILERPLATE_ROLES = {"navigation", "contentinfo", "banner", "search"}
+
+# 링크/이미지 판별에 필요한 속성만 유지
+DEFAULT_KEEP_ATTRIBUTES = ("href", "src", "onclick", "data-url")
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+
+# 공백만 있는 텍스트를 버려도 되는 블록 요소 (인라인 요소 사이의 공백은 단어 구분이므로 유지)
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "body", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4",
+    "h5", "h6", "head", "header", "hr", "html", "li", "main", "nav", "ol", "p",
+    "pre", "section", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "ul",
+    "br", "meta", "link", "title",
+}
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (로컬 근사치)
+    - ASCII: 약 4자당 1토큰
+    - 한글 등 비ASCII: 약 1.5자당 1토큰
+    """
+    if not text:
+        return 0
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    ascii_count = len(text) - non_ascii
+    return math.ceil(ascii_count / 4 + non_ascii / 1.5)
+
+
+@dataclass
+class ReductionStats:
+    """HTML 축소 전/후 통계"""
+    chars_before: int = 0
+    chars_after: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+    truncated: bool = False
+    stages: List[str] = field(default_factory=list)
+
+    @property
+    def ratio(self) -> float:
+        """축소 후 / 축소 전 비율"""
+        if not self.chars_before:
+            return 1.0
+        return self.chars_after / self.chars_before
+
+    def summary(self) -> str:
+        """로그 출력용 한 줄 요약"""
+        text = (
+            f"{self.chars_before:,}자 → {self.chars_after:,}자 "
+            f"(~{self.tokens_before:,} → ~{self.tokens_after:,} 토큰, {self.ratio:.1%})"
+        )
+        if self.truncated:
+            text += " [잘림]"
+        return text
+
+
+class _ReducingParser(HTMLParser):
+    """HTML을 순회하며 축소된 HTML을 다시 조립하는 파서"""
+
+    def __init__(self, drop_tags: set, drop_roles: set, keep_attributes: Optional[Tuple[str, ...]],
+                 collapse_whitespace: bool, drop_comments: bool, drop_tracking_pixels: bool):
+        super().__init__(convert_charrefs=True)
+        self.drop_tags = drop_tags
+        self.drop_roles = drop_roles
+        self.keep_attributes = keep_attributes
+        self.collapse_whitespace = collapse_whitespace
+        self.drop_comments = drop_comments
+        self.drop_tracking_pixels = drop_tracking_pixels
+        self.out: List[str] = []
+        # 제거 중인 하위 트리: (태그명, 중첩 깊이)
+        self._skip_tag: Optional[str] = None
+        self._skip_depth = 0
+        # 마지막 출력이 블록 경계(블록 태그) 또는 공백으로 끝나는지 → 이어지는 공백만 있는 텍스트 생략
+        self._space_pending = True
+
+    def _should_drop(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> bool:
+        if tag in self.drop_tags:
+            return True
+        attr_map = dict(attrs)
+        if self.drop_roles and (attr_map.get("role") or "").lower() in self.drop_roles:
+            return True
+        if self.drop_tracking_pixels and tag == "img":
+            if attr_map.get("width") in ("0", "1") and attr_map.get("height") in ("0", "1"):
+                return True
+        return False
+
+    def _format_attrs(self, attrs: List[Tuple[str, Optional[str]]]) -> str:
+        parts = []
+        for name, value in attrs:
+            if self.keep_attributes is not None and name not in self.keep_attributes:
+                continue
+            if value is None:
+                parts.append(f" {name}")
+            else:
+                parts.append(f' {name}="{escape(value, quote=True)}"')
+        return "".join(parts)
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth += 1
+            return
+        if self._should_drop(tag, attrs):
+            if tag not in VOID_TAGS:
+                self._skip_tag = tag
+                self._skip_depth = 1
+            return
+        self.out.append(f"<{tag}{self._format_attrs(attrs)}>")
+        self._space_pending = tag in BLOCK_TAGS
+
+    def handle_startendtag(self, tag, attrs):
+        if self._skip_tag or self._should_drop(tag, attrs):
+            return
+        self.out.append(f"<{tag}{self._format_attrs(attrs)}>")
+        self._space_pending = tag in BLOCK_TAGS
+
+    def handle_endtag(self, tag):
+        if self._skip_tag:
+            if tag == self._skip_tag:
+                self._skip_depth -= 1
+                if self._skip_depth == 0:
+                    self._skip_tag = None
+            return
+        if tag in VOID_TAGS:
+            return
+        self.out.append(f"</{tag}>")
+        self._space_pending = tag in BLOCK_TAGS
+
+    def handle_data(self, data):
+        if self._skip_tag or not data:
+            return
+        if self.collapse_whitespace:
+            data = _WHITESPACE_RE.sub(" ", data)
+            # <b>big</b> <i>world</i>의 공백은 유지, 블록 경계나 공백 뒤의 공백만 생략
+            if data == " " and self._space_pending:
+                return
+        self.out.append(escape(data, quote=False))
+        self._space_pending = data[-1].isspace()
+
+    def handle_comment(self, data):
+        if self._skip_tag or self.drop_comments:
+            return
+        self.out.append(f"<!--{data}-->")
+
+    def handle_decl(self, decl):
+        if not self.drop_comments:
+            self.out.append(f"<!{decl}>")
+
+
+class HtmlReducer:
+    """
+    HTML 축소 파이프라인
+    - 단계별로 on/off 가능 (추출 품질 vs 프롬프트 크기 측정용)
+    - remove_non_content: script/style/svg 등 비본문 노드, 주석, 추적 픽셀 제거
+    - remove_boilerplate: nav/footer/aside 등 반복 레이아웃 제거
+    - filter_attributes: href/src/onclick/data-url 등 필요한 속성만 유지
+    - collapse_whitespace: 연속 공백 축약
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        remove_non_content: bool = True,
+        remove_boilerplate: bool = True,
+        filter_attributes: bool = True,
+        collapse_whitespace: bool = True,
+        keep_attributes: Tuple[str, ...] = DEFAULT_KEEP_ATTRIBUTES,
+        max_chars: int = 1000000,
+    ):
+        self.enabled = enabled
+        self.remove_non_content = remove_non_content
+        self.remove_boilerplate = remove_boilerplate
+        self.filter_attributes = filter_attributes
+        self.collapse_whitespace = collapse_whitespace
+        self.keep_attributes = tuple(keep_attributes)
+        self.max_chars = max_chars
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict]) -> "HtmlReducer":
+        """sites.yaml의 settings.html_reduction 섹션으로 생성"""
+        options = dict((settings or {}).get("html_reduction") or {})
+        if "keep_attributes" in options:
+            options["keep_attributes"] = tuple(options["keep_attributes"])
+        return cls(**options)
+
+    @property
+    def active_stages(self) -> List[str]:
+        """활성화된 단계 이름 목록"""
+        if not self.enabled:
+            return []
+        stages = []
+        if self.remove_non_content:
+            stages.append("remove_non_content")
+        if self.remove_boilerplate:
+            stages.append("remove_boilerplate")
+        if self.filter_attributes:
+            stages.append("filter_attributes")
+        if self.collapse_whitespace:
+            stages.append("collapse_whitespace")
+        return stages
+
+    def reduce(self, html: str) -> Tuple[str, ReductionStats]:
+        """
+        HTML 축소
+
+        Returns:
+            (축소된 HTML, 축소 통계)
+        """
+        html = html or ""
+        stats = ReductionStats(
+            chars_before=len(html),
+            tokens_before=estimate_tokens(html),
+            stages=self.active_stages,
+        )
+
+        reduced = html
+        if stats.stages:
+            drop_tags = set()
+            drop_roles = set()
+            if self.remove_non_content:
+                drop_tags |= NON_CONTENT_TAGS
+            if self.remove_boilerplate:
+                drop_tags |= BOILERPLATE_TAGS
+                drop_roles |= BOILERPLATE_ROLES
+
+            parser = _ReducingParser(
+                drop_tags=drop_tags,
+                drop_roles=drop_roles,
+                keep_attributes=self.keep_attributes if self.filter_attributes else None,
+                collapse_whitespace=self.collapse_whitespace,
+                drop_comments=self.remove_non_content,
+                drop_tracking_pixels=self.remove_non_content,
+            )
+            parser.feed(html)
+            parser.close()
+            reduced = "".join(parser.out)
+
+        if self.max_chars and len(reduced) > self.max_chars:
+            reduced = reduced[:self.max_chars]
+            stats.truncated = True
+
+        stats.chars_after = len(reduced)
+        stats.tokens_after = estimate_tokens(reduced)
+        return reduced, stats
@@ -0,0 +1,296 @@
+"""정적 HTTP 수집 단계 + 필요 시 Playwright로 전환하는 계층형 수집기"""
+
+import asyncio
+import codecs
+import re
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import httpx
+
+from services.browser_service import BrowserService
+from services.link_extractor import LinkCandidate, extract_candidate_links
+from services.metrics import metrics
+from services.rate_limiter import THROTTLE_STATUSES, DomainScheduler
+from services.site_settings import SiteSettings
+
+if TYPE_CHECKING:
+    from services.snapshot_store import SnapshotStore
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+FETCH_MODES = ("auto", "http", "browser")
+
+# JS 렌더링이 필요한 빈 껍데기(SPA) 페이지 패턴
+_SKELETON_RE = re.compile(
+    r"""<div[^>]+id=["'](?:root|app|__next|__nuxt)["'][^>]*>\s*</div>"""
+    r"""|enable\s+javascript|자바스크립트를\s*(?:활성화|사용)""",
+    re.IGNORECASE,
+)
+_BODY_RE = re.compile(r"<body[^>]*>(.*)</body>", re.IGNORECASE | re.DOTALL)
+_STRIP_RE = re.compile(r"<(script|style|noscript)[^>]*>.*?</\1>|<[^>]+>", re.IGNORECASE | re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+# <meta charset="euc-kr"> 또는 <meta http-equiv="Content-Type" content="text/html; charset=euc-kr">
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([\w.:-]+)""", re.IGNORECASE)
+
+MIN_TEXT_LENGTH = 200
+# meta charset을 찾을 문서 앞부분 크기 (HTML 표준의 prescan 범위)
+CHARSET_SNIFF_BYTES = 1024
+
+# EUC-KR로 선언된 페이지도 확장 한글(CP949)을 쓰는 경우가 많음
+_CHARSET_ALIASES = {"euc-kr": "cp949", "ks_c_5601-1987": "cp949", "ksc5601": "cp949"}
+
+
+@dataclass
+class FetchResult:
+    """페이지 수집 결과"""
+    html: str = ""
+    status: int = 0
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False  # 조건부 요청에 304 응답
+    tier: str = ""  # http / browser / archive
+    throttled: bool = False  # 재시도 후에도 429/503 (브라우저로 전환해도 같은 응답이므로 전환하지 않음)
+    # 브라우저 워커 풀에서 미리 처리된 경우: html이 축소본인지, 목록 페이지의 후보 링크 / 변환 못 한 JS 링크
+    reduced: bool = False
+    candidates: Optional[List[LinkCandidate]] = None
+    unresolved: List[str] = field(default_factory=list)
+
+
+def visible_text_length(html: str) -> int:
+    """body의 대략적인 표시 텍스트 길이"""
+    match = _BODY_RE.search(html)
+    body = match.group(1) if match else html
+    return len(_WHITESPACE_RE.sub(" ", _STRIP_RE.sub(" ", body)).strip())
+
+
+def decode_html(content: bytes, header_charset: Optional[str] = None) -> str:
+    """
+    응답 바이트 → 문자열
+    - Content-Type 헤더의 charset → BOM → <meta charset> 순으로 인코딩 결정 (없으면 UTF-8)
+    - 국내 공공/단체 사이트는 헤더 없이 meta로만 EUC-KR을 선언하는 경우가 많음
+    """
+    encoding = header_charset
+    if not encoding:
+        if content.startswith(codecs.BOM_UTF8):
+            encoding = "utf-8-sig"
+        else:
+            match = _META_CHARSET_RE.search(content[:CHARSET_SNIFF_BYTES])
+            if match:
+                encoding = match.group(1).decode("ascii", "ignore")
+    encoding = _CHARSET_ALIASES.get((encoding or "").lower(), encoding) or "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = "utf-8"
+    return content.decode(encoding, errors="replace")
+
+
+class HttpFetcher:
+    """
+    httpx 기반 정적 HTML 수집기
+    - 연결 풀(keep-alive) 및 gzip/deflate 압축 응답 사용
+    - scheduler가 있으면 BrowserService와 같은 도메인 간격 규칙 적용
+    """
+
+    def __init__(
+        self,
+        scheduler: Optional[DomainScheduler] = None,
+        timeout: float = 20.0,
+        max_connections: int = 20,
+        max_retries: int = 2,
+    ):
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.client = httpx.AsyncClient(
+            headers={
+                "User-Agent": USER_AGENT,
+                "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8",
+            },
+            follow_redirects=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def fetch(self, url: str, validators: Optional[Dict] = None) -> FetchResult:
+        """
+        정적 HTML 수집
+        - 429/503 응답이면 scheduler가 지정한 시간만큼 기다린 뒤 재시도
+
+        Args:
+            validators: 이전 응답의 etag / last_modified (있으면 조건부 요청)
+
+        Returns:
+            FetchResult - 실패 시 html이 빈 문자열, 차단 응답이 반복되면 throttled=True
+        """
+        for attempt in range(self.max_retries + 1):
+            if self.scheduler:
+                await self.scheduler.acquire(url)
+
+            result = await self._fetch_once(url, validators)
+            # scheduler가 없으면 대기 시간을 정할 수 없으므로 재시도하지 않음
+            if not result.throttled or not self.scheduler:
+                return result
+            if attempt < self.max_retries:
+                print(f"[HTTP] 재시도 대기 ({attempt + 1}/{self.max_retries}): {url}")
+        return result
+
+    async def _fetch_once(self, url: str, validators: Optional[Dict] = None) -> FetchResult:
+        """정적 HTML 1회 요청 (응답 상태를 scheduler에 반영)"""
+        headers = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            response = await self.client.get(url, headers=headers)
+        except httpx.HTTPError as e:
+            print(f"[HTTP] Error fetching {url}: {e}")
+            return FetchResult(tier="http")
+
+        if self.scheduler:
+            self.scheduler.report_response(url, response.status_code, response.headers.get("retry-after"))
+
+        result = FetchResult(
+            status=response.status_code,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            not_modified=response.status_code == 304,
+            tier="http",
+            throttled=response.status_code in THROTTLE_STATUSES,
+        )
+        content_type = response.headers.get("content-type", "")
+        if response.status_code == 200 and "html" in content_type:
+            # httpx는 헤더에 charset이 없으면 UTF-8로 디코딩하므로 meta charset을 직접 확인
+            result.html = decode_html(response.content, response.charset_encoding)
+        return result
+
+    async def close(self):
+        """연결 풀 종료"""
+        await self.client.aclose()
+
+
+class TieredFetcher:
+    """
+    계층형 페이지 수집기
+    - auto: 정적 HTTP 먼저 시도, JS 의존 페이지로 판단되면 BrowserService로 전환
+      (429/503은 전환하지 않고 HttpFetcher가 scheduler 대기 후 재시도)
+    - http / browser: sites.<host>.fetch_mode로 사이트별 고정
+    - 단계별 처리 URL 수와 소요 시간 집계
+    - snapshots가 있으면 수집한 최종 HTML을 스냅샷 보관소에 기록 (--from-archive 재생용)
+      (브라우저 워커 풀에서 받은 페이지는 축소본이 기록됨 - 재생 시 다시 축소해도 결과 동일)
+    """
+
+    def __init__(
+        self,
+        http: HttpFetcher,
+        browser: BrowserService,
+        site_settings: SiteSettings,
+        snapshots: Optional["SnapshotStore"] = None,
+    ):
+        self.http = http
+        self.browser = browser
+        self.site_settings = site_settings
+        self.snapshots = snapshots
+        self.counts: Dict[str, int] = {"http": 0, "browser": 0, "escalated": 0}
+        self.seconds: Dict[str, float] = {"http": 0.0, "browser": 0.0}
+
+    def needs_javascript(self, html: str, url: str, kind: str) -> Optional[str]:
+        """
+        정적 HTML이 JS 렌더링을 필요로 하는지 판단
+
+        Returns:
+            전환 사유 (필요 없으면 None)
+        """
+        if not html:
+            return "빈 응답"
+        if _SKELETON_RE.search(html):
+            return "스켈레톤 레이아웃"
+        if visible_text_length(html) < MIN_TEXT_LENGTH:
+            return "본문 텍스트 부족"
+        if kind == "list":
+            link_templates = self.site_settings.get(url, "link_templates")
+            if not extract_candidate_links(html, url, link_templates):
+                return "후보 링크 없음"
+        return None
+
+    async def get_page(self, url: str, kind: str = "detail", validators: Optional[Dict] = None) -> FetchResult:
+        """
+        사이트 설정과 휴리스틱에 따라 HTTP 또는 브라우저로 HTML 수집
+
+        Args:
+            validators: 이전 etag / last_modified (HTTP 304면 not_modified=True로 즉시 반환)
+        """
+        result = await self._get_page(url, kind, validators)
+        if self.snapshots and result.html:
+            # 압축/파일 쓰기는 이벤트 루프 밖에서
+            await asyncio.to_thread(self.snapshots.put, url, result.html, result.status, kind, result.tier)
+        return result
+
+    async def _get_page(self, url: str, kind: str, validators: Optional[Dict]) -> FetchResult:
+        mode = self.site_settings.get(url, "fetch_mode", "auto")
+        result = FetchResult()
+
+        if mode in ("auto", "http"):
+            started = time.monotonic()
+            result = await self.http.fetch(url, validators)
+            elapsed = time.monotonic() - started
+            self.seconds["http"] += elapsed
+            metrics.observe("fetch_http", elapsed, url)
+
+            if result.throttled:
+                # 차단/과부하는 JS 의존 여부와 무관: 브라우저로 전환하면 같은 서버에 부하만 더함
+                print(f"[Fetch] 차단 응답 반복으로 스킵 (HTTP {result.status}): {url}")
+                metrics.count("fetch", "throttled", url)
+                return result
+
+            if result.not_modified or mode == "http":
+                self.counts["http"] += 1
+                metrics.count("fetch", "not_modified" if result.not_modified else "http", url)
+                return result
+
+            reason = self.needs_javascript(result.html, url, kind) if result.status == 200 else f"HTTP {result.status}"
+            if not reason:
+                self.counts["http"] += 1
+                metrics.count("fetch", "http", url)
+                return result
+            print(f"[Fetch] 브라우저로 전환 ({reason}): {url}")
+            self.counts["escalated"] += 1
+
+        started = time.monotonic()
+        rendered = await self.browser.get_rendered(url, kind)
+        elapsed = time.monotonic() - started
+        self.seconds["browser"] += elapsed
+        self.counts["browser"] += 1
+        metrics.observe("fetch_browser", elapsed, url)
+        metrics.count("fetch", "browser" if rendered.html else "fail", url)
+        # HTTP 단계에서 받은 검증자는 유지 (다음 실행의 조건부 요청용)
+        return FetchResult(
+            html=rendered.html,
+            status=200 if rendered.html else 0,
+            etag=result.etag,
+            last_modified=result.last_modified,
+            tier="browser",
+            reduced=rendered.reduced,
+            candidates=rendered.candidates,
+            unresolved=rendered.unresolved,
+        )
+
+    async def get_page_content(self, url: str, kind: str = "detail") -> str:
+        """HTML만 반환하는 간편 버전"""
+        return (await self.get_page(url, kind)).html
+
+    def report(self) -> str:
+        """단계별 처리 URL 수 / 소요 시간 요약"""
+        return (
+            f"HTTP {self.counts['http']}건 ({self.seconds['http']:.1f}초), "
+            f"브라우저 {self.counts['browser']}건 ({self.seconds['browser']:.1f}초, 전환 {self.counts['escalated']}건)"
+        )
+
+    async def close(self):
+        """HTTP 연결 풀 종료 (브라우저는 별도 종료)"""
+        await self.http.close()
@@ -0,0 +1,226 @@
+"""목록 페이지 DOM에서 상세 페이지 후보 링크를 결정적으로 수집"""
+
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+# 링크를 담을 수 있는 속성
+LINK_ATTRIBUTES = ("href", "onclick", "data-url", "data-href", "data-link")
+
+# window.open('...') / location.href = '...' 등 JS 이동 패턴
+_JS_NAVIGATION_RE = re.compile(
+    r"""(?:window\.open|location\.(?:assign|replace)|(?:window\.|document\.)?location(?:\.href)?\s*=)\s*\(?\s*(['"])(?P<url>[^'"]+)\1"""
+)
+# fnName('a', 'b') 형태의 함수 호출
+_JS_CALL_RE = re.compile(r"(?P<name>[A-Za-z_$][\w$.]*)\s*\((?P<args>[^()]*)\)")
+_JS_STRING_ARG_RE = re.compile(r"""(['"])(.*?)\1|(-?\d+(?:\.\d+)?)""")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 상세 페이지가 아닌 정적 리소스 확장자
+_ASSET_EXTENSIONS = (
+    ".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico",
+    ".woff", ".woff2", ".ttf", ".mp4", ".mp3", ".zip",
+)
+
+MAX_TEXT_LENGTH = 100
+
+
+@dataclass
+class LinkCandidate:
+    """상세 페이지 후보 링크 (앵커 텍스트 + 절대 URL)"""
+    url: str
+    text: str
+    source: str  # href, onclick, data-url, window.open, location, template
+
+
+def _parse_js_args(args: str) -> List[str]:
+    """JS 함수 호출 인자 문자열 → 값 리스트"""
+    values = []
+    for match in _JS_STRING_ARG_RE.finditer(args):
+        values.append(match.group(2) if match.group(1) else match.group(3))
+    return values
+
+
+def _looks_like_path(value: str) -> bool:
+    """JS 인자 문자열이 URL/경로로 보이는지"""
+    if value.startswith(("http://", "https://", "/", "./", "../")):
+        return True
+    return any(token in value for token in (".do", ".php", ".jsp", ".asp", ".html", "?"))
+
+
+def resolve_js_link(code: str, link_templates: Optional[Dict[str, str]] = None) -> Tuple[Optional[str], str]:
+    """
+    자바스크립트 코드에서 이동 URL 추출
+
+    Args:
+        code: onclick 값 또는 javascript: href
+        link_templates: 함수명 → URL 템플릿 (예: {"fnDetail": "/view.do?seq={0}"})
+
+    Returns:
+        (URL 또는 None, 추출 방식)
+    """
+    if not code:
+        return None, ""
+    code = code.strip()
+    if code.lower().startswith("javascript:"):
+        code = code[len("javascript:"):]
+
+    match = _JS_NAVIGATION_RE.search(code)
+    if match:
+        source = "window.open" if match.group(0).startswith("window.open") else "location"
+        return match.group("url"), source
+
+    for call in _JS_CALL_RE.finditer(code):
+        name = call.group("name").split(".")[-1]
+        args = _parse_js_args(call.group("args"))
+        if link_templates and name in link_templates:
+            try:
+                return link_templates[name].format(*args), "template"
+            except (IndexError, KeyError):
+                continue
+        for arg in args:
+            if arg and _looks_like_path(arg):
+                return arg, "onclick"
+
+    return None, ""
+
+
+def _has_navigation_call(code: str) -> bool:
+    """인자가 있는 JS 함수 호출인지 (void(0), history.back() 등은 제외)"""
+    for call in _JS_CALL_RE.finditer(code):
+        if call.group("name") != "void" and _parse_js_args(call.group("args")):
+            return True
+    return False
+
+
+class _LinkCollector(HTMLParser):
+    """링크 속성을 가진 요소와 그 안의 텍스트를 수집하는 파서"""
+
+    def __init__(self, link_templates: Optional[Dict[str, str]]):
+        super().__init__(convert_charrefs=True)
+        self.link_templates = link_templates
+        # (태그명, [(raw_url, source)], 텍스트 조각)
+        self._open: List[Tuple[str, List[Tuple[str, str]], List[str]]] = []
+        self.found: List[Tuple[str, str, str]] = []  # (raw_url, source, text)
+        self.unresolved: List[str] = []  # URL로 변환하지 못한 JS 호출 (템플릿 미설정 등)
+
+    def _raw_links(self, attrs: List[Tuple[str, Optional[str]]]) -> List[Tuple[str, str]]:
+        links = []
+        for name, value in attrs:
+            if name not in LINK_ATTRIBUTES or not value:
+                continue
+            value = value.strip()
+            if name == "onclick" or value.lower().startswith("javascript:"):
+                url, source = resolve_js_link(value, self.link_templates)
+                if url:
+                    links.append((url, source))
+                elif _has_navigation_call(value):
+                    self.unresolved.append(value)
+            else:
+                links.append((value, "href" if name == "href" else "data-url"))
+        return links
+
+    def handle_starttag(self, tag, attrs):
+        links = self._raw_links(attrs)
+        if links:
+            self._open.append((tag, links, []))
+
+    def handle_startendtag(self, tag, attrs):
+        for url, source in self._raw_links(attrs):
+            self.found.append((url, source, ""))
+
+    def handle_endtag(self, tag):
+        # 가장 가까운 같은 태그의 수집기를 닫음 (닫히지 않은 하위 요소도 함께 정리)
+        for i in range(len(self._open) - 1, -1, -1):
+            if self._open[i][0] == tag:
+                for _, links, parts in self._open[i:]:
+                    self._emit(links, parts)
+                del self._open[i:]
+                break
+
+    def handle_data(self, data):
+        for _, _, parts in self._open:
+            parts.append(data)
+
+    def _emit(self, links, parts):
+        text = _WHITESPACE_RE.sub(" ", "".join(parts)).strip()[:MAX_TEXT_LENGTH]
+        for url, source in links:
+            self.found.append((url, source, text))
+
+    def close(self):
+        super().close()
+        for _, links, parts in self._open:
+            self._emit(links, parts)
+        self._open = []
+
+
+def extract_candidate_links(
+    html: str,
+    base_url: str,
+    link_templates: Optional[Dict[str, str]] = None,
+) -> List[LinkCandidate]:
+    """
+    HTML에서 상세 페이지 후보 링크 수집
+
+    - href, onclick, data-url, window.open(...), javascript: 링크 지원
+    - link_templates로 사이트 전용 JS 함수 호출을 URL로 변환
+    - 절대 URL로 변환 후 문서 순서대로 중복 제거
+
+    Returns:
+        LinkCandidate 리스트 (위에서 아래 순서)
+    """
+    return collect_links(html, base_url, link_templates)[0]
+
+
+def collect_links(
+    html: str,
+    base_url: str,
+    link_templates: Optional[Dict[str, str]] = None,
+) -> Tuple[List[LinkCandidate], List[str]]:
+    """
+    extract_candidate_links와 같지만 URL로 변환하지 못한 JS 호출 링크도 함께 반환
+    (예: 1365의 javascript:fnDetail('12345') - link_templates가 없으면 후보에서 빠짐)
+
+    Returns:
+        (LinkCandidate 리스트, 변환하지 못한 onclick/javascript: 코드 리스트)
+    """
+    if not html:
+        return [], []
+
+    collector = _LinkCollector(link_templates)
+    collector.feed(html)
+    collector.close()
+
+    base_page = urlparse(base_url)._replace(fragment="").geturl()
+    candidates: Dict[str, LinkCandidate] = {}
+
+    for raw_url, source, text in collector.found:
+        if raw_url.startswith(("#", "mailto:", "tel:", "javascript:")):
+            continue
+        absolute = urljoin(base_url, raw_url)
+        parsed = urlparse(absolute)
+        if parsed.scheme not in ("http", "https"):
+            continue
+        if parsed.path.lower().endswith(_ASSET_EXTENSIONS):
+            continue
+        absolute = parsed._replace(fragment="").geturl()
+        if absolute == base_page:
+            continue
+
+        existing = candidates.get(absolute)
+        if existing is None:
+            candidates[absolute] = LinkCandidate(url=absolute, text=text, source=source)
+        elif not existing.text and text:
+            existing.text = text
+
+    return list(candidates.values()), collector.unresolved
+
+
+def format_candidates(candidates: List[LinkCandidate]) -> str:
+    """LLM 프롬프트용 후보 목록 (번호. 텍스트 | URL)"""
+    return "\n".join(
+        f"{idx}. {c.text or '(텍스트 없음)'} | {c.url}"
+        for idx, c in enumerate(candidates, 1)
+    )
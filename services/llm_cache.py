@@ -0,0 +1,204 @@
+"""LLM 추출 결과 디스크 캐시 (콘텐츠 해시 기반)"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# 조회 hit의 accessed_at 갱신을 모아서 한 번에 반영할 개수 (조회마다 commit하지 않음)
+TOUCH_FLUSH_SIZE = 100
+# 다른 워커 프로세스의 저장분까지 반영하도록 실제 용량(SUM)을 다시 계산하는 저장 주기
+RESYNC_EVERY_PUTS = 100
+# 용량 초과 시 max_bytes의 이 비율까지 줄여 매 저장마다 제거가 반복되지 않게 함
+EVICT_TARGET_RATIO = 0.9
+
+
+class LLMCache:
+    """
+    LLM 응답 JSON을 SQLite 파일에 저장하는 캐시
+    - 키: 정규화된 HTML + 프롬프트 템플릿 + URL + 모델명 + 생성 설정의 SHA-256
+    - TTL 만료 및 용량 기반 LRU 제거 (저장 용량은 누적 합계로 추적하고 RESYNC_EVERY_PUTS마다 실제 값으로 보정)
+    - 조회 시각(accessed_at)은 TOUCH_FLUSH_SIZE개씩 모아 갱신
+    - bypass=True면 읽기를 건너뛰고 새 결과로 덮어씀 (강제 재추출)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ".cache/llm_cache.sqlite",
+        ttl_hours: float = 168,
+        max_size_mb: float = 200,
+        enabled: bool = True,
+        bypass: bool = False,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_hours * 3600 if ttl_hours else None
+        self.max_bytes = int(max_size_mb * 1024 * 1024) if max_size_mb else None
+        self.enabled = enabled
+        self.bypass = bypass
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        self._total_bytes = 0
+        self._puts_since_sync = 0
+        self._touched: Dict[str, float] = {}
+
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # --workers로 여러 프로세스가 같은 캐시를 쓰므로 잠금 대기(timeout) + WAL
+            self._conn = sqlite3.connect(str(self.path), timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+            self._conn.commit()
+            self._total_bytes = self._stored_bytes()
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict], project_root: Path, bypass: bool = False) -> "LLMCache":
+        """sites.yaml의 settings.llm_cache 섹션으로 생성"""
+        options = dict((settings or {}).get("llm_cache") or {})
+        path = Path(options.pop("path", ".cache/llm_cache.sqlite"))
+        if not path.is_absolute():
+            path = project_root / path
+        return cls(path=path, bypass=bypass or options.pop("bypass", False), **options)
+
+    @staticmethod
+    def make_key(template: str, url: str, html: str, model_name: str, generation_config: Dict) -> str:
+        """캐시 키 생성 (HTML은 공백 정규화 후 해시)"""
+        normalized_html = _WHITESPACE_RE.sub(" ", html or "").strip()
+        digest = hashlib.sha256()
+        for part in (
+            template,
+            url,
+            normalized_html,
+            model_name,
+            json.dumps(generation_config, sort_keys=True, ensure_ascii=False),
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def get(self, *keys: str) -> Optional[Dict]:
+        """
+        캐시 조회 (만료된 항목은 삭제 후 miss 처리)
+        키를 여러 개 주면 순서대로 찾아 첫 결과를 반환하며, hit/miss는 한 번만 집계
+        """
+        if not self._conn or self.bypass:
+            self.misses += 1
+            return None
+
+        for key in keys:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    def _lookup(self, key: str) -> Optional[Dict]:
+        row = self._conn.execute(
+            "SELECT value, size, created_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        now = time.time()
+        value, size, created_at = row
+        if self.ttl_seconds and now - created_at > self.ttl_seconds:
+            self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._conn.commit()
+            self._total_bytes -= size
+            return None
+
+        self._touched[key] = now
+        if len(self._touched) >= TOUCH_FLUSH_SIZE:
+            self._flush_touched()
+        return json.loads(value)
+
+    def _flush_touched(self):
+        """모아 둔 accessed_at 갱신을 한 트랜잭션으로 반영"""
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._touched.items()],
+        )
+        self._conn.commit()
+        self._touched.clear()
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def put(self, key: str, value: Dict):
+        """캐시 저장 후 용량 초과 시 LRU 제거"""
+        if not self._conn:
+            return
+
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, payload, size, now, now),
+        )
+        self.writes += 1
+        self._total_bytes += size
+        self._puts_since_sync += 1
+        if self.max_bytes and (self._total_bytes > self.max_bytes or self._puts_since_sync >= RESYNC_EVERY_PUTS):
+            self._evict()
+        self._conn.commit()
+
+    def _evict(self):
+        """실제 용량을 다시 계산하고, 최대 용량을 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        # LRU 순서가 정확하도록 미반영 조회 시각부터 기록
+        self._flush_touched()
+        self._puts_since_sync = 0
+        total = self._stored_bytes()
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TARGET_RATIO
+            victims = []
+            for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at ASC"):
+                if total <= target:
+                    break
+                victims.append((key,))
+                total -= size
+            self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+            self.evictions += len(victims)
+        self._total_bytes = total
+
+    def summary(self) -> str:
+        """로그 출력용 요약"""
+        if not self.enabled:
+            return "비활성화"
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups if lookups else 0.0
+        text = f"hit {self.hits} / miss {self.misses} ({hit_rate:.0%}), 저장 {self.writes}, 제거 {self.evictions}"
+        if self.bypass:
+            text += " [bypass]"
+        return text
+
+    def close(self):
+        """DB 연결 종료"""
+        if self._conn:
+            self._flush_touched()
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,151 @@
+"""Gemini 호출 동시성 제어 (AIMD) 및 오류 분류"""
+
+import asyncio
+import random
+import time
+from typing import Optional
+
+
+class LLMError(Exception):
+    """Gemini 호출 오류 (retryable: 재시도 대상 여부)"""
+    retryable = False
+
+
+class LLMRateLimitError(LLMError):
+    """429 / 할당량 초과 → 재시도, 동시성 감소"""
+    retryable = True
+
+
+class LLMTimeoutError(LLMError):
+    """gemini_timeout 초과 → 재시도, 동시성 감소"""
+    retryable = True
+
+
+class LLMTransientError(LLMError):
+    """5xx / 연결 오류 → 재시도"""
+    retryable = True
+
+
+class LLMResponseError(LLMError):
+    """응답은 왔지만 JSON이 아니거나 차단됨 → 재시도 (temperature > 0이라 다시 성공할 수 있음)"""
+    retryable = True
+
+
+class LLMFatalError(LLMError):
+    """잘못된 요청 / 인증 오류 등 → 재시도하지 않음"""
+    retryable = False
+
+
+_RATE_LIMIT_NAMES = ("ResourceExhausted", "TooManyRequests")
+_TRANSIENT_NAMES = ("InternalServerError", "ServiceUnavailable", "BadGateway", "GatewayTimeout", "DeadlineExceeded")
+
+
+def classify_error(exc: BaseException) -> LLMError:
+    """google-generativeai / asyncio 예외 → LLMError 하위 클래스"""
+    if isinstance(exc, LLMError):
+        return exc
+    message = f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+    name = type(exc).__name__
+    code = getattr(exc, "code", None)
+    if isinstance(exc, asyncio.TimeoutError):
+        return LLMTimeoutError(message)
+    if code == 429 or name in _RATE_LIMIT_NAMES:
+        return LLMRateLimitError(message)
+    if code in (500, 502, 503, 504) or name in _TRANSIENT_NAMES or isinstance(exc, (ConnectionError, OSError)):
+        return LLMTransientError(message)
+    if isinstance(exc, ValueError):
+        # json.JSONDecodeError, 안전 필터로 차단된 응답의 response.text 접근 오류
+        return LLMResponseError(message)
+    return LLMFatalError(message)
+
+
+def retry_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """지수 백오프 + full jitter (동시에 실패한 요청들이 같은 시각에 몰리지 않도록)"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD 방식 동시 호출 수 제한
+    - 성공할 때마다 limit += 1/limit (limit만큼 성공하면 약 1 증가)
+    - 429/타임아웃 또는 지연 급증(최근 평균의 latency_spike_ratio배 초과) 시 limit *= backoff_ratio
+    - 한 번 줄인 뒤에는 평균 지연 시간 동안 추가 감소 없음 (동시에 실패한 요청들로 과도하게 줄지 않도록)
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_spike_ratio: float = 2.0,
+        backoff_ratio: float = 0.5,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.latency_spike_ratio = latency_spike_ratio
+        self.backoff_ratio = backoff_ratio
+
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+        self._avg_latency: Optional[float] = None
+        self._last_decrease = 0.0
+
+        # 통계
+        self.calls = 0
+        self.decreases = 0
+        self.peak_limit = self.limit
+        self.lowest_limit = self.limit
+        self.peak_in_flight = 0
+
+    async def acquire(self):
+        """호출 슬롯 획득 (현재 limit만큼 호출 중이면 대기)"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def release(self, latency: float, overloaded: bool = False, cancelled: bool = False):
+        """
+        호출 슬롯 반납 및 limit 조정
+
+        Args:
+            latency: 호출 소요 시간 (초)
+            overloaded: 429/타임아웃 등 과부하 신호 여부
+            cancelled: 호출이 취소됨 (슬롯만 반납하고 limit/평균 지연은 그대로)
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            if cancelled:
+                self._condition.notify_all()
+                return
+            self.calls += 1
+            spike = (
+                self._avg_latency is not None
+                and latency > self._avg_latency * self.latency_spike_ratio
+            )
+            if overloaded or spike:
+                self._decrease()
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self.peak_limit = max(self.peak_limit, self.limit)
+            if not overloaded:
+                self._avg_latency = latency if self._avg_latency is None else 0.8 * self._avg_latency + 0.2 * latency
+            self._condition.notify_all()
+
+    def _decrease(self):
+        now = time.monotonic()
+        if now - self._last_decrease < (self._avg_latency or 0.0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+        self.lowest_limit = min(self.lowest_limit, self.limit)
+        self.decreases += 1
+
+    def report(self) -> str:
+        """동시성 조정 요약"""
+        return (
+            f"호출 {self.calls}회, 동시 호출 한도 현재 {int(self.limit)} "
+            f"(최소 {int(self.lowest_limit)} / 최대 {int(self.peak_limit)}, 감소 {self.decreases}회), "
+            f"최대 동시 호출 {self.peak_in_flight}"
+        )
@@ -1,70 +1,434 @@
 import os
 import json
-import google.generativeai as genai
-from typing import List, Dict, Optional
+import asyncio
+import time
+from typing import Collection, List, Dict, Optional, Sequence, Tuple
+
+from services.html_reducer import HtmlReducer, estimate_tokens
+from services.llm_cache import LLMCache
+from services.metrics import metrics
+from services.llm_limiter import (
+    AdaptiveConcurrencyLimiter,
+    LLMRateLimitError,
+    LLMTimeoutError,
+    classify_error,
+    retry_delay,
+)
+from services.llm_usage import (
+    STAGE_DETAIL,
+    STAGE_DETAIL_BATCH,
+    STAGE_LINK_CLASSIFICATION,
+    STAGE_LIST_HTML,
+    UsageTracker,
+)
+from services.link_extractor import LinkCandidate, format_candidates
 
 class LLMService:
     """
     Google Gemini API 연동 서비스
     - google-generativeai 라이브러리 사용
+    - 프롬프트 구성 전 HtmlReducer로 HTML 축소
+    - LLMCache가 있으면 동일 입력에 대한 모델 호출 생략
+    - 상세 페이지 여러 개를 토큰 예산 안에서 한 번의 호출로 묶어 추출 가능
+    - 동시 호출 수는 AdaptiveConcurrencyLimiter가 조정, 일시적 오류는 지터 포함 지수 백오프로 재시도
+    - 호출마다 토큰 사용량을 UsageTracker에 단계/소스별로 기록
     """
 
-    def __init__(self):
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            raise ValueError("GOOGLE_API_KEY 환경변수가 필요합니다.")
-        
-        genai.configure(api_key=api_key)
-        
-        # 모델 설정
+    def __init__(
+        self,
+        reducer: Optional[HtmlReducer] = None,
+        cache: Optional[LLMCache] = None,
+        batch_token_budget: int = 60000,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        timeout: float = 180,
+        max_retries: int = 4,
+        retry_base_delay: float = 2.0,
+        retry_max_delay: float = 60.0,
+        usage: Optional[UsageTracker] = None,
+        model=None,
+    ):
+        # 모델 설정 (model을 넘기면 그대로 사용: generate_content_async를 가진 객체, 벤치마크용 가짜 모델 등)
         self.model_name = os.getenv("GEMINI_MODEL", "gemini-2.0-flash-exp")
-        self.model = genai.GenerativeModel(self.model_name)
+        if model is None:
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                raise ValueError("GOOGLE_API_KEY 환경변수가 필요합니다.")
+            # google-generativeai는 import 비용이 커서 실제 API를 쓸 때만 로드
+            import google.generativeai as genai
+
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(self.model_name)
+        else:
+            self.model_name = getattr(model, "model_name", self.model_name)
+        self.model = model
         
-        # JSON 응답을 위한 설정
-        self.generation_config = genai.types.GenerationConfig(
-            temperature=0.1,
-            response_mime_type="application/json"
+        # JSON 응답을 위한 설정 (dict는 캐시 키 생성에도 사용, generate_content_async는 dict도 받음)
+        self.generation_config_dict = {
+            "temperature": 0.1,
+            "response_mime_type": "application/json",
+        }
+        self.generation_config = dict(self.generation_config_dict)
+
+        # HTML 축소 파이프라인 (기본값: 모든 단계 활성화)
+        self.reducer = reducer or HtmlReducer()
+        # 추출 결과 캐시 (None이면 캐시 미사용)
+        self.cache = cache
+        # 배치 추출 시 한 번의 요청에 넣을 최대 입력 토큰 (프롬프트 포함, 로컬 추정치)
+        self.batch_token_budget = batch_token_budget
+
+        # 동시 호출 제한 및 재시도 정책
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        # 토큰 사용량 / 비용 / 예산
+        self.usage = usage or UsageTracker()
+
+        # 배치 추출 통계
+        self.batch_calls = 0
+        self.batch_pages = 0
+        self.batch_fallbacks = 0
+        # 오류 종류별 발생 횟수 / 재시도 횟수 / 재시도 후에도 실패한 호출 수
+        self.errors: Dict[str, int] = {}
+        self.retries = 0
+        self.failed_calls = 0
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict], **kwargs) -> "LLMService":
+        """sites.yaml의 settings.llm / gemini_timeout / llm_batch 섹션으로 생성"""
+        settings = settings or {}
+        options = settings.get("llm") or {}
+        limiter = AdaptiveConcurrencyLimiter(
+            initial=options.get("initial_concurrency", 4),
+            min_limit=options.get("min_concurrency", 1),
+            max_limit=options.get("max_concurrency", 16),
+            latency_spike_ratio=options.get("latency_spike_ratio", 2.0),
+        )
+        return cls(
+            batch_token_budget=(settings.get("llm_batch") or {}).get("token_budget", 60000),
+            limiter=limiter,
+            timeout=settings.get("gemini_timeout", 180),
+            max_retries=options.get("max_retries", 4),
+            retry_base_delay=options.get("retry_base_delay", 2.0),
+            retry_max_delay=options.get("retry_max_delay", 60.0),
+            usage=UsageTracker.from_settings(settings),
+            **kwargs,
         )
 
-    async def _generate_content(self, prompt: str) -> Optional[Dict]:
-        """Gemini API 호출 및 JSON 파싱"""
-        try:
-            # 비동기 호출 (make_async=True가 지원되지 않는 버전일 수 있으므로 동기 호출을 비동기로 래핑하거나, 
-            # 최신 라이브러리에서는 generate_content_async 사용)
-            response = await self.model.generate_content_async(
-                prompt,
-                generation_config=self.generation_config
-            )
-            
-            return json.loads(response.text)
-            
-        except Exception as e:
-            print(f"[LLM] Error generating content: {e}")
+    def _reduce_html(self, html_content: str, url: str, reduced: bool = False) -> str:
+        """프롬프트에 넣을 HTML 축소 및 통계 출력 (reduced: 브라우저 워커에서 이미 같은 설정으로 축소됨)"""
+        if reduced:
+            return html_content
+        with metrics.timer("html_reduction", url):
+            reduced, stats = self.reducer.reduce(html_content)
+        print(f"[LLM] HTML 축소 {stats.summary()}: {url}")
+        return reduced
+
+    def _cache_key(self, template: str, url: str, html: str) -> Optional[str]:
+        """프롬프트 템플릿/URL/HTML/모델 설정 기반 캐시 키"""
+        if not self.cache:
             return None
+        return LLMCache.make_key(template, url, html, self.model_name, self.generation_config_dict)
+
+    async def _generate_content(
+        self,
+        prompt: str,
+        cache_key: Optional[str] = None,
+        stage: str = STAGE_DETAIL,
+        source: Optional[str] = None,
+        lookup: bool = True,
+    ) -> Optional[Dict]:
+        """
+        Gemini API 호출 및 JSON 파싱 (cache_key가 있으면 캐시 우선 조회)
+        lookup=False면 호출자가 이미 조회해 miss로 집계한 것이므로 저장만 수행
+        """
+        if cache_key and lookup:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                metrics.count("llm_cache", "hit", source)
+                return cached
+            metrics.count("llm_cache", "miss", source)
+
+        result = await self._call_model(prompt, stage, [source] if source else [])
+        if cache_key and result is not None:
+            self.cache.put(cache_key, result)
+        return result
 
-    async def extract_campaign_urls(self, html_content: str, base_url: str) -> List[str]:
-        """HTML에서 캠페인 URL 추출"""
+    def _record_usage(self, prompt: str, response, stage: str, sources: Sequence[str]):
+        """응답의 usage_metadata(없으면 로컬 추정치)로 토큰 사용량 기록"""
+        metadata = getattr(response, "usage_metadata", None)
+        input_tokens = getattr(metadata, "prompt_token_count", 0) or 0
+        output_tokens = getattr(metadata, "candidates_token_count", 0) or 0
+        estimated = not (input_tokens or output_tokens)
+        if estimated:
+            try:
+                text = response.text
+            except ValueError:
+                # 안전 필터로 차단된 응답은 text 접근 시 예외
+                text = ""
+            input_tokens = estimate_tokens(prompt)
+            output_tokens = estimate_tokens(text)
+        self.usage.record(stage, sources, input_tokens, output_tokens, estimated)
+
+    async def _call_model(
+        self,
+        prompt: str,
+        stage: str = STAGE_DETAIL,
+        sources: Sequence[str] = (),
+    ) -> Optional[Dict]:
+        """
+        Gemini API 호출 및 JSON 파싱
+        - limiter 슬롯을 얻은 뒤 gemini_timeout 안에 응답이 없으면 타임아웃 처리
+        - 재시도 대상 오류(429/5xx/타임아웃/JSON 오류)는 지수 백오프 후 재시도
+        - 재시도해도 실패하거나 재시도 대상이 아니면 None
+        - 응답을 받은 시도는 모두 토큰 사용량에 기록 (JSON 오류로 재시도한 경우 포함)
+        """
+        domain = sources[0] if sources else None
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire()
+            started = time.monotonic()
+            error = None
+            overloaded = False
+            cancelled = True
+            try:
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(prompt, generation_config=self.generation_config),
+                    timeout=self.timeout,
+                )
+                metrics.observe("llm_call", time.monotonic() - started, domain)
+                self._record_usage(prompt, response, stage, sources)
+                with metrics.timer("json_parse", domain):
+                    result = json.loads(response.text)
+                cancelled = False
+            except Exception as e:
+                error = classify_error(e)
+                overloaded = isinstance(error, (LLMRateLimitError, LLMTimeoutError))
+                cancelled = False
+            finally:
+                # CancelledError(종료/예산 중단/상위 wait_for)로 빠져나가도 슬롯이 새지 않도록 항상 반납
+                await asyncio.shield(
+                    self.limiter.release(time.monotonic() - started, overloaded=overloaded, cancelled=cancelled)
+                )
+
+            if error is not None:
+                name = type(error).__name__
+                self.errors[name] = self.errors.get(name, 0) + 1
+                metrics.count("llm_call", name, domain)
+
+                if not error.retryable or attempt >= self.max_retries:
+                    print(f"[LLM] Error generating content ({name}): {error}")
+                    self.failed_calls += 1
+                    return None
+
+                delay = retry_delay(attempt, self.retry_base_delay, self.retry_max_delay)
+                print(f"[LLM] {name}, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {error}")
+                self.retries += 1
+                await asyncio.sleep(delay)
+                continue
+
+            metrics.count("llm_call", "success", domain)
+            return result
+        return None
+
+    def call_report(self) -> str:
+        """호출 동시성/재시도/오류 요약"""
+        errors = ", ".join(f"{name} {count}" for name, count in sorted(self.errors.items())) or "없음"
+        return f"{self.limiter.report()} / 재시도 {self.retries}회, 최종 실패 {self.failed_calls}회 (오류: {errors})"
+
+    async def extract_campaign_urls(
+        self, html_content: str, base_url: str, reduced: bool = False
+    ) -> Optional[List[str]]:
+        """
+        HTML에서 캠페인 URL 추출
+
+        Returns:
+            캠페인 URL 리스트 (환경 캠페인이 없으면 빈 리스트, 호출/응답 실패 시 None)
+        """
         from prompts.list_extraction import LIST_EXTRACTION_PROMPT
         
-        # HTML이 너무 길 경우를 대비해 길이 제한 (필요시 조정)
-        truncated_html = html_content[:1000000] 
+        # 불필요한 노드/속성 제거 후 길이 제한 (reducer.max_chars)
+        reduced_html = self._reduce_html(html_content, base_url, reduced)
         
-        prompt = LIST_EXTRACTION_PROMPT.format(url=base_url, html=truncated_html)
-        result = await self._generate_content(prompt)
+        prompt = LIST_EXTRACTION_PROMPT.format(url=base_url, html=reduced_html)
+        cache_key = self._cache_key(LIST_EXTRACTION_PROMPT, base_url, reduced_html)
+        result = await self._generate_content(prompt, cache_key, STAGE_LIST_HTML, base_url)
         
         if result and "campaign_urls" in result:
             return result["campaign_urls"]
         
         print(f"[DEBUG] LLM Extraction Failed. Result: {result}")
-        return []
+        return None
+
+    async def classify_campaign_links(self, candidates: List[LinkCandidate], base_url: str) -> Optional[List[str]]:
+        """
+        결정적으로 수집한 후보 링크 중 환경 캠페인 상세 링크만 선택
+
+        Returns:
+            선택된 URL 리스트 (환경 캠페인이 없으면 빈 리스트, 호출/응답 실패 시 None)
+        """
+        from prompts.link_classification import LINK_CLASSIFICATION_PROMPT
+
+        if not candidates:
+            return []
+
+        candidates_text = format_candidates(candidates)
+        print(f"[LLM] 후보 링크 {len(candidates)}개 분류 ({len(candidates_text):,}자): {base_url}")
+
+        prompt = LINK_CLASSIFICATION_PROMPT.format(url=base_url, candidates=candidates_text)
+        cache_key = self._cache_key(LINK_CLASSIFICATION_PROMPT, base_url, candidates_text)
+        result = await self._generate_content(prompt, cache_key, STAGE_LINK_CLASSIFICATION, base_url)
 
-    async def extract_campaign_detail(self, html_content: str, url: str) -> Optional[Dict]:
-        """HTML에서 캠페인 상세 정보 추출"""
+        if not result or "campaign_indices" not in result:
+            print(f"[DEBUG] LLM Link Classification Failed. Result: {result}")
+            return None
+
+        urls = []
+        for idx in result["campaign_indices"]:
+            # 목록에 없는 번호는 무시 (LLM이 URL을 지어내지 못하도록 번호로만 응답)
+            if isinstance(idx, int) and 1 <= idx <= len(candidates):
+                url = candidates[idx - 1].url
+                if url not in urls:
+                    urls.append(url)
+        return urls
+
+    async def extract_campaign_detail(
+        self, html_content: str, url: str, source: Optional[str] = None, reduced: bool = False
+    ) -> Optional[Dict]:
+        """
+        HTML에서 캠페인 상세 정보 추출
+
+        Args:
+            source: 사용량 집계용 소스 (상세 페이지를 발견한 목록 URL, 없으면 url)
+            reduced: html_content가 이미 축소본인지 (브라우저 워커 풀에서 처리됨)
+        """
+        reduced_html = self._reduce_html(html_content, url, reduced)
+        return await self._extract_detail_reduced(reduced_html, url, source)
+
+    async def _extract_detail_reduced(
+        self, reduced_html: str, url: str, source: Optional[str] = None, lookup: bool = True
+    ) -> Optional[Dict]:
+        """축소된 HTML 하나로 상세 정보 추출"""
         from prompts.unified_extraction import UNIFIED_EXTRACTION_PROMPT
-        
-        truncated_html = html_content[:1000000]
-        
-        prompt = UNIFIED_EXTRACTION_PROMPT.format(url=url, html=truncated_html)
-        result = await self._generate_content(prompt)
+
+        prompt = UNIFIED_EXTRACTION_PROMPT.format(url=url, html=reduced_html)
+        cache_key = self._cache_key(UNIFIED_EXTRACTION_PROMPT, url, reduced_html)
+        result = await self._generate_content(prompt, cache_key, STAGE_DETAIL, source or url, lookup)
         
         return result
+
+    def _pack_batches(self, docs: List[Tuple[str, str, Optional[str]]], overhead: int) -> List[List[Tuple[str, str, Optional[str]]]]:
+        """순서를 유지하며 토큰 예산을 넘지 않도록 문서 묶기 (예산을 넘는 문서는 단독 묶음)"""
+        batches = []
+        current, used = [], overhead
+        for doc in docs:
+            tokens = estimate_tokens(doc[1]) + estimate_tokens(doc[0]) + 20
+            if current and used + tokens > self.batch_token_budget:
+                batches.append(current)
+                current, used = [], overhead
+            current.append(doc)
+            used += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def _valid_detail_result(entry) -> bool:
+        """배치 응답 항목이 단건 추출 결과와 같은 형식인지 확인"""
+        return (
+            isinstance(entry, dict)
+            and isinstance(entry.get("is_environmental_campaign"), bool)
+            and isinstance(entry.get("campaigns", []), list)
+        )
+
+    async def extract_campaign_details_batch(
+        self,
+        pages: List[Tuple[str, str]],
+        sources: Optional[Dict[str, str]] = None,
+        reduced: Collection[str] = (),
+    ) -> Dict[str, Optional[Dict]]:
+        """
+        여러 상세 페이지를 토큰 예산 안에서 묶어 한 번의 호출로 추출
+        - 페이지별로 캐시를 먼저 조회하고 남은 페이지만 묶음
+        - 응답에서 빠졌거나 형식이 잘못된 페이지는 단건 추출로 재시도
+
+        Args:
+            pages: (url, html) 리스트
+            sources: 사용량 집계용 url → 소스(목록 URL)
+            reduced: html이 이미 축소본인 url (브라우저 워커 풀에서 처리됨)
+
+        Returns:
+            url → 추출 결과 (실패 시 None)
+        """
+        from prompts.batch_extraction import BATCH_DOCUMENT_TEMPLATE, BATCH_EXTRACTION_PROMPT
+        from prompts.unified_extraction import UNIFIED_EXTRACTION_PROMPT
+
+        sources = sources or {}
+        results: Dict[str, Optional[Dict]] = {}
+        pending = []
+        for url, html in pages:
+            reduced_html = self._reduce_html(html, url, url in reduced)
+            cache_key = self._cache_key(BATCH_EXTRACTION_PROMPT, url, reduced_html)
+            cached = None
+            if cache_key:
+                # 단건 추출(배치 모드 전환 전 실행, 단독 묶음, 단건 재시도)로 저장된 결과도 재사용
+                # 페이지당 hit/miss는 한 번만 집계 (이후 단건 추출은 재조회하지 않음)
+                cached = self.cache.get(cache_key, self._cache_key(UNIFIED_EXTRACTION_PROMPT, url, reduced_html))
+                metrics.count("llm_cache", "hit" if cached is not None else "miss", sources.get(url, url))
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending.append((url, reduced_html, cache_key))
+
+        overhead = estimate_tokens(BATCH_EXTRACTION_PROMPT)
+        for batch in self._pack_batches(pending, overhead):
+            if len(batch) == 1:
+                url, reduced_html, _ = batch[0]
+                results[url] = await self._extract_detail_reduced(reduced_html, url, sources.get(url), lookup=False)
+                continue
+
+            documents = "".join(
+                BATCH_DOCUMENT_TEMPLATE.format(key=i, url=url, html=reduced_html)
+                for i, (url, reduced_html, _) in enumerate(batch, 1)
+            )
+            print(f"[LLM] 상세 페이지 {len(batch)}개 배치 추출 ({len(documents):,}자)")
+            response = await self._call_model(
+                BATCH_EXTRACTION_PROMPT.format(documents=documents),
+                STAGE_DETAIL_BATCH,
+                [sources.get(url, url) for url, _, _ in batch],
+            )
+            self.batch_calls += 1
+
+            entries = {}
+            if isinstance(response, dict) and isinstance(response.get("results"), list):
+                for entry in response["results"]:
+                    if isinstance(entry, dict):
+                        entries[str(entry.pop("key", ""))] = entry
+
+            for i, (url, reduced_html, cache_key) in enumerate(batch, 1):
+                entry = entries.get(str(i))
+                if not self._valid_detail_result(entry):
+                    # 누락/형식 오류 → 이 페이지만 단건 추출
+                    print(f"[LLM] 배치 응답에 결과 없음, 단건 재시도: {url}")
+                    self.batch_fallbacks += 1
+                    results[url] = await self._extract_detail_reduced(reduced_html, url, sources.get(url), lookup=False)
+                    continue
+
+                for campaign in entry.get("campaigns") or []:
+                    if isinstance(campaign, dict) and not campaign.get("campaign_url"):
+                        campaign["campaign_url"] = url
+                self.batch_pages += 1
+                if cache_key:
+                    self.cache.put(cache_key, entry)
+                results[url] = entry
+
+        return results
+
+    def batch_report(self) -> str:
+        """배치 추출 통계 요약"""
+        if not self.batch_calls:
+            return "배치 호출 없음"
+        return (
+            f"배치 호출 {self.batch_calls}회 / 페이지 {self.batch_pages}개 "
+            f"(호출당 {self.batch_pages / self.batch_calls:.1f}개), 단건 재시도 {self.batch_fallbacks}개"
+        )
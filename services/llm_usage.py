@@ -0,0 +1,129 @@
+"""Gemini 토큰 사용량 및 비용 집계 (실행당 예산 포함)"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+# 단계 이름 (LLMService 호출 종류)
+STAGE_LIST_HTML = "list_html"
+STAGE_LINK_CLASSIFICATION = "link_classification"
+STAGE_DETAIL = "detail"
+STAGE_DETAIL_BATCH = "detail_batch"
+
+
+@dataclass
+class TokenUsage:
+    """토큰 사용량 합계"""
+    calls: float = 0  # 배치 호출을 소스별로 나누면 소수가 될 수 있음
+    input_tokens: int = 0
+    output_tokens: int = 0
+    estimated_calls: float = 0  # usage_metadata가 없어 로컬 추정치를 사용한 호출 수
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def add(self, input_tokens: int, output_tokens: int, calls: float, estimated: bool):
+        self.calls += calls
+        self.input_tokens += input_tokens
+        self.output_tokens += output_tokens
+        if estimated:
+            self.estimated_calls += calls
+
+
+class UsageTracker:
+    """
+    LLM 호출별 토큰 사용량을 전체 / 단계별 / 소스(목록 URL)별로 집계
+    - Gemini 응답의 usage_metadata를 우선 사용하고 없으면 로컬 추정치 사용
+    - 배치 호출은 묶인 페이지의 소스에 균등 분배 (소스별 값은 근사치)
+    - max_tokens를 넘으면 exhausted가 True가 되고, 파이프라인은 새 상세 페이지 작업을 중단
+    """
+
+    def __init__(
+        self,
+        max_tokens: Optional[int] = None,
+        input_price_per_million: float = 0.0,
+        output_price_per_million: float = 0.0,
+    ):
+        self.max_tokens = max_tokens
+        self.input_price_per_million = input_price_per_million
+        self.output_price_per_million = output_price_per_million
+
+        self.total = TokenUsage()
+        self.by_stage: Dict[str, TokenUsage] = {}
+        self.by_source: Dict[str, TokenUsage] = {}
+        self._warned = False
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict]) -> "UsageTracker":
+        """sites.yaml의 settings.llm_budget 섹션으로 생성"""
+        options = (settings or {}).get("llm_budget") or {}
+        return cls(
+            max_tokens=options.get("max_tokens"),
+            input_price_per_million=options.get("input_price_per_million", 0.0),
+            output_price_per_million=options.get("output_price_per_million", 0.0),
+        )
+
+    def record(
+        self,
+        stage: str,
+        sources: Sequence[str],
+        input_tokens: int,
+        output_tokens: int,
+        estimated: bool = False,
+    ):
+        """호출 1회의 사용량 기록 (sources가 여러 개면 균등 분배)"""
+        self.total.add(input_tokens, output_tokens, 1, estimated)
+        self.by_stage.setdefault(stage, TokenUsage()).add(input_tokens, output_tokens, 1, estimated)
+
+        sources = list(sources) or ["(unknown)"]
+        share = 1 / len(sources)
+        for source in sources:
+            self.by_source.setdefault(source, TokenUsage()).add(
+                round(input_tokens * share), round(output_tokens * share), share, estimated
+            )
+
+        if self.exhausted and not self._warned:
+            self._warned = True
+            print(f"[LLM Budget] 토큰 예산 소진 ({self.total.total_tokens:,} / {self.max_tokens:,}), "
+                  f"새 상세 페이지 작업을 중단합니다.")
+
+    @property
+    def exhausted(self) -> bool:
+        """실행당 토큰 예산 초과 여부"""
+        return self.max_tokens is not None and self.total.total_tokens >= self.max_tokens
+
+    def cost(self, usage: Optional[TokenUsage] = None) -> float:
+        """추정 비용 (USD)"""
+        usage = usage or self.total
+        return (
+            usage.input_tokens * self.input_price_per_million
+            + usage.output_tokens * self.output_price_per_million
+        ) / 1_000_000
+
+    def _line(self, label: str, usage: TokenUsage) -> str:
+        estimated = f", 추정 {usage.estimated_calls:g}회" if usage.estimated_calls else ""
+        return (
+            f"{label}: 호출 {usage.calls:g}회{estimated}, 입력 {usage.input_tokens:,} / "
+            f"출력 {usage.output_tokens:,} 토큰, ${self.cost(usage):.4f}"
+        )
+
+    def report(self, top_sources: int = 10) -> List[str]:
+        """전체 / 단계별 / 소스별(사용량 상위) 요약"""
+        budget = f" (예산 {self.max_tokens:,})" if self.max_tokens is not None else ""
+        lines = [self._line("전체", self.total) + budget]
+        for stage, usage in sorted(self.by_stage.items()):
+            lines.append(self._line(f"단계 {stage}", usage))
+        ranked = sorted(self.by_source.items(), key=lambda item: item[1].total_tokens, reverse=True)
+        for source, usage in ranked[:top_sources]:
+            lines.append(self._line(f"소스 {source}", usage))
+        return lines
+
+    def outputs(self) -> Dict[str, str]:
+        """GITHUB_OUTPUT에 기록할 값"""
+        return {
+            "llm_calls": str(int(self.total.calls)),
+            "llm_input_tokens": str(int(self.total.input_tokens)),
+            "llm_output_tokens": str(int(self.total.output_tokens)),
+            "llm_cost_usd": f"{self.cost():.4f}",
+            "llm_budget_exhausted": "true" if self.exhausted else "false",
+        }
@@ -0,0 +1,56 @@
+"""이벤트 루프 지연(loop lag) 측정"""
+
+import asyncio
+import time
+from typing import Callable, List, Optional
+
+
+class LoopLagMonitor:
+    """
+    주기적으로 sleep하고 실제로 깨어난 시각과의 차이로 루프 지연 측정
+    - 동기 호출이 루프를 막으면 지연이 커짐
+    - gauge가 있으면 같은 주기로 값을 샘플링 (예: writer 큐 깊이)
+    """
+
+    def __init__(self, interval: float = 0.5, gauge: Optional[Callable[[], int]] = None):
+        self.interval = interval
+        self.gauge = gauge
+        self.lags: List[float] = []
+        self.gauge_samples: List[int] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.monotonic() - expected))
+            if self.gauge:
+                self.gauge_samples.append(self.gauge())
+
+    def start(self):
+        """측정 시작"""
+        self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self):
+        """측정 종료"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def report(self) -> str:
+        """루프 지연 및 게이지 요약"""
+        if not self.lags:
+            return "샘플 없음"
+        lags = sorted(self.lags)
+        p95 = lags[min(len(lags) - 1, int(len(lags) * 0.95))]
+        text = (
+            f"루프 지연 평균 {sum(lags) / len(lags) * 1000:.0f}ms / "
+            f"p95 {p95 * 1000:.0f}ms / 최대 {lags[-1] * 1000:.0f}ms ({len(lags)} 샘플)"
+        )
+        if self.gauge_samples:
+            text += (
+                f", writer 큐 평균 {sum(self.gauge_samples) / len(self.gauge_samples):.1f}"
+                f" / 최대 {max(self.gauge_samples)}"
+            )
+        return text
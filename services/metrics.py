@@ -0,0 +1,231 @@
+"""단계별 소요 시간 / 결과 카운터 수집 및 실행 리포트 (JSON, Prometheus textfile)"""
+
+import json
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+# 전체 도메인 합계에 사용하는 라벨
+ALL_DOMAINS = "all"
+
+_NULL_TIMER = nullcontext()
+
+
+def _domain(url_or_host: Optional[str]) -> str:
+    if not url_or_host:
+        return ALL_DOMAINS
+    if "://" in url_or_host:
+        return (urlparse(url_or_host).hostname or ALL_DOMAINS).lower()
+    return url_or_host.lower()
+
+
+def _percentile(sorted_values: List[float], ratio: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * ratio))]
+
+
+class _Timer:
+    """with 블록 소요 시간을 기록 (async 함수 안에서도 await를 감싸서 사용 가능)"""
+
+    __slots__ = ("registry", "name", "domain", "started")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, domain: str):
+        self.registry = registry
+        self.name = name
+        self.domain = domain
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.started, self.domain)
+        return False
+
+
+class MetricsRegistry:
+    """
+    실행 중 단계별 소요 시간(히스토그램)과 결과 카운터를 도메인별로 수집
+    - timer(name, url): with 블록 소요 시간 기록 / observe(): 직접 기록
+    - count(name, outcome, url): success/skip/fail 등 결과 카운트
+    - report(): p50/p95/max 포함 dict, write_json()/write_prometheus()로 파일 출력
+    - enabled=False면 모든 기록이 즉시 반환 (with 블록도 공용 nullcontext 사용)
+    - writer 스레드에서도 기록하므로 lock으로 보호
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._samples: Dict[Tuple[str, str], List[float]] = {}
+        self._counters: Dict[Tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def timer(self, name: str, url: Optional[str] = None):
+        """단계 소요 시간 측정 컨텍스트"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, _domain(url))
+
+    def observe(self, name: str, seconds: float, url: Optional[str] = None):
+        """단계 소요 시간 기록"""
+        if not self.enabled:
+            return
+        key = (name, _domain(url))
+        with self._lock:
+            self._samples.setdefault(key, []).append(seconds)
+
+    def count(self, name: str, outcome: str, url: Optional[str] = None, value: int = 1):
+        """결과 카운터 증가 (outcome: success / skip / fail 등)"""
+        if not self.enabled:
+            return
+        key = (name, outcome, _domain(url))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _snapshot(self):
+        with self._lock:
+            samples = {key: list(values) for key, values in self._samples.items()}
+            counters = dict(self._counters)
+        return samples, counters
+
+    @staticmethod
+    def _summary(values: List[float]) -> Dict[str, float]:
+        ordered = sorted(values)
+        return {
+            "count": len(ordered),
+            "sum": round(sum(ordered), 4),
+            "p50": round(_percentile(ordered, 0.5), 4),
+            "p95": round(_percentile(ordered, 0.95), 4),
+            "max": round(ordered[-1], 4),
+        }
+
+    def report(self) -> Dict:
+        """
+        {"timers": {name: {전체 요약..., "by_domain": {domain: 요약}}},
+         "counters": {name: {outcome: {"total": n, "by_domain": {domain: n}}}}}
+        """
+        samples, counters_raw = self._snapshot()
+        timers: Dict[str, Dict] = {}
+        merged: Dict[str, List[float]] = {}
+        for (name, domain), values in samples.items():
+            merged.setdefault(name, []).extend(values)
+            timers.setdefault(name, {"by_domain": {}})["by_domain"][domain] = self._summary(values)
+        for name, values in merged.items():
+            timers[name].update(self._summary(values))
+
+        counters: Dict[str, Dict] = {}
+        for (name, outcome, domain), value in counters_raw.items():
+            entry = counters.setdefault(name, {}).setdefault(outcome, {"total": 0, "by_domain": {}})
+            entry["total"] += value
+            entry["by_domain"][domain] = entry["by_domain"].get(domain, 0) + value
+
+        return {
+            "started_at": self.started_at,
+            "duration_seconds": round(time.time() - self.started_at, 2),
+            "timers": timers,
+            "counters": counters,
+        }
+
+    def summary_lines(self) -> List[str]:
+        """콘솔 출력용 단계별 요약"""
+        report = self.report()
+        lines = []
+        for name, stats in sorted(report["timers"].items()):
+            lines.append(
+                f"{name}: {stats['count']}회, p50 {stats['p50']:.2f}초 / p95 {stats['p95']:.2f}초 / "
+                f"최대 {stats['max']:.2f}초 (합계 {stats['sum']:.1f}초)"
+            )
+        for name, outcomes in sorted(report["counters"].items()):
+            counts = ", ".join(f"{outcome} {entry['total']}" for outcome, entry in sorted(outcomes.items()))
+            lines.append(f"{name}: {counts}")
+        return lines
+
+    def write_json(self, path: Union[str, Path]):
+        """JSON 리포트 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def write_prometheus(self, path: Union[str, Path], prefix: str = "campaign_crawler"):
+        """node_exporter textfile collector 형식으로 저장 (임시 파일에 쓴 뒤 교체)"""
+        samples, counters = self._snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds 단계별 소요 시간",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for (name, domain), values in sorted(samples.items()):
+            ordered = sorted(values)
+            labels = f'stage="{name}",domain="{domain}"'
+            for quantile in (0.5, 0.95, 1.0):
+                lines.append(f'{prefix}_stage_seconds{{{labels},quantile="{quantile}"}} {_percentile(ordered, quantile):.6f}')
+            lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {sum(ordered):.6f}")
+            lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {len(ordered)}")
+
+        lines += [
+            f"# HELP {prefix}_events_total 단계별 결과 수",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        for (name, outcome, domain), value in sorted(counters.items()):
+            lines.append(f'{prefix}_events_total{{event="{name}",outcome="{outcome}",domain="{domain}"}} {value}')
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        tmp.replace(path)
+
+
+class StartupTimer:
+    """
+    시작 단계별 소요 시간
+    - mark(name): 직전 mark 이후 순차 단계 시간 기록
+    - record(name, seconds): 다른 단계와 겹쳐 진행된 백그라운드 단계 시간 기록
+    - 메트릭 레지스트리에는 startup_<name> 타이머로 함께 기록
+    """
+
+    def __init__(self, registry: MetricsRegistry, started_at: Optional[float] = None):
+        self.registry = registry
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self._last = self.started_at
+        self.phases: List[Tuple[str, float, bool]] = []
+
+    def mark(self, name: str) -> float:
+        """순차 단계 종료 (소요 시간 반환)"""
+        now = time.perf_counter()
+        seconds = now - self._last
+        self._last = now
+        self.phases.append((name, seconds, False))
+        self.registry.observe(f"startup_{name}", seconds)
+        return seconds
+
+    def record(self, name: str, seconds: float, background: bool = True):
+        """이미 측정한 단계 기록 (기본: 다른 단계와 겹쳐 진행된 백그라운드 단계)"""
+        self.phases.append((name, seconds, background))
+        self.registry.observe(f"startup_{name}", seconds)
+
+    @property
+    def elapsed(self) -> float:
+        """시작 후 경과 시간"""
+        return time.perf_counter() - self.started_at
+
+    def report(self) -> str:
+        """단계별 요약 (백그라운드 단계는 괄호 표시)"""
+        parts = [
+            f"({name} {seconds:.2f}초)" if background else f"{name} {seconds:.2f}초"
+            for name, seconds, background in self.phases
+        ]
+        sequential = sum(seconds for _, seconds, background in self.phases if not background)
+        return f"{', '.join(parts)} / 순차 합계 {sequential:.2f}초"
+
+
+# 프로세스 전역 레지스트리 (main에서 settings.metrics로 설정)
+metrics = MetricsRegistry()
+
+
+def configure_metrics(settings: Optional[Dict]) -> MetricsRegistry:
+    """settings.metrics.enabled 반영 후 전역 레지스트리 반환"""
+    options = (settings or {}).get("metrics") or {}
+    metrics.enabled = options.get("enabled", True)
+    return metrics
@@ -0,0 +1,107 @@
+"""페이지 렌더링 완료 감지 전략 (고정 대기 대신 적응형 대기)"""
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Dict, Optional
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+READINESS_STRATEGIES = ("fixed", "network_idle", "dom_stable", "scroll")
+
+# quiet_ms 동안 DOM 변경이 없으면 resolve (max_ms가 지나면 강제 resolve)
+_DOM_STABLE_JS = """
+({quietMs, maxMs}) => new Promise(resolve => {
+    let quietTimer;
+    const finish = () => {
+        observer.disconnect();
+        clearTimeout(quietTimer);
+        clearTimeout(capTimer);
+        resolve(true);
+    };
+    const observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(finish, quietMs);
+    });
+    // 노드 추가/삭제만 감시 (캐러셀·카운트다운 등의 style/class/텍스트 변경은 무시해야 maxMs 전에 끝남)
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    quietTimer = setTimeout(finish, quietMs);
+    const capTimer = setTimeout(finish, maxMs);
+})
+"""
+
+_SCROLL_HEIGHT_JS = "() => document.body ? document.body.scrollHeight : 0"
+_SCROLL_STEP_JS = "() => { window.scrollBy(0, window.innerHeight); return window.scrollY + window.innerHeight; }"
+
+
+async def _wait_dom_stable(page: "Page", quiet_ms: int, max_ms: int):
+    await page.evaluate(_DOM_STABLE_JS, {"quietMs": quiet_ms, "maxMs": max_ms})
+
+
+async def _wait_network_idle(page: "Page", max_ms: int):
+    try:
+        await page.wait_for_load_state("networkidle", timeout=max_ms)
+    except Exception:
+        # 폴링/롱폴링이 있는 페이지는 idle에 도달하지 못하므로 상한에서 종료
+        pass
+
+
+async def _scroll_until_stable(page: "Page", quiet_ms: int, deadline: float, max_steps: int):
+    """한 화면씩 스크롤하며 높이가 더 이상 늘지 않을 때까지 반복"""
+    last_height = await page.evaluate(_SCROLL_HEIGHT_JS)
+    for _ in range(max_steps):
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms <= 0:
+            break
+        position = await page.evaluate(_SCROLL_STEP_JS)
+        await _wait_dom_stable(page, quiet_ms, min(remaining_ms, quiet_ms * 4))
+        height = await page.evaluate(_SCROLL_HEIGHT_JS)
+        # 바닥에 도달했고 높이 변화가 없으면 완료
+        if position >= height and height <= last_height:
+            break
+        last_height = height
+
+
+async def wait_until_ready(page: "Page", options: Optional[Dict] = None) -> float:
+    """
+    페이지가 준비될 때까지 대기
+
+    Args:
+        page: 이동이 끝난(domcontentloaded) 페이지
+        options: settings.readiness 설정
+            - strategy: fixed | network_idle | dom_stable | scroll
+            - max_wait_seconds: 전략과 무관한 최대 대기 시간
+            - quiet_ms: DOM 변경이 없어야 하는 시간
+            - fixed_delay_seconds: fixed 전략의 대기 시간
+            - max_scroll_steps: scroll 전략의 최대 스크롤 횟수
+
+    Returns:
+        준비까지 걸린 시간 (초)
+    """
+    options = options or {}
+    strategy = options.get("strategy", "scroll")
+    max_wait = float(options.get("max_wait_seconds", 10))
+    quiet_ms = int(options.get("quiet_ms", 500))
+    max_ms = int(max_wait * 1000)
+
+    started = time.monotonic()
+    deadline = started + max_wait
+
+    async def run():
+        if strategy == "fixed":
+            # 기존 방식: 한 번 스크롤 후 고정 대기
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await asyncio.sleep(float(options.get("fixed_delay_seconds", 3)))
+        elif strategy == "network_idle":
+            await _wait_network_idle(page, max_ms)
+        elif strategy == "dom_stable":
+            await _wait_dom_stable(page, quiet_ms, max_ms)
+        else:
+            await _scroll_until_stable(page, quiet_ms, deadline, int(options.get("max_scroll_steps", 20)))
+
+    try:
+        await asyncio.wait_for(run(), timeout=max_wait + 1)
+    except asyncio.TimeoutError:
+        pass
+
+    return time.monotonic() - started
@@ -0,0 +1,94 @@
+"""목록 페이지의 다음 페이지 / 더보기 링크를 결정적으로 찾기"""
+
+import re
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+from services.link_extractor import LinkCandidate
+
+# 페이지 번호로 쓰이는 쿼리 키 (소문자 비교)
+DEFAULT_PAGE_PARAMS = (
+    "page", "pageno", "page_no", "pageindex", "pagenum", "pagenumber", "currentpage",
+    "curpage", "cpage", "nowpage", "pg", "p",
+)
+# 다음 페이지 링크 텍스트 (공백 제거, 소문자 비교)
+NEXT_TEXTS = {"다음", "다음페이지", "다음page", "next", "nextpage", "›", "»", ">", ">>", "▶", "〉"}
+# 전체 목록으로 이어지는 링크 텍스트
+MORE_TEXTS = {"더보기", "more", "viewmore", "loadmore", "전체보기", "목록더보기", "+더보기"}
+
+_PATH_PAGE_RE = re.compile(r"/page/(\d+)/?$", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def page_number(url: str, page_param: Optional[str] = None) -> Tuple[Optional[int], str]:
+    """
+    URL의 페이지 번호와 페이지 번호를 뺀 나머지 (같은 목록인지 비교하는 키)
+
+    Returns:
+        (페이지 번호 또는 None, 목록 키)
+    """
+    parsed = urlparse(url)
+    keys = {page_param.lower()} if page_param else set(DEFAULT_PAGE_PARAMS)
+    number = None
+    rest = []
+    for key, value in parse_qsl(parsed.query, keep_blank_values=True):
+        if number is None and key.lower() in keys and value.isdigit():
+            number = int(value)
+        else:
+            rest.append((key, value))
+
+    path = parsed.path
+    match = _PATH_PAGE_RE.search(path)
+    if number is None and match:
+        number = int(match.group(1))
+        path = path[: match.start()]
+    return number, f"{(parsed.hostname or '').lower()}{path.rstrip('/')}?{sorted(rest)}"
+
+
+def _normalized_text(text: str) -> str:
+    return _WHITESPACE_RE.sub("", text or "").lower()
+
+
+def find_next_pages(
+    candidates: List[LinkCandidate],
+    list_url: str,
+    page_param: Optional[str] = None,
+    follow_more_links: bool = True,
+) -> List[str]:
+    """
+    목록 페이지에서 따라갈 목록 URL 찾기
+    - 페이지 번호 링크: 같은 목록(페이지 번호만 다른 URL) 중 현재 페이지 바로 다음 번호 하나만
+      (최신순 목록을 한 쪽씩 따라가야 이미 아는 캠페인만 나올 때 멈출 수 있음)
+    - 번호 링크가 없으면 "다음", "next", "›" 같은 텍스트의 링크
+    - follow_more_links면 같은 호스트의 "더보기"/"전체보기" 링크
+    - JS 함수로 페이지를 넘기는 사이트는 link_templates로 URL을 만들어 주면 같은 방식으로 인식
+
+    Returns:
+        목록 URL 리스트 (문서 순서)
+    """
+    current, list_key = page_number(list_url, page_param)
+    current = current or 1
+    host = (urlparse(list_url).hostname or "").lower()
+
+    numbered: Optional[Tuple[int, str]] = None
+    next_link: Optional[str] = None
+    more_links: List[str] = []
+    for candidate in candidates:
+        if (urlparse(candidate.url).hostname or "").lower() != host:
+            continue
+        number, key = page_number(candidate.url, page_param)
+        text = _normalized_text(candidate.text)
+        if number is not None and key == list_key:
+            if number > current and (numbered is None or number < numbered[0]):
+                numbered = (number, candidate.url)
+        elif text in NEXT_TEXTS and next_link is None:
+            next_link = candidate.url
+        elif follow_more_links and text in MORE_TEXTS:
+            more_links.append(candidate.url)
+
+    pages = []
+    if numbered:
+        pages.append(numbered[1])
+    elif next_link:
+        pages.append(next_link)
+    return pages + [url for url in more_links if url not in pages]
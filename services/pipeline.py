@@ -0,0 +1,671 @@
+"""큐 기반 스트리밍 크롤링 파이프라인 (fetch → extract → persist)"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from services.campaign_writer import CampaignWriter
+from services.change_detector import SourceFingerprintStore, html_hash, link_set_hash
+from services.crawl_state import EXTRACTED, FAILED, FETCHED, PENDING, SKIPPED, Checkpoint, CrawlStateStore
+from services.http_fetcher import TieredFetcher
+from services.llm_service import LLMService
+from services.link_extractor import LinkCandidate, collect_links
+from services.metrics import metrics
+from services.pagination import find_next_pages
+from services.site_settings import SiteSettings
+from services.work_queue import WorkItem, WorkQueue
+
+LIST = "list"
+DETAIL = "detail"
+
+
+@dataclass
+class CrawlJob:
+    """파이프라인 작업 단위"""
+    url: str
+    kind: str  # LIST 또는 DETAIL
+    source: str  # 상세 페이지를 발견한 목록 URL (목록이면 자기 자신)
+    depth: int = 0  # 목록: 설정 파일의 URL이 0, 다음 페이지/더보기를 따라갈 때마다 +1 / 상세: 발견한 목록의 깊이
+    html: str = ""
+    reduced: bool = False  # html이 브라우저 워커에서 이미 축소됨
+    candidates: Optional[List[LinkCandidate]] = None  # 브라우저 워커에서 수집한 목록의 후보 링크
+    unresolved: List[str] = field(default_factory=list)
+    result: Optional[Dict] = None
+    created_at: float = field(default_factory=time.monotonic)  # 페이지별 전체 처리 시간 측정용
+
+
+class _FetchQueue(asyncio.PriorityQueue):
+    """
+    깊이가 얕은 작업부터 꺼내는 fetch 큐 (같은 깊이는 투입 순서)
+    → 최신순 목록의 앞쪽 페이지와 그 상세 페이지를 뒤쪽 페이지보다 먼저 처리
+    """
+
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self._order = itertools.count()
+
+    def _put(self, job: "CrawlJob"):
+        heapq.heappush(self._queue, (job.depth, next(self._order), job))
+
+    def _get(self) -> "CrawlJob":
+        return heapq.heappop(self._queue)[-1]
+
+
+@dataclass
+class PipelineStats:
+    """파이프라인 실행 통계"""
+    list_pages: int = 0
+    list_failed: int = 0
+    next_pages: int = 0
+    pagination_stopped: int = 0
+    detail_found: int = 0
+    skipped_existing: int = 0
+    unchanged_sources: int = 0
+    fetch_failed: int = 0
+    llm_failed: int = 0
+    not_environmental: int = 0
+    budget_skipped: int = 0
+    known_non_environmental: int = 0
+    resumed: int = 0
+    processed: int = 0
+    submitted: int = 0
+    errors: int = 0
+    first_fetch_seconds: Optional[float] = None  # 실행 시작 후 첫 페이지 수집 완료까지
+    found_by_source: Dict[str, int] = field(default_factory=dict)
+
+
+class CrawlPipeline:
+    """
+    단계별 독립 동시성을 가진 스트리밍 파이프라인
+    - fetch: 정적 HTTP 또는 브라우저로 HTML 수집 (목록/상세 공통)
+    - extract: 목록 → 상세 URL 수집 후 즉시 fetch 큐에 투입 / 상세 → LLM 분석
+    - persist: CampaignWriter에 결과 전달 (실제 DB 쓰기는 writer 스레드에서 배치 처리)
+    - fingerprints가 있으면 변경 없는 목록 페이지는 렌더링(HTTP 304) 또는 LLM 추출 생략
+    - detail_batch_size > 1이면 상세 페이지를 잠시 모아 한 번의 LLM 호출로 추출
+      (batch_wait초 안에 모인 만큼만 묶으므로 마지막 몇 페이지가 오래 기다리지 않음)
+    - LLM 토큰 예산이 소진되면 우선순위가 낮은 상세 페이지 작업(새 투입/수집/분석)을 중단
+      (목록 페이지는 계속 처리 → URL은 change_detection에 기록되어 다음 실행에서 이어서 처리)
+    - 목록 페이지의 다음 페이지/더보기 링크를 사이트별 max_depth까지 따라감
+      (fetch 큐는 깊이 우선순위, 목록의 캠페인이 모두 이미 아는 URL이면 더 깊이 가지 않음)
+    - state가 있으면 URL별 상태를 체크포인트로 기록하고, 중단된 실행이면 남은 작업부터 이어서 처리
+      (처리한 목록은 다시 렌더링하지 않음, TTL 안에 환경 캠페인 아님으로 판정된 상세는 건너뜀)
+    - work가 있으면 워커 모드: 새 URL은 공유 작업 테이블에 추가하고, 처리할 URL은 테이블에서 lease로 가져옴
+      (여러 프로세스/머신이 같은 run_id로 나눠 처리, 테이블에 남은 작업이 없을 때 종료)
+    - existing_ready가 있으면 기존 URL 동기화와 동시에 시작하고, 상세 URL 투입 직전에만 동기화 완료를 기다림
+    - extract/persist 큐는 크기 제한으로 backpressure 적용
+      (fetch 큐는 URL만 담으므로 제한 없음 → 단계 간 순환 대기 방지)
+    """
+
+    def __init__(
+        self,
+        fetcher: TieredFetcher,
+        llm: LLMService,
+        site_settings: SiteSettings,
+        existing_urls: Set[str],
+        writer: CampaignWriter,
+        normalize_url: Callable[[str], str],
+        fetch_concurrency: int = 4,
+        extract_concurrency: int = 4,
+        persist_concurrency: int = 1,
+        queue_size: int = 8,
+        fingerprints: Optional[SourceFingerprintStore] = None,
+        force_refresh: bool = False,
+        detail_batch_size: int = 1,
+        detail_batch_wait: float = 2.0,
+        state: Optional[CrawlStateStore] = None,
+        work: Optional[WorkQueue] = None,
+        existing_ready: Optional[Awaitable] = None,
+    ):
+        self.fetcher = fetcher
+        self.llm = llm
+        self.site_settings = site_settings
+        self.existing_urls = existing_urls
+        self.writer = writer
+        self.normalize_url = normalize_url
+        self.fetch_concurrency = fetch_concurrency
+        self.extract_concurrency = extract_concurrency
+        self.persist_concurrency = persist_concurrency
+        self.queue_size = queue_size
+        self.fingerprints = fingerprints
+        self.force_refresh = force_refresh
+        self.detail_batch_size = detail_batch_size
+        self.detail_batch_wait = detail_batch_wait
+        self.state = state
+        self.work = work
+        # 기존 URL 동기화가 끝날 때까지 상세 URL 투입만 대기 (목록 수집/추출은 먼저 진행)
+        self.existing_ready = existing_ready
+
+        self.stats = PipelineStats()
+        self._seen: Set[str] = set()
+        self._pending = 0
+        self._done = asyncio.Event()
+        self._fetch_q: asyncio.Queue = None
+        self._extract_q: asyncio.Queue = None
+        self._persist_q: asyncio.Queue = None
+        self._detail_q: asyncio.Queue = None
+        self._batch_lock: asyncio.Lock = None
+        self._work_outbox: List[WorkItem] = []  # 공유 테이블에 추가할 URL
+        self._work_done: List[str] = []  # 공유 테이블에 완료로 표시할 URL
+        # writer에 넘긴 뒤 저장을 기다리는 URL (저장되어야 완료 표시 → 그 전에 워커가 죽으면 lease 만료로 회수)
+        self._work_saving: Set[str] = set()
+        self._work_release: List[str] = []  # 저장 실패로 다른 워커가 다시 가져가도록 되돌릴 URL
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._started = 0.0
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict], **kwargs) -> "CrawlPipeline":
+        """sites.yaml의 settings.pipeline / settings.llm_batch 섹션으로 생성"""
+        options = dict((settings or {}).get("pipeline") or {})
+        batch = (settings or {}).get("llm_batch") or {}
+        if batch.get("enabled"):
+            options["detail_batch_size"] = batch.get("max_docs", 4)
+            options["detail_batch_wait"] = batch.get("max_wait_seconds", 2.0)
+        return cls(**kwargs, **options)
+
+    @property
+    def batching(self) -> bool:
+        return self.detail_batch_size > 1
+
+    def _over_budget(self, job: CrawlJob) -> bool:
+        """토큰 예산 소진 시 상세 작업 건너뛰기"""
+        if job.kind == DETAIL and self.llm.usage.exhausted:
+            self.stats.budget_skipped += 1
+            metrics.count(DETAIL, "skip_budget", job.url)
+            return True
+        return False
+
+    def _mark(self, job: CrawlJob, status: str, result: Optional[Dict] = None):
+        """체크포인트에 작업 상태 기록"""
+        if self.state:
+            self.state.mark(job.url, job.kind, status, source=job.source, result=result, depth=job.depth)
+
+    # ------------------------------------------------------------------
+    # 작업 수명 관리
+    # ------------------------------------------------------------------
+
+    def _enqueue_fetch(self, job: CrawlJob):
+        if self.work:
+            # 워커 모드: 공유 테이블에 추가 → 어느 워커든 _work_loop에서 가져가 처리
+            self._work_outbox.append(WorkItem(url=job.url, kind=job.kind, source=job.source, depth=job.depth))
+            return
+        self._pending += 1
+        self._fetch_q.put_nowait(job)
+
+    def _finish(self, job: CrawlJob):
+        """작업 종료 처리 (모든 작업이 끝나면 완료 이벤트 설정)"""
+        job.html = ""
+        job.candidates = None
+        metrics.observe(f"{job.kind}_page", time.monotonic() - job.created_at, job.url)
+        self.stats.processed += 1
+        self._pending -= 1
+        if self.work:
+            # 워커 모드의 종료 판단은 _work_loop (다른 워커가 아직 URL을 추가할 수 있음)
+            # 저장할 결과가 있는 URL은 writer가 저장을 마친 뒤(on_saved) 완료 표시
+            if job.url not in self._work_saving:
+                self._work_done.append(job.url)
+        elif self._pending == 0:
+            self._done.set()
+
+    def on_saved(self, keys: List[str]):
+        """CampaignWriter.on_written 콜백 (writer 스레드): 저장된 URL을 공유 테이블에 완료로 표시"""
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._settle_saving, keys, True)
+
+    def on_save_failed(self, keys: List[str]):
+        """CampaignWriter.on_failed 콜백 (writer 스레드): 저장 실패한 URL을 다시 가져갈 수 있게 되돌림"""
+        if self._loop:
+            self._loop.call_soon_threadsafe(self._settle_saving, keys, False)
+
+    def _settle_saving(self, keys: List[str], saved: bool):
+        urls = [url for url in keys if url in self._work_saving]
+        self._work_saving.difference_update(urls)
+        (self._work_done if saved else self._work_release).extend(urls)
+
+    async def _work_loop(self):
+        """
+        워커 모드: 추가/완료할 URL을 공유 테이블에 반영하고, 로컬에 여유가 있으면 새 URL을 가져옴
+        (이 워커와 공유 테이블 모두에 남은 작업이 없으면 종료)
+        """
+        capacity = self.fetch_concurrency * 2
+        while True:
+            try:
+                # 반영에 실패하면 목록에 되돌려 다음 반복에서 재시도 (add/complete 모두 중복 반영해도 안전)
+                if self._work_outbox:
+                    items, self._work_outbox = self._work_outbox, []
+                    try:
+                        await asyncio.to_thread(self.work.add, items)
+                    except Exception:
+                        self._work_outbox[:0] = items
+                        raise
+                if self._work_done:
+                    urls, self._work_done = self._work_done, []
+                    try:
+                        await asyncio.to_thread(self.work.complete, urls)
+                    except Exception:
+                        self._work_done[:0] = urls
+                        raise
+                if self._work_release:
+                    urls, self._work_release = self._work_release, []
+                    try:
+                        await asyncio.to_thread(self.work.release, urls)
+                    except Exception:
+                        self._work_release[:0] = urls
+                        raise
+
+                claimed = []
+                if self._pending < capacity:
+                    claimed = await asyncio.to_thread(self.work.claim, capacity - self._pending)
+                for item in claimed:
+                    self._seen.add(item.url)
+                    self._pending += 1
+                    self._fetch_q.put_nowait(CrawlJob(url=item.url, kind=item.kind, source=item.source, depth=item.depth))
+
+                if not claimed:
+                    idle = (
+                        self._pending == 0 and not self._work_outbox and not self._work_done
+                        and not self._work_saving and not self._work_release
+                    )
+                    if idle and not await asyncio.to_thread(self.work.has_unfinished):
+                        self._done.set()
+                        return
+                    await asyncio.sleep(self.work.poll_seconds)
+            except Exception as e:
+                print(f"  [ERROR] 작업 테이블 처리 실패: {e}")
+                self.stats.errors += 1
+                await asyncio.sleep(self.work.poll_seconds)
+
+    async def _heartbeat_loop(self):
+        """워커 모드: 가져간 URL의 lease 연장 (워커가 죽으면 연장이 멈춰 다른 워커가 회수)"""
+        while True:
+            await asyncio.sleep(self.work.heartbeat_seconds)
+            try:
+                await asyncio.to_thread(self.work.heartbeat)
+            except Exception as e:
+                print(f"  [WARN] lease 연장 실패: {e}")
+
+    async def _worker(self, name: str, queue: asyncio.Queue, handler):
+        """큐에서 작업을 꺼내 handler 실행 (handler는 다음 단계로 넘기거나 종료 처리)"""
+        while True:
+            job = await queue.get()
+            try:
+                forwarded = await handler(job)
+            except Exception as e:
+                print(f"  [ERROR] {name} 단계 처리 실패: {job.url} ({e})")
+                self.stats.errors += 1
+                forwarded = False
+            finally:
+                queue.task_done()
+            if not forwarded:
+                self._finish(job)
+
+    async def _batch_worker(self):
+        """
+        상세 작업을 최대 detail_batch_size개 또는 detail_batch_wait초 동안 모아 한 번에 추출
+        (수집은 한 워커씩 차례로 → 배치가 잘게 나뉘지 않고, LLM 호출은 워커끼리 병렬)
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            async with self._batch_lock:
+                jobs = [await self._detail_q.get()]
+                deadline = loop.time() + self.detail_batch_wait
+                while len(jobs) < self.detail_batch_size:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        jobs.append(await asyncio.wait_for(self._detail_q.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+            if self.llm.usage.exhausted:
+                for job in jobs:
+                    self.stats.budget_skipped += 1
+                    metrics.count(DETAIL, "skip_budget", job.url)
+                    self._detail_q.task_done()
+                    self._finish(job)
+                continue
+
+            try:
+                results = await self.llm.extract_campaign_details_batch(
+                    [(job.url, job.html) for job in jobs],
+                    sources={job.url: job.source for job in jobs},
+                    reduced={job.url for job in jobs if job.reduced},
+                )
+            except Exception as e:
+                print(f"  [ERROR] extract 단계 배치 처리 실패: {len(jobs)}개 ({e})")
+                self.stats.errors += 1
+                results = None
+
+            for job in jobs:
+                forwarded = False
+                try:
+                    if results is not None:
+                        forwarded = await self._handle_detail_result(job, results.get(job.url))
+                except Exception as e:
+                    print(f"  [ERROR] extract 단계 처리 실패: {job.url} ({e})")
+                    self.stats.errors += 1
+                finally:
+                    self._detail_q.task_done()
+                if not forwarded:
+                    self._finish(job)
+
+    # ------------------------------------------------------------------
+    # 단계별 처리 (True 반환 = 다음 단계로 전달됨)
+    # ------------------------------------------------------------------
+
+    async def _fetch(self, job: CrawlJob) -> bool:
+        if self._over_budget(job):
+            return False
+        if job.kind == LIST:
+            print(f"  접속 중: {job.url}")
+        else:
+            print(f"  [START] 상세 분석: {job.url}")
+
+        validators = None
+        if job.kind == LIST and self.fingerprints and not self.force_refresh:
+            previous = self.fingerprints.get(job.url) or {}
+            # 브라우저로 렌더링한 페이지는 HTML 껍데기가 같아도 내용이 바뀔 수 있으므로 제외
+            if previous.get("tier") == "http" and "campaign_urls" in previous:
+                validators = previous
+
+        fetched = await self.fetcher.get_page(job.url, kind=job.kind, validators=validators)
+        if self.stats.first_fetch_seconds is None:
+            self.stats.first_fetch_seconds = time.monotonic() - self._started
+        if fetched.not_modified:
+            print(f"  -> 변경 없음 (HTTP 304), 렌더링 생략: {job.url}")
+            metrics.count(LIST, "skip_unchanged", job.url)
+            await self._wait_existing()
+            self._reuse_unchanged_source(job)
+            return False
+
+        if job.kind == LIST and self.fingerprints:
+            self.fingerprints.update_validators(job.url, fetched.etag, fetched.last_modified)
+            self.fingerprints.get(job.url)["tier"] = fetched.tier
+
+        job.html = fetched.html
+        job.reduced = fetched.reduced
+        job.candidates, job.unresolved = fetched.candidates, fetched.unresolved
+        if not job.html:
+            # 수집기에서 이미 에러 메시지 출력됨
+            if job.kind == LIST:
+                print(f"  -> 접속 실패: {job.url}")
+                self.stats.list_failed += 1
+            else:
+                self.stats.fetch_failed += 1
+            metrics.count(job.kind, "fail_fetch", job.url)
+            self._mark(job, FAILED)
+            return False
+
+        self._mark(job, FETCHED)
+
+        if job.kind == DETAIL and self.batching:
+            await self._detail_q.put(job)
+        else:
+            await self._extract_q.put(job)
+        return True
+
+    async def _extract(self, job: CrawlJob) -> bool:
+        if job.kind == LIST:
+            await self._extract_list(job)
+            return False
+
+        if self._over_budget(job):
+            return False
+        result = await self.llm.extract_campaign_detail(job.html, job.url, source=job.source, reduced=job.reduced)
+        return await self._handle_detail_result(job, result)
+
+    async def _handle_detail_result(self, job: CrawlJob, result: Optional[Dict]) -> bool:
+        """상세 추출 결과 확인 후 persist 큐에 전달"""
+        job.html = ""
+        if not result:
+            print(f"  [FAIL] LLM 분석 실패: {job.url}")
+            self.stats.llm_failed += 1
+            metrics.count(DETAIL, "fail_llm", job.url)
+            self._mark(job, FAILED)
+            return False
+
+        if not result.get("is_environmental_campaign"):
+            print(f"  [SKIP] 환경 캠페인 아님: {job.url}")
+            self.stats.not_environmental += 1
+            metrics.count(DETAIL, "skip_not_environmental", job.url)
+            self._mark(job, SKIPPED)
+            return False
+
+        job.result = result
+        self._mark(job, EXTRACTED, result=result)
+        self.stats.submitted += 1
+        metrics.count(DETAIL, "success", job.url)
+        await self._persist_q.put(job)
+        return True
+
+    async def _extract_list(self, job: CrawlJob):
+        """목록 페이지 → 상세 URL 수집 후 즉시 fetch 큐에 투입"""
+        self.stats.list_pages += 1
+        print(f"  [DEBUG] HTML Length: {len(job.html)}")
+        site = self.site_settings.for_url(job.url)
+        # 후보 링크는 html 모드에서도 다음 페이지 탐색에 사용
+        if job.candidates is not None:
+            # 브라우저 워커에서 원본 HTML로 미리 수집함
+            candidates, unresolved = job.candidates, job.unresolved
+        else:
+            candidates, unresolved = collect_links(job.html, job.url, site.get("link_templates"))
+        unchanged, extracted = await self._collect_campaign_urls(
+            job.html, job.url, candidates, unresolved, reduced=job.reduced
+        )
+        if unchanged:
+            metrics.count(LIST, "skip_unchanged", job.url)
+            await self._wait_existing()
+            self._reuse_unchanged_source(job, candidates)
+            return
+        if extracted is None:
+            # LLM 호출/응답 실패: 다음 실행(또는 재개)에서 다시 시도
+            metrics.count(LIST, "fail_llm", job.url)
+            self._mark(job, FAILED)
+            return
+        # 빈 리스트도 정상 추출 (환경 캠페인이 없는 목록 페이지)
+        metrics.count(LIST, "success", job.url)
+        await self._wait_existing()
+        new_count = self._enqueue_details(job, [self.normalize_url(u) for u in extracted])
+        self._mark(job, EXTRACTED)
+        self._follow_pages(job, candidates, new_count)
+
+    async def _wait_existing(self):
+        """기존 URL 동기화 완료 대기 (중복 확인 전에 호출)"""
+        if self.existing_ready is not None:
+            await self.existing_ready
+            self.existing_ready = None
+
+    def _reuse_unchanged_source(self, job: CrawlJob, candidates: List[LinkCandidate] = ()):
+        """변경 없는 목록: 이전 실행에서 추출한 URL 중 아직 저장되지 않은 것만 다시 투입"""
+        self.stats.unchanged_sources += 1
+        self.fingerprints.mark_checked(job.url)
+        previous = self.fingerprints.get(job.url).get("campaign_urls", [])
+        new_count = self._enqueue_details(job, [self.normalize_url(u) for u in previous])
+        self._mark(job, EXTRACTED)
+        # HTTP 304면 후보 링크가 없으므로 다음 페이지도 따라가지 않음
+        self._follow_pages(job, candidates, new_count)
+
+    def _follow_pages(self, job: CrawlJob, candidates: List[LinkCandidate], new_count: int):
+        """
+        다음 페이지/더보기 링크를 사이트별 max_depth까지 fetch 큐에 투입
+        (이 목록에 새 캠페인이 하나도 없으면 더 오래된 페이지에도 없다고 보고 멈춤)
+        """
+        site = self.site_settings.for_url(job.url)
+        if not candidates or job.depth >= (site.get("max_depth") or 0):
+            return
+        pagination = site.get("pagination") or {}
+        pages = find_next_pages(
+            candidates,
+            job.url,
+            page_param=pagination.get("page_param"),
+            follow_more_links=pagination.get("follow_more_links", True),
+        )
+        if not pages:
+            return
+        if new_count == 0:
+            print(f"  -> 새 캠페인이 없어 다음 페이지 탐색 중단: {job.url}")
+            self.stats.pagination_stopped += 1
+            metrics.count(LIST, "stop_all_known", job.url)
+            return
+
+        for url in pages:
+            if url in self._seen:
+                continue
+            self._seen.add(url)
+            page = CrawlJob(url=url, kind=LIST, source=url, depth=job.depth + 1)
+            self._mark(page, PENDING)
+            self._enqueue_fetch(page)
+            self.stats.next_pages += 1
+            print(f"  -> 다음 목록 (깊이 {page.depth}): {url}")
+
+    def _enqueue_details(self, job: CrawlJob, extracted: List[str]) -> int:
+        """상세 URL 중복/기존 여부 확인 후 fetch 큐에 투입 (새로 투입한 수 반환)"""
+        new_count = 0
+        for url in extracted:
+            if url in self._seen:
+                continue
+            self._seen.add(url)
+            if url in self.existing_urls:
+                self.stats.skipped_existing += 1
+                metrics.count(DETAIL, "skip_existing", url)
+                continue
+            if self.state and self.state.is_known_non_environmental(url):
+                self.stats.known_non_environmental += 1
+                metrics.count(DETAIL, "skip_known_not_environmental", url)
+                continue
+            if self.llm.usage.exhausted:
+                self.stats.budget_skipped += 1
+                metrics.count(DETAIL, "skip_budget", url)
+                continue
+            new_count += 1
+            detail = CrawlJob(url=url, kind=DETAIL, source=job.url, depth=job.depth)
+            self._mark(detail, PENDING)
+            self._enqueue_fetch(detail)
+
+        self.stats.detail_found += new_count
+        self.stats.found_by_source[job.url] = len(extracted)
+        print(f"  -> 발견된 URL: {len(extracted)}개 (신규 {new_count}개): {job.url}")
+        return new_count
+
+    async def _collect_campaign_urls(
+        self,
+        html: str,
+        list_url: str,
+        candidates: List[LinkCandidate],
+        unresolved: List[str] = (),
+        reduced: bool = False,
+    ) -> Tuple[bool, Optional[List[str]]]:
+        """
+        목록 페이지에서 상세 페이지 URL 수집
+        - candidates 모드: DOM에서 후보 링크를 결정적으로 수집하고 LLM은 분류만 수행
+        - html 모드, 후보가 없을 때, 또는 URL로 변환하지 못한 javascript: 링크가 있을 때:
+          기존 방식대로 HTML 전체를 LLM에 전달 (link_templates 미설정 사이트에서 상세 링크 누락 방지)
+
+        Returns:
+            (링크 집합이 이전과 같아 추출을 생략했는지, 상세 URL 리스트 - LLM 실패 시 None)
+        """
+        site = self.site_settings.for_url(list_url)
+        if site.get("list_extraction", "candidates") == "candidates":
+            print(f"  [DEBUG] 후보 링크: {len(candidates)}개")
+            if unresolved:
+                print(
+                    f"  [WARN] URL로 변환하지 못한 javascript 링크 {len(unresolved)}개"
+                    f" (예: {unresolved[0][:80]}) → HTML 전체 분석으로 전환 (link_templates 설정 권장)"
+                )
+                candidates = []
+        else:
+            candidates = []
+
+        # 변환하지 못한 링크는 후보 집합에 없으므로 HTML 전체 해시로 변경 여부 판단
+        fingerprint = link_set_hash(c.url for c in candidates) if candidates else html_hash(html)
+        if self.fingerprints and not self.force_refresh and self.fingerprints.is_unchanged(list_url, fingerprint):
+            print(f"  -> 링크 변경 없음, LLM 추출 생략: {list_url}")
+            return True, None
+
+        if candidates:
+            urls = await self.llm.classify_campaign_links(candidates, list_url)
+        else:
+            if site.get("list_extraction", "candidates") == "candidates" and not unresolved:
+                print("  [WARN] 후보 링크가 없어 HTML 전체 분석으로 전환")
+            urls = await self.llm.extract_campaign_urls(html, list_url, reduced=reduced)
+
+        # 추출 실패(None)는 기록하지 않음 → 다음 실행에서 다시 시도 (빈 결과는 정상 추출로 기록)
+        if self.fingerprints and urls is not None:
+            self.fingerprints.record(list_url, fingerprint, urls)
+        return False, urls
+
+    async def _persist(self, job: CrawlJob) -> bool:
+        # 재개/워커 모드에서 받은 상세 작업도 기존 URL 동기화가 끝난 뒤 저장 (같은 Supabase 클라이언트를 동시에 쓰지 않음)
+        await self._wait_existing()
+        if self.work:
+            self._work_saving.add(job.url)
+        # 이벤트 루프를 막지 않도록 writer 스레드에 넘기고 바로 반환
+        await self.writer.submit(job.result, key=job.url)
+        job.result = None
+        return False
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+
+    async def run(self, list_urls: List[str]) -> PipelineStats:
+        """목록 URL로 파이프라인 실행 후 통계 반환"""
+        if not list_urls:
+            return self.stats
+
+        self._fetch_q = _FetchQueue()
+        self._extract_q = asyncio.Queue(maxsize=self.queue_size)
+        self._persist_q = asyncio.Queue(maxsize=self.queue_size)
+        # 배치 모드: 한 번에 모을 수 있도록 배치 크기만큼 여유를 둠
+        self._detail_q = asyncio.Queue(maxsize=max(self.queue_size, self.detail_batch_size))
+        self._batch_lock = asyncio.Lock()
+        self._done.clear()
+        self._started = time.monotonic()
+        self._loop = asyncio.get_running_loop()
+
+        workers = []
+        for i in range(self.fetch_concurrency):
+            workers.append(asyncio.create_task(self._worker("fetch", self._fetch_q, self._fetch), name=f"fetch-{i}"))
+        for i in range(self.extract_concurrency):
+            workers.append(asyncio.create_task(self._worker("extract", self._extract_q, self._extract), name=f"extract-{i}"))
+            if self.batching:
+                workers.append(asyncio.create_task(self._batch_worker(), name=f"extract-batch-{i}"))
+        for i in range(self.persist_concurrency):
+            workers.append(asyncio.create_task(self._worker("persist", self._persist_q, self._persist), name=f"persist-{i}"))
+        if self.work:
+            workers.append(asyncio.create_task(self._work_loop(), name="work-queue"))
+            workers.append(asyncio.create_task(self._heartbeat_loop(), name="work-heartbeat"))
+
+        # 중단된 실행 재개: 처리한 목록은 건너뛰고 남은 상세 수집/분석과 저장 대기 결과부터 처리
+        checkpoint = self.state.checkpoint() if self.state else Checkpoint()
+        self._seen.update(checkpoint.known)
+        for url in list_urls:
+            self._seen.add(url)
+            if url in checkpoint.completed_lists:
+                continue
+            job = CrawlJob(url=url, kind=LIST, source=url)
+            self._mark(job, PENDING)
+            self._enqueue_fetch(job)
+        for url, depth in checkpoint.lists:
+            self._enqueue_fetch(CrawlJob(url=url, kind=LIST, source=url, depth=depth))
+        for url, source, depth in checkpoint.details:
+            self._enqueue_fetch(CrawlJob(url=url, kind=DETAIL, source=source, depth=depth))
+        self.stats.resumed = len(checkpoint.lists) + len(checkpoint.details) + len(checkpoint.unsaved)
+        for url, source, result in checkpoint.unsaved:
+            self._pending += 1
+            self.stats.submitted += 1
+            await self._persist_q.put(CrawlJob(url=url, kind=DETAIL, source=source, result=result))
+        if self._pending == 0 and not self.work:
+            self._done.set()
+
+        try:
+            await self._done.wait()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        return self.stats
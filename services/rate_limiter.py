@@ -0,0 +1,149 @@
+"""도메인별 요청 간격 제어 (토큰 버킷 스케줄러)"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from services.metrics import metrics
+from services.site_settings import SiteSettings
+
+# 차단/과부하 신호로 간주하는 HTTP 상태 코드
+THROTTLE_STATUSES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+@dataclass
+class _DomainBucket:
+    """도메인 하나의 토큰 버킷 상태"""
+    rate: float  # 초당 토큰 (1 / request_delay_seconds)
+    capacity: float  # 최대 연속 요청 수 (burst)
+    tokens: float
+    updated_at: float
+    blocked_until: float = 0.0
+    throttle_streak: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    # 통계
+    requests: int = 0
+    throttled: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def refill(self, now: float):
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        else:
+            self.tokens = self.capacity
+        self.updated_at = now
+
+
+class DomainScheduler:
+    """
+    도메인별 토큰 버킷 스케줄러
+    - request_delay_seconds 간격으로 도메인당 요청 허용 (sites.<host>로 사이트별 덮어쓰기)
+    - 서로 다른 도메인은 완전히 병렬로 진행
+    - 429/503 응답 시 Retry-After(없으면 지수 백오프)만큼 해당 도메인 일시 정지
+    - 도메인별 대기 시간 집계
+    """
+
+    def __init__(self, site_settings: SiteSettings, default_delay: float = 3.0, max_backoff: float = 300.0):
+        self.site_settings = site_settings
+        self.default_delay = default_delay
+        self.max_backoff = max_backoff
+        self._buckets: Dict[str, _DomainBucket] = {}
+
+    def _bucket(self, url: str) -> _DomainBucket:
+        host = SiteSettings.host_of(url)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            delay = float(self.site_settings.get(url, "request_delay_seconds", self.default_delay) or 0)
+            burst = float(self.site_settings.get(url, "request_burst", 1) or 1)
+            bucket = _DomainBucket(
+                rate=1.0 / delay if delay > 0 else 0.0,
+                capacity=burst,
+                tokens=burst,
+                updated_at=time.monotonic(),
+            )
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str) -> float:
+        """
+        요청 허가 대기
+
+        Returns:
+            대기한 시간 (초)
+        """
+        bucket = self._bucket(url)
+        started = time.monotonic()
+
+        # 도메인별 lock으로 대기 순서 보장 (다른 도메인에는 영향 없음)
+        async with bucket.lock:
+            while True:
+                now = time.monotonic()
+                bucket.refill(now)
+                if now < bucket.blocked_until:
+                    await asyncio.sleep(bucket.blocked_until - now)
+                    continue
+                if bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    break
+                await asyncio.sleep((1 - bucket.tokens) / bucket.rate)
+
+        waited = time.monotonic() - started
+        bucket.requests += 1
+        bucket.total_wait += waited
+        bucket.max_wait = max(bucket.max_wait, waited)
+        metrics.observe("rate_limit_wait", waited, url)
+        return waited
+
+    def report_response(self, url: str, status: Optional[int], retry_after: Optional[str] = None) -> bool:
+        """
+        응답 상태 반영
+
+        Returns:
+            차단/과부하 응답이면 True (호출 측에서 재시도 판단)
+        """
+        bucket = self._bucket(url)
+        if status not in THROTTLE_STATUSES:
+            bucket.throttle_streak = 0
+            return False
+
+        bucket.throttled += 1
+        bucket.throttle_streak += 1
+        wait = parse_retry_after(retry_after)
+        if wait is None:
+            base = 1.0 / bucket.rate if bucket.rate else 1.0
+            wait = base * (2 ** bucket.throttle_streak)
+        wait = min(wait, self.max_backoff)
+        bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + wait)
+        print(f"[Scheduler] {status} 응답, {SiteSettings.host_of(url)} {wait:.0f}초 대기")
+        return True
+
+    def report(self) -> List[str]:
+        """도메인별 요청 수 / 대기 시간 요약"""
+        lines = []
+        for host, b in sorted(self._buckets.items()):
+            avg = b.total_wait / b.requests if b.requests else 0.0
+            lines.append(
+                f"{host}: 요청 {b.requests}, 대기 평균 {avg:.1f}초 / 최대 {b.max_wait:.1f}초 / "
+                f"합계 {b.total_wait:.1f}초, 차단 응답 {b.throttled}"
+            )
+        return lines
@@ -0,0 +1,66 @@
+"""사이트별 설정 조회 (settings 기본값 + sites.<host> 덮어쓰기)"""
+
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from services.page_readiness import READINESS_STRATEGIES
+
+
+class SiteSettings:
+    """
+    sites.yaml 설정 래퍼
+    - settings: 전체 기본값
+    - sites: 호스트별 덮어쓰기 (예: "www.1365.go.kr": {...})
+    - 하위 딕셔너리는 한 단계까지 병합
+    - readiness.strategy 오타는 조용히 scroll로 대체되지 않도록 로드 시 거부
+    """
+
+    def __init__(self, config: Optional[Dict]):
+        config = config or {}
+        self.defaults: Dict[str, Any] = config.get("settings") or {}
+        self.sites: Dict[str, Dict] = config.get("sites") or {}
+        self._cache: Dict[str, Dict] = {}
+        self._validate()
+
+    def _validate(self):
+        """알 수 없는 readiness 전략이면 ValueError"""
+        scopes = [("settings", self.defaults)] + [(f"sites.{host}", site or {}) for host, site in self.sites.items()]
+        for scope, values in scopes:
+            strategy = (values.get("readiness") or {}).get("strategy")
+            if strategy is not None and strategy not in READINESS_STRATEGIES:
+                raise ValueError(
+                    f"{scope}.readiness.strategy '{strategy}'는 지원하지 않는 전략입니다. "
+                    f"({' | '.join(READINESS_STRATEGIES)} 중 하나)"
+                )
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """URL의 호스트명 (소문자)"""
+        return (urlparse(url).hostname or "").lower()
+
+    def _overrides_for(self, host: str) -> Dict:
+        if host in self.sites:
+            return self.sites[host] or {}
+        # www. 유무가 다르게 적힌 경우도 허용
+        alt = host[4:] if host.startswith("www.") else f"www.{host}"
+        return self.sites.get(alt) or {}
+
+    def for_url(self, url: str) -> Dict[str, Any]:
+        """URL이 속한 사이트의 최종 설정"""
+        host = self.host_of(url)
+        if host in self._cache:
+            return self._cache[host]
+
+        merged = dict(self.defaults)
+        for key, value in self._overrides_for(host).items():
+            if isinstance(value, dict) and isinstance(merged.get(key), dict):
+                merged[key] = {**merged[key], **value}
+            else:
+                merged[key] = value
+
+        self._cache[host] = merged
+        return merged
+
+    def get(self, url: str, key: str, default: Any = None) -> Any:
+        """사이트별 설정값 하나 조회"""
+        return self.for_url(url).get(key, default)
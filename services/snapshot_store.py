@@ -0,0 +1,245 @@
+"""수집한 HTML 스냅샷 보관소 (콘텐츠 주소 기반 압축 저장 + 아카이브 재생 수집기)"""
+
+import asyncio
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from services.http_fetcher import FetchResult
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 gzip 사용
+    zstandard = None
+
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+@dataclass
+class Snapshot:
+    """수집 기록 1건 (WARC response 레코드에 해당하는 메타데이터)"""
+    url: str
+    kind: str
+    status: int
+    tier: str
+    fetched_at: float
+    digest: str
+    encoding: str
+
+
+class SnapshotStore:
+    """
+    수집한 최종 HTML을 보관하여 재수집 없이 추출만 다시 실행할 수 있게 하는 저장소
+    - 본문: SHA-256 다이제스트 경로(objects/ab/cdef...)에 압축 저장 → 같은 HTML은 한 번만 저장
+    - 기록: SQLite에 URL / 종류 / 상태 코드 / 수집 단계 / 수집 시각 / 다이제스트 (수집할 때마다 1행)
+    - 압축: gzip(기본) 또는 zstd(zstandard 패키지가 있을 때)
+    - retention_days보다 오래된 기록과 더 이상 참조되지 않는 본문은 prune()에서 삭제
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ".cache/snapshots",
+        compression: str = "gzip",
+        retention_days: float = 7,
+        enabled: bool = True,
+    ):
+        self.root = Path(path)
+        if compression == "zstd" and zstandard is None:
+            print("[Snapshot] zstandard 패키지가 없어 gzip으로 압축합니다.")
+            compression = "gzip"
+        self.compression = compression if compression in _SUFFIXES else "gzip"
+        self.retention_days = retention_days
+        self.enabled = enabled
+
+        self.writes = 0
+        self.deduplicated = 0
+        self.raw_bytes = 0
+        self.stored_bytes = 0
+
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if self.enabled:
+            (self.root / "objects").mkdir(parents=True, exist_ok=True)
+            # --workers로 여러 프로세스가 같은 인덱스를 쓰므로 잠금 대기(timeout) + WAL
+            self._conn = sqlite3.connect(str(self.root / "index.sqlite"), timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    url TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    status INTEGER NOT NULL,
+                    tier TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    digest TEXT NOT NULL,
+                    encoding TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_url ON snapshots (url, fetched_at)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_snapshots_fetched ON snapshots (fetched_at)")
+            self._conn.commit()
+
+    @classmethod
+    def from_settings(cls, settings: Optional[Dict], project_root: Path) -> "SnapshotStore":
+        """sites.yaml의 settings.snapshot_archive 섹션으로 생성"""
+        options = dict((settings or {}).get("snapshot_archive") or {})
+        path = Path(options.pop("path", ".cache/snapshots"))
+        options.pop("replay_output", None)  # main.py --reextract-existing에서 사용
+        if not path.is_absolute():
+            path = project_root / path
+        return cls(path=path, **options)
+
+    def _object_path(self, digest: str, encoding: str) -> Path:
+        return self.root / "objects" / digest[:2] / f"{digest[2:]}{_SUFFIXES[encoding]}"
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(data: bytes, encoding: str) -> bytes:
+        if encoding == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstd로 저장된 스냅샷을 읽으려면 zstandard 패키지가 필요합니다.")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def put(self, url: str, html: str, status: int, kind: str, tier: str) -> Optional[str]:
+        """
+        스냅샷 저장 (압축/파일 쓰기가 있으므로 이벤트 루프에서는 asyncio.to_thread로 호출)
+
+        Returns:
+            본문 다이제스트 (비활성화 또는 빈 HTML이면 None)
+        """
+        if not self.enabled or not html:
+            return None
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest, self.compression)
+
+        if path.exists():
+            deduplicated, stored = True, 0
+        else:
+            compressed = self._compress(data)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(compressed)
+            tmp.replace(path)
+            deduplicated, stored = False, len(compressed)
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO snapshots (url, kind, status, tier, fetched_at, digest, encoding) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, kind, status, tier, time.time(), digest, self.compression),
+            )
+            self._conn.commit()
+            self.writes += 1
+            self.deduplicated += deduplicated
+            self.raw_bytes += len(data)
+            self.stored_bytes += stored
+        return digest
+
+    def latest(self, url: str, since: Optional[float] = None) -> Optional[Snapshot]:
+        """URL의 가장 최근 스냅샷 (since 이후 수집분만)"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, kind, status, tier, fetched_at, digest, encoding FROM snapshots "
+                "WHERE url = ? AND fetched_at >= ? ORDER BY fetched_at DESC LIMIT 1",
+                (url, since or 0),
+            ).fetchone()
+        return Snapshot(*row) if row else None
+
+    def read(self, snapshot: Snapshot) -> str:
+        """스냅샷 본문 HTML"""
+        data = self._object_path(snapshot.digest, snapshot.encoding).read_bytes()
+        return self._decompress(data, snapshot.encoding).decode("utf-8")
+
+    def prune(self) -> Tuple[int, int]:
+        """
+        보관 기간이 지난 기록 삭제 후 참조되지 않는 본문 파일 삭제
+
+        Returns:
+            (삭제한 기록 수, 삭제한 본문 파일 수)
+        """
+        if not self.enabled or not self.retention_days:
+            return 0, 0
+        cutoff = time.time() - self.retention_days * 86400
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM snapshots WHERE fetched_at < ?", (cutoff,)).rowcount
+            self._conn.commit()
+            referenced = {
+                (digest, encoding)
+                for digest, encoding in self._conn.execute("SELECT DISTINCT digest, encoding FROM snapshots")
+            }
+
+        files_removed = 0
+        if removed:
+            suffix_encoding = {suffix: encoding for encoding, suffix in _SUFFIXES.items()}
+            for path in (self.root / "objects").glob("*/*"):
+                encoding = suffix_encoding.get(path.suffix)
+                digest = path.parent.name + path.name[: -len(path.suffix)] if encoding else None
+                if encoding and (digest, encoding) not in referenced:
+                    path.unlink(missing_ok=True)
+                    files_removed += 1
+        return removed, files_removed
+
+    def report(self) -> str:
+        """이번 실행의 저장 통계"""
+        if not self.enabled:
+            return "비활성화"
+        ratio = self.stored_bytes / self.raw_bytes * 100 if self.raw_bytes else 0
+        return (
+            f"저장 {self.writes}건 (동일 본문 재사용 {self.deduplicated}건), "
+            f"원본 {self.raw_bytes / 1024 / 1024:.1f}MB → 새로 기록 {self.stored_bytes / 1024 / 1024:.1f}MB "
+            f"({ratio:.0f}%, {self.compression})"
+        )
+
+    def close(self):
+        """DB 연결 종료"""
+        if self._conn:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+class ArchiveFetcher:
+    """
+    SnapshotStore에서 HTML을 읽어 오는 수집기 (TieredFetcher 대신 파이프라인에 연결)
+    - 브라우저/네트워크 없이 보관된 페이지로 추출만 다시 실행
+    - since 이후 수집된 스냅샷 중 가장 최근 것을 사용, 없으면 수집 실패로 처리
+    """
+
+    def __init__(self, store: SnapshotStore, since: Optional[float] = None):
+        self.store = store
+        self.since = since
+        self.counts: Dict[str, int] = {"archive": 0, "missing": 0}
+
+    async def get_page(self, url: str, kind: str = "detail", validators: Optional[Dict] = None) -> FetchResult:
+        snapshot = await asyncio.to_thread(self.store.latest, url, self.since)
+        if snapshot is None:
+            print(f"[Archive] 스냅샷 없음: {url}")
+            self.counts["missing"] += 1
+            return FetchResult(tier="archive")
+        html = await asyncio.to_thread(self.store.read, snapshot)
+        self.counts["archive"] += 1
+        return FetchResult(html=html, status=snapshot.status, tier="archive")
+
+    async def get_page_content(self, url: str, kind: str = "detail") -> str:
+        """HTML만 반환하는 간편 버전"""
+        return (await self.get_page(url, kind)).html
+
+    def report(self) -> str:
+        return f"아카이브 {self.counts['archive']}건 재생, 스냅샷 없음 {self.counts['missing']}건"
+
+    async def close(self):
+        pass
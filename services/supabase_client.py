@@ -1,11 +1,21 @@
 """Supabase 클라이언트 - 캠페인 및 미션 템플릿 CRUD"""
 
 import os
-from typing import Optional, Set
-from supabase import create_client, Client
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set
 
 from models.campaign import CampaignData, MissionTemplateData
 
+if TYPE_CHECKING:
+    from supabase import Client
+
+# on_conflict 컬럼에 UNIQUE 제약이 없음 (PostgreSQL "there is no unique or exclusion constraint matching ...")
+_NO_UNIQUE_CONSTRAINT = "42P10"
+
+
+def _is_missing_unique_constraint(error: Exception) -> bool:
+    """upsert 대상 테이블에 on_conflict용 UNIQUE 제약이 없어서 실패했는지"""
+    return getattr(error, "code", None) == _NO_UNIQUE_CONSTRAINT or _NO_UNIQUE_CONSTRAINT in str(error)
+
 
 class SupabaseService:
     """Supabase 데이터베이스 연동 서비스"""
@@ -17,12 +27,38 @@ class SupabaseService:
         if not url or not key:
             raise ValueError("SUPABASE_URL과 SUPABASE_SERVICE_KEY 환경변수가 필요합니다.")
 
-        self.client: Client = create_client(url, key)
+        # supabase 패키지 import 비용은 클라이언트를 실제로 만들 때만 부담
+        from supabase import create_client
+
+        self.client: "Client" = create_client(url, key)
+        # campaigns.campaign_url에 UNIQUE 제약이 없으면 False로 바뀌고 행 단위 insert로 저장
+        self.campaign_upsert_supported = True
 
     def get_existing_urls(self) -> Set[str]:
-        """기존 캠페인 URL 목록 조회 (중복 체크용)"""
-        result = self.client.table("campaigns").select("campaign_url").execute()
-        return {row["campaign_url"] for row in result.data}
+        """기존 캠페인 URL 목록 조회 (중복 체크용, 페이지 단위로 전체 조회)"""
+        urls = set()
+        after_id = 0
+        while True:
+            rows = self.fetch_campaign_urls_after(after_id)
+            urls.update(row["campaign_url"] for row in rows)
+            if len(rows) < 1000:
+                return urls
+            after_id = rows[-1]["id"]
+
+    def fetch_campaign_urls_after(self, after_id: int, limit: int = 1000) -> List[dict]:
+        """
+        id 기준 keyset 페이지네이션 조회
+
+        Returns:
+            id > after_id인 행의 [{"id", "campaign_url"}] (id 오름차순, 최대 limit개)
+        """
+        result = self.client.table("campaigns") \
+            .select("id, campaign_url") \
+            .gt("id", after_id) \
+            .order("id") \
+            .limit(limit) \
+            .execute()
+        return result.data or []
 
     def campaign_exists(self, url: str) -> bool:
         """특정 URL의 캠페인이 이미 존재하는지 확인"""
@@ -73,3 +109,96 @@ class SupabaseService:
         except Exception as e:
             print(f"  [ERROR] 미션 템플릿 저장 실패: {e}")
             return None
+
+    # ------------------------------------------------------------------
+    # 일괄 저장
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _uniform_rows(rows: List[dict]) -> List[dict]:
+        """다중 행 INSERT는 모든 행의 키가 같아야 하므로 빠진 키를 None으로 채움"""
+        keys = []
+        for row in rows:
+            for key in row:
+                if key not in keys:
+                    keys.append(key)
+        return [{key: row.get(key) for key in keys} for row in rows]
+
+    def _write_isolated(
+        self,
+        rows: List[dict],
+        write: Callable[[List[dict]], list],
+        label: str,
+        fatal: Optional[Callable[[Exception], bool]] = None,
+    ) -> list:
+        """
+        일괄 쓰기 + 행 단위 오류 격리
+        - 배치 전체가 실패하면 절반씩 나눠 재시도하여 문제 행만 제외
+        - fatal(e)가 True인 오류(스키마 문제 등 모든 행이 실패할 오류)는 나누지 않고 그대로 raise
+        """
+        if not rows:
+            return []
+        try:
+            return write(self._uniform_rows(rows))
+        except Exception as e:
+            if fatal and fatal(e):
+                raise
+            if len(rows) == 1:
+                print(f"  [ERROR] {label} 저장 실패: {e}")
+                return []
+            mid = len(rows) // 2
+            return (
+                self._write_isolated(rows[:mid], write, label, fatal)
+                + self._write_isolated(rows[mid:], write, label, fatal)
+            )
+
+    def upsert_campaigns(self, campaigns: List[CampaignData]) -> Dict[str, int]:
+        """
+        캠페인 일괄 저장 (campaign_url 기준 upsert, 이미 있는 행은 무시)
+        - campaigns.campaign_url에 UNIQUE 제약이 없는 DB(42P10)면 한 번 안내 후 행 단위 insert_campaign으로 전환
+
+        Returns:
+            새로 저장된 캠페인의 {campaign_url: id}
+        """
+        def write(rows: List[dict]) -> list:
+            result = self.client.table("campaigns") \
+                .upsert(rows, on_conflict="campaign_url", ignore_duplicates=True) \
+                .execute()
+            return result.data or []
+
+        if self.campaign_upsert_supported:
+            try:
+                rows = self._write_isolated(
+                    [c.to_dict() for c in campaigns], write, "캠페인", fatal=_is_missing_unique_constraint
+                )
+                return {row["campaign_url"]: row["id"] for row in rows}
+            except Exception as e:
+                if not _is_missing_unique_constraint(e):
+                    raise
+                self.campaign_upsert_supported = False
+                print(
+                    "  [WARN] campaigns.campaign_url에 UNIQUE 제약이 없어 일괄 upsert를 쓸 수 없습니다. "
+                    "행 단위 저장으로 전환합니다 (README의 ALTER TABLE ... UNIQUE (campaign_url) 적용 권장)"
+                )
+
+        saved = {}
+        for campaign in campaigns:
+            campaign_id = self.insert_campaign(campaign)
+            if campaign_id is not None:
+                saved[campaign.campaign_url] = campaign_id
+        return saved
+
+    def insert_mission_templates(self, missions: List[MissionTemplateData]) -> int:
+        """
+        미션 템플릿 일괄 저장
+
+        Returns:
+            저장된 미션 템플릿 수
+        """
+        def write(rows: List[dict]) -> list:
+            result = self.client.table("mission_templates") \
+                .insert(rows) \
+                .execute()
+            return result.data or []
+
+        return len(self._write_isolated([m.to_dict() for m in missions], write, "미션 템플릿"))
@@ -0,0 +1,123 @@
+"""URL 정규화 (중복 제거용 canonical URL)"""
+
+import hashlib
+import json
+import re
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from services.site_settings import SiteSettings
+
+# 방문마다 달라지는 세션/추적 파라미터 (소문자 비교, utm_ 접두사는 별도 처리)
+DEFAULT_TRACKING_PARAMS = [
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid",
+    "mc_cid", "mc_eid", "_ga", "_gl", "ref_src",
+    "jsessionid", "phpsessid", "aspsessionid", "sessionid",
+]
+
+_PATH_SESSION_RE = re.compile(r";(?:jsessionid|phpsessid|sid)=[^/?#]*", re.IGNORECASE)
+_DUPLICATE_SLASH_RE = re.compile(r"/{2,}")
+
+
+class UrlCanonicalizer:
+    """
+    URL을 비교 가능한 canonical 형태로 변환
+    - https 강제 (force_https: false면 http 유지), 호스트 소문자, 기본 포트/fragment 제거
+    - www 유무는 sites.yaml에 등록된 호스트 표기로 통일
+    - 경로의 세션 파라미터(;jsessionid=...), 중복 슬래시, 끝 슬래시 제거
+    - 추적/세션 쿼리 파라미터 제거 후 키 순서 정렬
+    - sites.<host>.canonical_query_keys가 있으면 해당 키만 유지
+    - 실행 중 여러 표기가 하나로 합쳐진 횟수 집계
+    """
+
+    def __init__(self, site_settings: SiteSettings, known_urls: Iterable[str] = ()):
+        self.site_settings = site_settings
+        options = site_settings.defaults.get("url_canonicalization") or {}
+        self.tracking_params = {p.lower() for p in options.get("tracking_params", DEFAULT_TRACKING_PARAMS)}
+        self.strip_trailing_slash = options.get("strip_trailing_slash", True)
+        self.force_https = options.get("force_https", True)
+
+        self.known_hosts: Set[str] = {h.lower() for h in site_settings.sites}
+        for url in known_urls:
+            host = urlparse(self._with_scheme(url)).hostname
+            if host:
+                self.known_hosts.add(host.lower())
+
+        # canonical URL → 실행 중 관찰된 원래 표기
+        self._variants: Dict[str, Set[str]] = {}
+
+    def _with_scheme(self, url: str) -> str:
+        url = url.strip()
+        if url.startswith("http://"):
+            return "https://" + url[len("http://"):] if self.force_https else url
+        if not url.startswith("http"):
+            return "https://" + url.lstrip("/")
+        return url
+
+    def _canonical_host(self, host: str) -> str:
+        if host in self.known_hosts:
+            return host
+        alt = host[4:] if host.startswith("www.") else f"www.{host}"
+        return alt if alt in self.known_hosts else host
+
+    def rules_hash(self) -> str:
+        """정규화 규칙 식별자 (규칙이 바뀌면 저장된 canonical URL을 다시 만들어야 함)"""
+        rules = {
+            "tracking_params": sorted(self.tracking_params),
+            "strip_trailing_slash": self.strip_trailing_slash,
+            "known_hosts": sorted(self.known_hosts),
+            "query_keys": {
+                host: [(overrides or {}).get("canonical_query_keys"), (overrides or {}).get("drop_query_keys")]
+                for host, overrides in sorted(self.site_settings.sites.items())
+            },
+        }
+        if not self.force_https:
+            # 기본값(true)일 때는 키를 넣지 않아 기존 인덱스가 재구축되지 않도록 함
+            rules["force_https"] = False
+        return hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def canonicalize(self, url: str, track: bool = True) -> str:
+        """
+        canonical URL 변환
+
+        Args:
+            track: 합쳐진 표기 집계에 포함할지 (대량 동기화 시 False)
+        """
+        if not url:
+            return url
+
+        parsed = urlparse(self._with_scheme(url))
+        scheme = "https" if self.force_https else parsed.scheme
+        host = self._canonical_host((parsed.hostname or "").lower())
+        netloc = host
+        if parsed.port and parsed.port != {"https": 443, "http": 80}.get(scheme):
+            netloc = f"{host}:{parsed.port}"
+
+        path = _PATH_SESSION_RE.sub("", parsed.path)
+        path = _DUPLICATE_SLASH_RE.sub("/", path) or "/"
+        if self.strip_trailing_slash and len(path) > 1:
+            path = path.rstrip("/") or "/"
+
+        keep_keys: Optional[List[str]] = self.site_settings.get(f"https://{host}/", "canonical_query_keys")
+        drop_keys = {k.lower() for k in (self.site_settings.get(f"https://{host}/", "drop_query_keys") or [])}
+        params = []
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True):
+            lowered = key.lower()
+            if keep_keys is not None:
+                if key not in keep_keys:
+                    continue
+            elif lowered.startswith("utm_") or lowered in self.tracking_params or lowered in drop_keys:
+                continue
+            params.append((key, value))
+        params.sort()
+
+        canonical = urlunparse((scheme, netloc, path, "", urlencode(params), ""))
+        if track:
+            self._variants.setdefault(canonical, set()).add(url)
+        return canonical
+
+    def report(self) -> str:
+        """실행 중 합쳐진 URL 표기 요약"""
+        merged = {c: v for c, v in self._variants.items() if len(v) > 1}
+        collapsed = sum(len(v) - 1 for v in merged.values())
+        return f"URL {len(self._variants)}개, 다른 표기 {collapsed}개가 {len(merged)}개 URL로 합쳐짐"
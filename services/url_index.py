@@ -0,0 +1,127 @@
+"""기존 캠페인 URL 로컬 인덱스 (SQLite + 증분 동기화)"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from services.supabase_client import SupabaseService
+
+
+class UrlIndex:
+    """
+    campaigns.campaign_url의 로컬 사본
+    - SQLite 파일에 저장하고 기본키 조회로 중복 확인 (전체를 메모리에 올리지 않음)
+    - id 워터마크 이후 행만 keyset 페이지네이션으로 가져와 증분 동기화
+      → 시작 비용이 전체 테이블 크기가 아니라 새로 생긴 행 수에 비례
+    - set처럼 `in`, add(), len() 지원 (writer 스레드에서도 사용하므로 lock으로 보호)
+    - canonicalize가 있으면 canonical URL로 저장 (규칙이 바뀌면 자동 재구축)
+    - 원격에서 삭제된 행은 반영되지 않으므로 필요 시 rebuild()로 재구축
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        canonicalize: Optional[Callable[[str], str]] = None,
+        rules_hash: str = "",
+    ):
+        self.path = Path(path)
+        self.canonicalize = canonicalize or (lambda url: url)
+        self.rules_hash = rules_hash
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # --workers로 여러 프로세스가 같은 파일을 쓰므로 잠금 대기(timeout) + WAL
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+    @property
+    def watermark(self) -> int:
+        """마지막으로 동기화한 campaigns.id"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'max_id'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_watermark(self, value: int):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('max_id', ?)", (str(value),))
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def sync(self, supabase: SupabaseService, page_size: int = 1000) -> int:
+        """
+        워터마크 이후 새 캠페인 URL을 가져와 인덱스에 추가
+        (정규화 규칙이 저장 당시와 다르면 전체 재구축)
+
+        Returns:
+            가져온 행 수
+        """
+        if self._meta("rules_hash") != self.rules_hash and self.watermark:
+            print("[UrlIndex] URL 정규화 규칙이 바뀌어 인덱스를 재구축합니다.")
+            return self.rebuild(supabase, page_size)
+
+        after_id = self.watermark
+        fetched = 0
+        while True:
+            rows = supabase.fetch_campaign_urls_after(after_id, page_size)
+            if not rows:
+                break
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO urls (url) VALUES (?)",
+                    [(self.canonicalize(row["campaign_url"]),) for row in rows if row.get("campaign_url")],
+                )
+                after_id = rows[-1]["id"]
+                self._set_watermark(after_id)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('rules_hash', ?)", (self.rules_hash,)
+                )
+                self._conn.commit()
+            fetched += len(rows)
+            if len(rows) < page_size:
+                break
+        return fetched
+
+    def rebuild(self, supabase: SupabaseService, page_size: int = 1000) -> int:
+        """인덱스를 비우고 처음부터 다시 동기화"""
+        with self._lock:
+            self._conn.execute("DELETE FROM urls")
+            self._conn.execute("DELETE FROM meta")
+            self._conn.commit()
+        return self.sync(supabase, page_size)
+
+    def __contains__(self, url: str) -> bool:
+        url = self.canonicalize(url)
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM urls WHERE url = ?", (url,)).fetchone() is not None
+
+    def add(self, url: str):
+        """새로 저장한 URL 추가 (워터마크는 동기화 때만 이동)"""
+        self.update([url])
+
+    def update(self, urls: Iterable[str]):
+        """새로 저장한 URL 여러 개를 한 트랜잭션으로 추가 (set.update와 같은 형태)"""
+        rows = [(self.canonicalize(url),) for url in urls]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany("INSERT OR IGNORE INTO urls (url) VALUES (?)", rows)
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT url FROM urls").fetchall()
+        return iter(row[0] for row in rows)
+
+    def close(self):
+        """DB 연결 종료"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,407 @@
+"""여러 워커 프로세스가 URL을 lease로 나눠 처리하는 공유 작업 테이블"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from services.supabase_client import SupabaseService
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+
+
+@dataclass
+class WorkItem:
+    """공유 작업 테이블의 URL 1건"""
+    url: str
+    kind: str
+    source: str
+    depth: int = 0
+
+
+def default_worker_id() -> str:
+    """호스트명-PID 형태의 워커 ID"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue(ABC):
+    """
+    run_id 단위 공유 작업 테이블 (URL 기본키 → 모든 워커에 걸친 중복 제거)
+    - add(): 새 URL만 추가 (이미 있으면 무시)
+    - claim(): lease가 없거나 만료된 URL을 깊이 순으로 가져와 lease_seconds 동안 점유
+    - heartbeat(): 처리 중인 URL의 lease 연장 → 워커가 죽으면 lease가 만료되어 다른 워커가 다시 가져감
+    - complete(): 처리 끝난 URL 표시 (저장할 결과가 있으면 DB에 저장된 뒤에 호출)
+    - release(): 저장에 실패한 URL의 lease를 풀어 어느 워커든 다시 가져가게 함
+    - 같은 run_id로 다시 실행하면 끝나지 않은 URL부터 이어서 처리
+    - 같은 URL이 두 번 처리될 수 있음(lease 만료 직전 하트비트 경합) → 저장은 DB upsert가 중복 차단
+    """
+
+    def __init__(
+        self,
+        run_id: str,
+        worker_id: Optional[str] = None,
+        lease_seconds: float = 300,
+        heartbeat_seconds: float = 60,
+        poll_seconds: float = 2.0,
+    ):
+        self.run_id = run_id
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+
+        self.added = 0
+        self.duplicates = 0
+        self.claimed = 0
+        self.reclaimed = 0  # 다른 워커의 만료된 lease를 가져온 수
+        self.completed = 0
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: Optional[Dict],
+        project_root: Path,
+        run_id: str,
+        worker_id: Optional[str] = None,
+        supabase: Optional[SupabaseService] = None,
+    ) -> "WorkQueue":
+        """sites.yaml의 settings.work_queue 섹션으로 생성 (backend: sqlite / supabase)"""
+        options = dict((settings or {}).get("work_queue") or {})
+        backend = options.pop("backend", "sqlite")
+        path = Path(options.pop("path", ".cache/work_queue.sqlite"))
+        options.pop("scale_request_delay", None)  # main.py에서 사용
+        if backend == "supabase":
+            if supabase is None:
+                raise ValueError("work_queue.backend가 supabase면 SupabaseService가 필요합니다.")
+            return SupabaseWorkQueue(supabase, run_id=run_id, worker_id=worker_id, **options)
+        if not path.is_absolute():
+            path = project_root / path
+        return SqliteWorkQueue(path, run_id=run_id, worker_id=worker_id, **options)
+
+    @abstractmethod
+    def add(self, items: List[WorkItem]) -> int:
+        """새 URL 추가 (추가된 수 반환)"""
+
+    @abstractmethod
+    def claim(self, limit: int) -> List[WorkItem]:
+        """lease가 없거나 만료된 URL을 최대 limit개 점유"""
+
+    @abstractmethod
+    def heartbeat(self) -> int:
+        """이 워커가 점유한 URL의 lease 연장 (연장한 수 반환)"""
+
+    @abstractmethod
+    def complete(self, urls: List[str]):
+        """URL을 완료로 표시"""
+
+    @abstractmethod
+    def release(self, urls: List[str]):
+        """이 워커가 점유한 URL을 다시 대기 상태로 되돌림"""
+
+    @abstractmethod
+    def has_unfinished(self) -> bool:
+        """완료되지 않은 URL이 남았는지"""
+
+    @abstractmethod
+    def report_worker(self, report: Dict):
+        """이 워커의 실행 요약 기록"""
+
+    @abstractmethod
+    def worker_reports(self) -> List[Dict]:
+        """같은 run_id의 워커별 실행 요약"""
+
+    def close(self):
+        pass
+
+    def _count_added(self, requested: int, inserted: int):
+        self.added += inserted
+        self.duplicates += requested - inserted
+
+    def report(self) -> str:
+        """이 워커의 작업 테이블 사용 통계"""
+        return (
+            f"워커 {self.worker_id} (run {self.run_id}): 추가 {self.added}건 (다른 워커와 중복 {self.duplicates}건), "
+            f"가져옴 {self.claimed}건 (만료 lease 회수 {self.reclaimed}건), 완료 {self.completed}건"
+        )
+
+
+class SqliteWorkQueue(WorkQueue):
+    """
+    SQLite 파일 기반 작업 테이블 (같은 머신의 여러 프로세스용, 로컬 테스트용)
+    - claim은 BEGIN IMMEDIATE 트랜잭션으로 조회+점유를 한 번에 수행 → 프로세스끼리 같은 URL을 가져가지 않음
+    """
+
+    def __init__(self, path: Union[str, Path], **kwargs):
+        super().__init__(**kwargs)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 트랜잭션은 직접 관리 (isolation_level=None), 다른 프로세스가 쓰는 중이면 최대 30초 대기
+        self._conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_work (
+                run_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                source TEXT,
+                depth INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL DEFAULT 'pending',
+                owner TEXT,
+                lease_until REAL NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, url)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_work_claim ON crawl_work (run_id, status, depth)")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_workers (
+                run_id TEXT NOT NULL,
+                worker_id TEXT NOT NULL,
+                report TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (run_id, worker_id)
+            )
+            """
+        )
+
+    @contextmanager
+    def _transaction(self):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (조회와 갱신 사이에 다른 프로세스가 끼어들지 않음)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def add(self, items: List[WorkItem]) -> int:
+        if not items:
+            return 0
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO crawl_work (run_id, url, kind, source, depth, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(self.run_id, item.url, item.kind, item.source, item.depth, now) for item in items],
+            )
+            inserted = conn.total_changes - before
+        self._count_added(len(items), inserted)
+        return inserted
+
+    def claim(self, limit: int) -> List[WorkItem]:
+        if limit <= 0:
+            return []
+        now = time.time()
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT url, kind, source, depth, attempts FROM crawl_work "
+                "WHERE run_id = ? AND status != ? AND lease_until < ? ORDER BY depth, rowid LIMIT ?",
+                (self.run_id, DONE, now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE crawl_work SET status = ?, owner = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE run_id = ? AND url = ?",
+                [(LEASED, self.worker_id, now + self.lease_seconds, now, self.run_id, row[0]) for row in rows],
+            )
+        self.claimed += len(rows)
+        self.reclaimed += sum(1 for row in rows if row[4] > 0)
+        return [WorkItem(url=url, kind=kind, source=source or url, depth=depth) for url, kind, source, depth, _ in rows]
+
+    def heartbeat(self) -> int:
+        now = time.time()
+        with self._lock:
+            return self._conn.execute(
+                "UPDATE crawl_work SET lease_until = ?, updated_at = ? WHERE run_id = ? AND owner = ? AND status = ?",
+                (now + self.lease_seconds, now, self.run_id, self.worker_id, LEASED),
+            ).rowcount
+
+    def complete(self, urls: List[str]):
+        if not urls:
+            return
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE crawl_work SET status = ?, lease_until = 0, updated_at = ? WHERE run_id = ? AND url = ?",
+                [(DONE, now, self.run_id, url) for url in urls],
+            )
+        self.completed += len(urls)
+
+    def release(self, urls: List[str]):
+        if not urls:
+            return
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE crawl_work SET status = ?, owner = NULL, lease_until = 0, updated_at = ? "
+                "WHERE run_id = ? AND url = ? AND owner = ? AND status = ?",
+                [(PENDING, now, self.run_id, url, self.worker_id, LEASED) for url in urls],
+            )
+
+    def has_unfinished(self) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM crawl_work WHERE run_id = ? AND status != ? LIMIT 1", (self.run_id, DONE)
+            ).fetchone()
+        return row is not None
+
+    def report_worker(self, report: Dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO crawl_workers (run_id, worker_id, report, updated_at) VALUES (?, ?, ?, ?)",
+                (self.run_id, self.worker_id, json.dumps(report, ensure_ascii=False), time.time()),
+            )
+
+    def worker_reports(self) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT report FROM crawl_workers WHERE run_id = ? ORDER BY worker_id", (self.run_id,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class SupabaseWorkQueue(WorkQueue):
+    """
+    Supabase(PostgREST) 테이블 기반 작업 테이블 (서로 다른 머신의 matrix 작업용)
+    - claim: 후보 조회 후 version 조건부 UPDATE (낙관적 잠금, 다른 워커가 먼저 가져간 행은 건너뜀)
+    - 필요한 테이블 (README의 SQL 참고): crawl_work (run_id, url 기본키), crawl_workers (run_id, worker_id 기본키)
+    - lease 만료는 각 워커의 시계 기준이므로 lease_seconds는 머신 간 시계 오차보다 충분히 길게
+    """
+
+    def __init__(self, supabase: SupabaseService, **kwargs):
+        super().__init__(**kwargs)
+        self.client = supabase.client
+
+    def add(self, items: List[WorkItem]) -> int:
+        if not items:
+            return 0
+        rows = [
+            {"run_id": self.run_id, "url": item.url, "kind": item.kind, "source": item.source, "depth": item.depth,
+             "status": PENDING, "lease_until": 0, "attempts": 0, "version": 0}
+            for item in items
+        ]
+        result = self.client.table("crawl_work") \
+            .upsert(rows, on_conflict="run_id,url", ignore_duplicates=True) \
+            .execute()
+        inserted = len(result.data or [])
+        self._count_added(len(items), inserted)
+        return inserted
+
+    def claim(self, limit: int) -> List[WorkItem]:
+        if limit <= 0:
+            return []
+        now = time.time()
+        # 다른 워커와 경합해 일부를 놓쳐도 limit만큼 채울 수 있도록 여유 있게 조회
+        candidates = self.client.table("crawl_work") \
+            .select("url, kind, source, depth, attempts, version") \
+            .eq("run_id", self.run_id) \
+            .neq("status", DONE) \
+            .lt("lease_until", now) \
+            .order("depth") \
+            .limit(limit * 2) \
+            .execute().data or []
+
+        claimed = []
+        for row in candidates:
+            if len(claimed) >= limit:
+                break
+            result = self.client.table("crawl_work") \
+                .update({
+                    "status": LEASED,
+                    "owner": self.worker_id,
+                    "lease_until": now + self.lease_seconds,
+                    "attempts": row["attempts"] + 1,
+                    "version": row["version"] + 1,
+                }) \
+                .eq("run_id", self.run_id) \
+                .eq("url", row["url"]) \
+                .eq("version", row["version"]) \
+                .execute()
+            if result.data:
+                claimed.append(WorkItem(url=row["url"], kind=row["kind"], source=row["source"] or row["url"], depth=row["depth"]))
+                self.reclaimed += row["attempts"] > 0
+        self.claimed += len(claimed)
+        return claimed
+
+    def heartbeat(self) -> int:
+        result = self.client.table("crawl_work") \
+            .update({"lease_until": time.time() + self.lease_seconds}) \
+            .eq("run_id", self.run_id) \
+            .eq("owner", self.worker_id) \
+            .eq("status", LEASED) \
+            .execute()
+        return len(result.data or [])
+
+    def complete(self, urls: List[str]):
+        for url in urls:
+            self.client.table("crawl_work") \
+                .update({"status": DONE, "lease_until": 0}) \
+                .eq("run_id", self.run_id) \
+                .eq("url", url) \
+                .execute()
+            self.completed += 1
+
+    def release(self, urls: List[str]):
+        for url in urls:
+            self.client.table("crawl_work") \
+                .update({"status": PENDING, "owner": None, "lease_until": 0}) \
+                .eq("run_id", self.run_id) \
+                .eq("url", url) \
+                .eq("owner", self.worker_id) \
+                .eq("status", LEASED) \
+                .execute()
+
+    def has_unfinished(self) -> bool:
+        result = self.client.table("crawl_work") \
+            .select("url") \
+            .eq("run_id", self.run_id) \
+            .neq("status", DONE) \
+            .limit(1) \
+            .execute()
+        return bool(result.data)
+
+    def report_worker(self, report: Dict):
+        self.client.table("crawl_workers") \
+            .upsert({"run_id": self.run_id, "worker_id": self.worker_id, "report": report, "updated_at": time.time()},
+                    on_conflict="run_id,worker_id") \
+            .execute()
+
+    def worker_reports(self) -> List[Dict]:
+        result = self.client.table("crawl_workers") \
+            .select("report") \
+            .eq("run_id", self.run_id) \
+            .order("worker_id") \
+            .execute()
+        return [row["report"] for row in result.data or []]
+
+
+def merge_worker_reports(reports: List[Dict]) -> Dict:
+    """워커별 보고(숫자 항목)를 합산 (처리 속도는 합계 페이지 / 가장 긴 실행 시간)"""
+    merged: Dict = {"workers": len(reports)}
+    for report in reports:
+        for key, value in report.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = merged.get(key, 0) + value
+    wall = max((report.get("seconds", 0) for report in reports), default=0)
+    merged["seconds"] = wall
+    merged["pages_per_second"] = round(merged.get("pages", 0) / wall, 2) if wall else 0.0
+    return merged